@@ -2,17 +2,28 @@ from flask import Flask
 from config import Config
 from extensions import mongo
 from routes.signup.user_routes import user_bp
-from routes.chat.chat_meal import chat_meal_bp
+from routes.signup.user_cache import ensure_indexes as ensure_user_indexes
+from routes.chat.chat_meal import chat_meal_bp, ensure_indexes as ensure_meal_indexes
 from routes.chat.chat_water import record_water_bp
 from routes.chat.chat_sleep import record_sleep_bp
+from routes.chat.event_store import ensure_event_collections
 from routes.chat.chat_news import news_bp
 from routes.upload.upload import upload_bp
 from routes.recipes.keywords import keywords_bp
 from routes.recipes.search import search_bp
-from routes.recipes.views import view_bp
+from routes.recipes.search_index import ensure_indexes as ensure_search_indexes
+from routes.recipes.ingredient_index import ensure_indexes as ensure_ingredient_indexes
+from routes.recipes.views import view_bp, start_view_counter
+from routes.recipes.suggest import suggest_bp, start_suggest_index
+from routes.recipes.trending import trending_bp, start_trending_job, ensure_indexes as ensure_trending_indexes
 from routes.recipes.search_history import search_history_bp
-from routes.recipes.post import post_bp
-from routes.challenge.challenge_routes import challenge_bp
+from routes.recipes.post import post_bp, ensure_indexes as ensure_recipe_indexes
+from routes.recipes.score_worker import start_score_workers
+from routes.challenge.challenge_routes import challenge_bp, ensure_indexes as ensure_challenge_indexes
+from routes.stats.stats_routes import stats_bp
+from routes.dashboard.dashboard_routes import dashboard_bp
+from routes.stats.rollups import ensure_indexes as ensure_rollup_indexes
+from routes.ops.ops_routes import ops_bp
 from extensions import mongo
 import firebase_admin
 from firebase_admin import credentials, storage
@@ -24,10 +35,32 @@ firebase_admin.initialize_app(cred, {
     'storageBucket': 'shim-ae600.firebasestorage.app'
 })
 
+# 기동 시 한 번 실행하는 인덱스 준비 함수 목록
+# (이벤트 컬렉션은 저장 방식에 맞게 먼저 만들어야 하므로 맨 앞)
+INDEX_SETUPS = [
+    ensure_event_collections,
+    ensure_user_indexes,
+    ensure_meal_indexes,
+    ensure_recipe_indexes,
+    ensure_search_indexes,
+    ensure_ingredient_indexes,
+    ensure_trending_indexes,
+    ensure_challenge_indexes,
+    ensure_rollup_indexes,
+]
+
+def _ensure_indexes():
+    for setup in INDEX_SETUPS:
+        try:
+            setup()
+        except Exception as e:
+            print(f"[WARN] 인덱스 생성 실패 ({setup.__module__}): {e}")
+
 def create_app():
     app = Flask(__name__)
     app.config.from_object(Config)
     mongo.init_app(app)
+    _ensure_indexes()
 
     app.register_blueprint(user_bp)
     app.register_blueprint(chat_meal_bp)
@@ -38,9 +71,20 @@ def create_app():
     app.register_blueprint(keywords_bp)
     app.register_blueprint(search_bp)
     app.register_blueprint(view_bp)
+    app.register_blueprint(trending_bp)
+    app.register_blueprint(suggest_bp)
     app.register_blueprint(search_history_bp)
     app.register_blueprint(post_bp)
     app.register_blueprint(challenge_bp, url_prefix='/api')
+    app.register_blueprint(stats_bp)
+    app.register_blueprint(dashboard_bp)
+    app.register_blueprint(ops_bp)
+
+    # 백그라운드 작업
+    start_score_workers()
+    start_view_counter()
+    start_trending_job()
+    start_suggest_index()
 
     return app
 
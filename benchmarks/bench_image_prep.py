@@ -0,0 +1,99 @@
+# benchmarks/bench_image_prep.py
+"""
+비전 호출 전 이미지 전처리(image_prep) 벤치마크: 절감 바이트 + 지연 시간 변화.
+
+  python benchmarks/bench_image_prep.py                      # 합성 사진(4032x3024 등)으로 측정
+  python benchmarks/bench_image_prep.py --dir ./photos       # 실제 사진 폴더로 측정
+  python benchmarks/bench_image_prep.py --dir ./photos --live # 원본/전처리본으로 Gemini 호출 시간까지 비교
+
+지연 시간 변화 = (원본 - 전처리본) 업로드 시간(--uplink-mbps 기준) - 전처리 시간
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+from io import BytesIO
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from PIL import Image  # noqa: E402
+import image_prep  # noqa: E402
+
+
+def _synthetic_photos():
+    """휴대폰 사진 크기의 합성 이미지 (노이즈 + 그라디언트라 압축이 잘 안 됨)."""
+    out = []
+    for w, h in ((4032, 3024), (3024, 4032), (2560, 1920)):
+        noise = Image.effect_noise((w, h), 60).convert("RGB")
+        grad = Image.linear_gradient("L").resize((w, h)).convert("RGB")
+        img = Image.blend(noise, grad, 0.5)
+        buf = BytesIO()
+        img.save(buf, "JPEG", quality=95)
+        out.append((f"synthetic_{w}x{h}.jpg", buf.getvalue()))
+    return out
+
+
+def _load_dir(path):
+    out = []
+    for name in sorted(os.listdir(path)):
+        if name.lower().endswith((".jpg", ".jpeg", ".png", ".webp", ".heic")):
+            with open(os.path.join(path, name), "rb") as fp:
+                out.append((name, fp.read()))
+    return out
+
+
+def _vision_call_sec(image_bytes, mime):
+    from routes.chat.chat_meal import VISION_MODEL
+    from llm_gateway import gen_call
+    import base64
+
+    t0 = time.perf_counter()
+    gen_call(VISION_MODEL, [{"text": "이미지에 보이는 음식 이름만 JSON 배열로."},
+                            {"inline_data": {"mime_type": mime, "data": base64.b64encode(image_bytes).decode()}}],
+             json_only=True, retries=1)
+    return time.perf_counter() - t0
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--dir", help="측정할 사진 폴더 (없으면 합성 이미지)")
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument("--uplink-mbps", type=float, default=20.0, help="서버 → 모델 업로드 대역폭 가정치")
+    ap.add_argument("--live", action="store_true", help="원본/전처리본으로 실제 비전 호출 시간 비교")
+    args = ap.parse_args()
+
+    photos = _load_dir(args.dir) if args.dir else _synthetic_photos()
+    print("max_edge=%d max_bytes=%d format=%s pool=%s" % (
+        image_prep.IMAGE_MAX_EDGE, image_prep.IMAGE_MAX_BYTES, image_prep.IMAGE_FORMAT, image_prep.IMAGE_PREP_POOL))
+    image_prep.preprocess_image(photos[0][1])  # 워커 풀 예열
+
+    total_in = total_out = 0
+    deltas = []
+    for name, data in photos:
+        times = []
+        for _ in range(args.repeat):
+            t0 = time.perf_counter()
+            out, mime = image_prep.preprocess_image(data)
+            times.append(time.perf_counter() - t0)
+        prep = statistics.median(times)
+        # base64 인코딩(4/3배) 후 업로드 시간
+        upload_saved = (len(data) - len(out)) * 4 / 3 * 8 / (args.uplink_mbps * 1e6)
+        delta = upload_saved - prep
+        deltas.append(delta)
+        total_in += len(data)
+        total_out += len(out)
+        line = "%-28s %8.1fKB -> %7.1fKB (%5.1f%%)  prep=%6.1fms  upload_saved=%7.1fms  net=%+7.1fms" % (
+            name, len(data) / 1024, len(out) / 1024, 100.0 * len(out) / len(data),
+            prep * 1e3, upload_saved * 1e3, delta * 1e3)
+        if args.live:
+            line += "  vision: orig=%.2fs prepped=%.2fs" % (_vision_call_sec(data, "image/jpeg"), _vision_call_sec(out, mime))
+        print(line)
+
+    print("total: %.1fKB -> %.1fKB (%.1f%% saved), median net latency delta %+.1fms" % (
+        total_in / 1024, total_out / 1024, 100.0 * (1 - total_out / total_in), statistics.median(deltas) * 1e3))
+
+
+if __name__ == "__main__":
+    main()
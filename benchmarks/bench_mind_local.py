@@ -0,0 +1,121 @@
+# benchmarks/bench_mind_local.py
+"""
+로컬 MIND 분류기 벤치마크: 지연 시간 + LLM 점수와의 일치도.
+
+  python benchmarks/bench_mind_local.py                 # 픽스처의 기준 라벨과 비교
+  python benchmarks/bench_mind_local.py --live          # Gemini로 기준 라벨을 새로 받아 비교 (GEMINI_API_KEY 필요)
+  python benchmarks/bench_mind_local.py --live --record # 받은 라벨을 픽스처에 저장
+
+픽스처(fixtures/mind_foods.json)의 기준 라벨은 채점 프롬프트의 MIND 규칙을 보고 손으로 붙인 값이라
+현재 LLM 채점기와의 일치도를 보여주지 않는다. MIND_SCORER_MODE 기본값을 local/hybrid로 바꾸려면
+먼저 --live --record 로 실제 LLM 결과를 픽스처에 기록하고 그 기준으로 일치도를 확인할 것.
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from routes.chat.mind_local import classify_food  # noqa: E402
+
+FIXTURE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "mind_foods.json")
+
+
+def _pct(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(q * (len(values) - 1))))]
+
+
+def _jaccard(a, b):
+    a, b = set(a), set(b)
+    return 1.0 if not a and not b else len(a & b) / len(a | b)
+
+
+def _live_reference(foods):
+    """Gemini 채점 결과(음식 1개씩)와 호출 지연 시간."""
+    from routes.chat.chat_meal import _score_foods_mind_llm, MIND_CATEGORIES
+
+    refs, latencies = [], []
+    for f in foods:
+        t0 = time.perf_counter()
+        res = _score_foods_mind_llm([f], "점심")
+        latencies.append(time.perf_counter() - t0)
+        it = (res.get("items") or [{}])[0]
+        cats = [MIND_CATEGORIES[c] for c in it.get("categories", []) if c in MIND_CATEGORIES]
+        refs.append({"food": f, "categories": list(dict.fromkeys(cats)), "score": it.get("score", 0)})
+    return refs, latencies
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--fixture", default=FIXTURE)
+    ap.add_argument("--iterations", type=int, default=2000, help="로컬 분류 반복 횟수(음식당)")
+    ap.add_argument("--threshold", type=float, default=float(os.getenv("MIND_LOCAL_CONFIDENCE", "0.8")))
+    ap.add_argument("--live", action="store_true", help="Gemini로 기준 라벨 생성")
+    ap.add_argument("--record", action="store_true", help="--live 결과를 픽스처에 저장")
+    args = ap.parse_args()
+
+    with open(args.fixture, encoding="utf-8") as fp:
+        refs = json.load(fp)
+    foods = [r["food"] for r in refs]
+
+    llm_latencies = []
+    if args.live:
+        refs, llm_latencies = _live_reference(foods)
+        if args.record:
+            with open(args.fixture, "w", encoding="utf-8") as fp:
+                json.dump(refs, fp, ensure_ascii=False, indent=2)
+
+    # 1) 로컬 분류 지연 시간
+    local_latencies = []
+    for f in foods:
+        t0 = time.perf_counter()
+        for _ in range(args.iterations):
+            classify_food(f)
+        local_latencies.append((time.perf_counter() - t0) / args.iterations)
+
+    # 2) 일치도 (전체 / 신뢰도 임계값 통과분)
+    rows = []
+    for ref in refs:
+        local = classify_food(ref["food"])
+        rows.append({
+            "food": ref["food"],
+            "confident": local["confidence"] >= args.threshold,
+            "jaccard": _jaccard(local["categories"], ref["categories"]),
+            "abs_err": abs(local["score"] - ref["score"]),
+            "local": local,
+            "ref": ref,
+        })
+
+    def summary(subset):
+        if not subset:
+            return "n=0"
+        return "n=%d  category_jaccard=%.3f  score_mae=%.1f  within_15=%.1f%%" % (
+            len(subset),
+            statistics.mean(r["jaccard"] for r in subset),
+            statistics.mean(r["abs_err"] for r in subset),
+            100.0 * sum(r["abs_err"] <= 15 for r in subset) / len(subset),
+        )
+
+    confident = [r for r in rows if r["confident"]]
+    print("== latency ==")
+    print("local  p50=%.1fus  p95=%.1fus" % (_pct(local_latencies, 0.5) * 1e6, _pct(local_latencies, 0.95) * 1e6))
+    if llm_latencies:
+        print("llm    p50=%.0fms  p95=%.0fms" % (_pct(llm_latencies, 0.5) * 1e3, _pct(llm_latencies, 0.95) * 1e3))
+    print("== agreement (threshold=%.2f) ==" % args.threshold)
+    print("all        ", summary(rows))
+    print("confident  ", summary(confident))
+    print("coverage    %.1f%% of foods handled locally in hybrid mode" % (100.0 * len(confident) / len(rows)))
+    print("== disagreements (confident, |err| > 15) ==")
+    for r in confident:
+        if r["abs_err"] > 15:
+            print("  %-16s local=%3d %-30s ref=%3d %s" % (
+                r["food"], r["local"]["score"], r["local"]["categories"], r["ref"]["score"], r["ref"]["categories"]))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+# benchmarks/bench_recipe_search.py
+"""
+레시피 검색 벤치마크: 기존 $regex 전체 스캔 vs 역색인(search_index) 조회.
+
+  python benchmarks/bench_recipe_search.py                          # 10k, 100k 합성 레시피
+  python benchmarks/bench_recipe_search.py --sizes 10000 --repeat 20
+  python benchmarks/bench_recipe_search.py --mongo-uri mongodb://localhost:27017 --keep
+
+실제 MongoDB가 필요함 (별도 DB bench_recipe_search 에 생성 후 삭제).
+코퍼스가 커져도 역색인 쪽 p50이 거의 일정하게 유지되는지,
+첫 페이지(요약 필드, 20건) 응답 크기가 전체 결과 대비 얼마나 줄었는지를 본다.
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from pymongo import MongoClient, InsertOne  # noqa: E402
+from routes.recipes.search_index import (  # noqa: E402
+    search_fields, rebuild_terms, search_recipe_docs,
+)
+from routes.recipes.search import SUMMARY_PROJECTION  # noqa: E402
+
+FOODS = ["김치", "된장", "두부", "연어", "닭가슴살", "현미", "브로콜리", "시금치", "고등어", "버섯",
+         "계란", "감자", "고구마", "소고기", "돼지고기", "오트밀", "아보카도", "토마토", "양배추", "미역"]
+DISHES = ["찌개", "볶음", "샐러드", "구이", "조림", "덮밥", "국", "전", "무침", "스튜"]
+WORDS = ["건강한", "간단한", "저염", "든든한", "매콤한", "담백한", "아침", "도시락", "다이어트", "주말",
+         "레시피", "재료", "손질", "불", "약하게", "오래", "끓여", "볶아", "곁들여", "완성"]
+QUERIES = ["김치찌개", "연어", "두부 조림", "닭가슴살 샐러드", "국", "매콤한 볶음", "아보카도 덮밥", "없는메뉴"]
+
+FULL_PROJECTION = {"_id": 1, "name": 1, "keywords": 1, "desc": 1, "time": 1, "level": 1, "serving": 1,
+                   "imageUrl": 1, "steps": 1, "ingredients": 1, "score": 1, "views": 1}
+
+
+def _recipe(rng):
+    name = f"{rng.choice(WORDS)} {rng.choice(FOODS)} {rng.choice(DISHES)}"
+    desc = " ".join(rng.choice(WORDS + FOODS + DISHES) for _ in range(rng.randint(20, 200)))
+    doc = {"name": name, "desc": desc, "keywords": rng.sample(FOODS, 2),
+           "views": rng.randint(0, 5000), "score": rng.randint(1, 100)}
+    doc.update(search_fields(name, desc, doc["keywords"]))
+    return doc
+
+
+def _seed(db, n, seed=42):
+    rng = random.Random(seed)
+    db.recipes.drop()
+    db.recipe_search_terms.drop()
+    batch = []
+    for _ in range(n):
+        batch.append(InsertOne(_recipe(rng)))
+        if len(batch) >= 2000:
+            db.recipes.bulk_write(batch, ordered=False)
+            batch = []
+    if batch:
+        db.recipes.bulk_write(batch, ordered=False)
+    db.recipes.create_index("search_tokens")
+    rebuild_terms(db)
+
+
+def _regex_search(db, keyword):
+    query = {"$or": [{"name": {"$regex": keyword, "$options": "i"}},
+                     {"desc": {"$regex": keyword, "$options": "i"}}]}
+    return list(db.recipes.find(query, FULL_PROJECTION).sort([("_id", -1)]))
+
+
+def _first_page(db, keyword, sort_by="relevance"):
+    docs, _, _ = search_recipe_docs(keyword, sort_by, SUMMARY_PROJECTION, limit=20, db=db)
+    return docs
+
+
+def _json_bytes(docs):
+    return len(json.dumps(docs, default=str, ensure_ascii=False).encode("utf-8"))
+
+
+def _time(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+    return statistics.median(times) * 1e3, max(times) * 1e3
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--mongo-uri", default=os.getenv("BENCH_MONGO_URI", "mongodb://localhost:27017"))
+    ap.add_argument("--sizes", default="10000,100000")
+    ap.add_argument("--repeat", type=int, default=10)
+    ap.add_argument("--keep", action="store_true", help="벤치 DB를 지우지 않음")
+    args = ap.parse_args()
+
+    client = MongoClient(args.mongo_uri)
+    db = client["bench_recipe_search"]
+    try:
+        for n in (int(s) for s in args.sizes.split(",")):
+            t0 = time.perf_counter()
+            _seed(db, n)
+            print(f"\n== {n:,} recipes (seed {time.perf_counter() - t0:.1f}s) ==")
+            print("%-18s %7s %15s %15s %15s %18s" % (
+                "query", "hits", "regex p50/max", "index p50/max", "latest p50/max", "bytes regex→page"))
+            for q in QUERIES:
+                full = _regex_search(db, q)
+                page = _first_page(db, q)
+                r50, rmax = _time(lambda: _regex_search(db, q), args.repeat)
+                i50, imax = _time(lambda: _first_page(db, q), args.repeat)
+                l50, lmax = _time(lambda: _first_page(db, q, "latest"), args.repeat)
+                print("%-18s %7d %6.1f/%6.1fms %6.1f/%6.1fms %6.1f/%6.1fms %9d→%7d" % (
+                    q, len(full), r50, rmax, i50, imax, l50, lmax, _json_bytes(full), _json_bytes(page)))
+    finally:
+        if not args.keep:
+            client.drop_database("bench_recipe_search")
+
+
+if __name__ == "__main__":
+    main()
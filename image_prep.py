@@ -0,0 +1,113 @@
+# image_prep.py
+# 비전 모델 호출 전 이미지 전처리
+#  - 긴 변 IMAGE_MAX_EDGE px로 축소, EXIF 제거(회전 정보는 픽셀에 반영)
+#  - IMAGE_MAX_BYTES 이하가 될 때까지 품질/크기를 낮춰 JPEG 또는 WEBP로 재인코딩
+#  - 요청 스레드가 GIL을 잡고 있지 않도록 워커 풀(process | thread)에서 실행
+#  - 프로세스 풀은 forkserver(없으면 spawn)로 시작: 풀은 첫 요청 때 만들어지는데 그 시점엔 백그라운드
+#    스레드(점수 워커, 조회수 flush 등)가 돌고 있어 fork하면 그 스레드가 잡은 잠금 때문에 멈출 수 있음
+import os
+import logging
+import threading
+import multiprocessing
+from io import BytesIO
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:  # Pillow가 없으면 전처리 없이 원본 사용
+    Image = ImageOps = None
+
+IMAGE_PREP_ENABLED     = os.getenv("IMAGE_PREP_ENABLED", "1") == "1"
+IMAGE_MAX_EDGE         = int(os.getenv("IMAGE_MAX_EDGE", "1280"))
+IMAGE_MAX_BYTES        = int(os.getenv("IMAGE_MAX_BYTES", str(350 * 1024)))
+IMAGE_FORMAT           = os.getenv("IMAGE_FORMAT", "JPEG").upper()   # JPEG | WEBP
+IMAGE_QUALITY          = int(os.getenv("IMAGE_QUALITY", "85"))
+IMAGE_MIN_QUALITY      = int(os.getenv("IMAGE_MIN_QUALITY", "50"))
+IMAGE_PREP_POOL        = os.getenv("IMAGE_PREP_POOL", "process")     # process | thread
+IMAGE_PREP_WORKERS     = int(os.getenv("IMAGE_PREP_WORKERS", "2"))
+IMAGE_PREP_TIMEOUT_SEC = float(os.getenv("IMAGE_PREP_TIMEOUT_SEC", "10"))
+
+_MIME = {"JPEG": "image/jpeg", "WEBP": "image/webp"}
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def prepare_image_sync(image_bytes: bytes, max_edge: int = IMAGE_MAX_EDGE, max_bytes: int = IMAGE_MAX_BYTES,
+                       fmt: str = IMAGE_FORMAT, quality: int = IMAGE_QUALITY, min_quality: int = IMAGE_MIN_QUALITY):
+    """
+    이미지 축소 + 재인코딩 (워커 안에서 실행되는 순수 함수).
+    반환: (bytes, mime). 디코딩 실패 시 예외.
+    """
+    fmt = fmt if fmt in _MIME else "JPEG"
+    img = Image.open(BytesIO(image_bytes))
+    if img.format == "JPEG":
+        img.draft("RGB", (max_edge, max_edge))  # JPEG는 디코딩 단계에서부터 축소
+    img = ImageOps.exif_transpose(img)
+    if img.mode in ("RGBA", "LA", "P"):
+        img = img.convert("RGBA")
+        background = Image.new("RGB", img.size, (255, 255, 255))
+        background.paste(img, mask=img.split()[-1])
+        img = background
+    elif img.mode != "RGB":
+        img = img.convert("RGB")
+
+    edge = max_edge
+    while True:
+        img.thumbnail((edge, edge), Image.LANCZOS)
+        q = quality
+        while True:
+            buf = BytesIO()
+            img.save(buf, fmt, quality=q, optimize=(fmt == "JPEG"))  # exif 인자를 넘기지 않으므로 메타데이터 제거
+            data = buf.getvalue()
+            if len(data) <= max_bytes or q <= min_quality:
+                break
+            q = max(min_quality, q - 10)
+        if len(data) <= max_bytes or edge <= 256:
+            return data, _MIME[fmt]
+        edge = int(edge * 0.75)
+
+
+def _mp_context():
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+
+def _get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            if IMAGE_PREP_POOL == "thread":
+                _executor = ThreadPoolExecutor(max_workers=IMAGE_PREP_WORKERS, thread_name_prefix="image-prep")
+            else:
+                _executor = ProcessPoolExecutor(max_workers=IMAGE_PREP_WORKERS, mp_context=_mp_context())
+        return _executor
+
+
+def _reset_executor():
+    """워커 프로세스가 죽어 풀이 깨졌으면 다음 호출에서 새로 만든다."""
+    global _executor
+    with _executor_lock:
+        broken, _executor = _executor, None
+    if broken is not None:
+        broken.shutdown(wait=False)
+
+
+def preprocess_image(image_bytes: bytes, mime: str = "image/jpeg"):
+    """
+    비전 호출용 이미지 전처리 (워커 풀에서 실행).
+    비활성화/Pillow 없음/실패/시간 초과/결과가 더 큰 경우에는 원본을 그대로 반환.
+    반환: (bytes, mime)
+    """
+    if not image_bytes or not IMAGE_PREP_ENABLED or Image is None:
+        return image_bytes, mime
+    try:
+        data, out_mime = _get_executor().submit(prepare_image_sync, image_bytes).result(timeout=IMAGE_PREP_TIMEOUT_SEC)
+    except Exception as e:
+        if isinstance(e, BrokenProcessPool):
+            _reset_executor()
+        logging.warning("image preprocess failed, using original: %s", e)
+        return image_bytes, mime
+    if len(data) >= len(image_bytes):
+        return image_bytes, mime
+    return data, out_mime
@@ -0,0 +1,232 @@
+# llm_gateway.py
+# 모든 Gemini 호출이 공유하는 게이트웨이
+#  - 전역 / 모델별 동시 호출 상한 (세마포어)
+#  - 재시도 전체에 걸친 요청당 마감 시간(deadline)
+#  - 서킷 브레이커: 연속 실패 시 일정 시간 즉시 실패 처리
+#  - 호출별 계측(llm_metrics): 엔드포인트/호출 함수 태그, 지연 시간 히스토그램, 토큰 수
+import os
+import sys
+import time
+import logging
+import threading
+
+from llm_metrics import record_call, prompt_size, response_size, usage_tokens, classify_error
+
+LLM_MAX_CONCURRENCY       = int(os.getenv("LLM_MAX_CONCURRENCY", "16"))
+LLM_MODEL_MAX_CONCURRENCY = int(os.getenv("LLM_MODEL_MAX_CONCURRENCY", "8"))
+LLM_MAX_DEADLINE_SEC      = float(os.getenv("LLM_MAX_DEADLINE_SEC", "30"))
+LLM_CB_FAILURE_THRESHOLD  = int(os.getenv("LLM_CB_FAILURE_THRESHOLD", "5"))
+LLM_CB_COOLDOWN_SEC       = float(os.getenv("LLM_CB_COOLDOWN_SEC", "30"))
+
+# 남은 시간이 이보다 짧으면 새 시도를 시작하지 않음
+_MIN_ATTEMPT_SEC = 0.5
+
+
+class CircuitBreaker:
+    """closed → (연속 실패 threshold회) → open → (cooldown 후) half_open: 시험 호출 1건만 허용."""
+
+    def __init__(self, threshold=LLM_CB_FAILURE_THRESHOLD, cooldown=LLM_CB_COOLDOWN_SEC):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = 0.0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.state == "closed":
+                return True
+            if self.state == "open" and time.monotonic() - self.opened_at >= self.cooldown:
+                self.state = "half_open"
+                self._probe_in_flight = False
+            if self.state == "half_open" and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.state = "closed"
+            self.failures = 0
+            self._probe_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == "half_open" or self.failures >= self.threshold:
+                self.state = "open"
+                self.opened_at = time.monotonic()
+            self._probe_in_flight = False
+
+    def cancel(self):
+        """allow() 이후 실제 호출을 못 한 경우(동시성 포화) 시험 호출 슬롯 반환."""
+        with self._lock:
+            self._probe_in_flight = False
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            retry_in = 0.0
+            if self.state == "open":
+                retry_in = max(0.0, self.cooldown - (time.monotonic() - self.opened_at))
+            return {"state": self.state, "consecutive_failures": self.failures, "retry_in_sec": round(retry_in, 1)}
+
+
+class _ModelSlot:
+    def __init__(self):
+        self.semaphore = threading.BoundedSemaphore(LLM_MODEL_MAX_CONCURRENCY)
+        self.breaker = CircuitBreaker()
+        self.counters = {
+            "calls": 0, "successes": 0, "failures": 0, "attempts": 0,
+            "short_circuited": 0, "saturated": 0, "deadline_exceeded": 0, "in_flight": 0,
+        }
+
+
+_global_semaphore = threading.BoundedSemaphore(LLM_MAX_CONCURRENCY)
+_slots = {}
+_slots_lock = threading.Lock()
+
+
+def _model_name(model) -> str:
+    return getattr(model, "model_name", None) or type(model).__name__
+
+def _slot(name: str) -> _ModelSlot:
+    with _slots_lock:
+        slot = _slots.get(name)
+        if slot is None:
+            slot = _slots[name] = _ModelSlot()
+        return slot
+
+def _count(slot: _ModelSlot, key: str, n: int = 1):
+    with _slots_lock:
+        slot.counters[key] += n
+
+
+def _endpoint() -> str:
+    """현재 Flask 요청의 엔드포인트 (요청 밖 = 백그라운드 워커 등은 '-')."""
+    try:
+        from flask import has_request_context, request
+        if has_request_context():
+            return request.endpoint or request.path
+    except ImportError:
+        pass
+    return "-"
+
+
+def gen_call(model, contents, *, json_only=False, timeout=15, retries=3, backoff_base=0.6, deadline=None, tag=None):
+    """
+    Gemini generate_content 안전 호출 (기존 _gen_call 대체):
+    - timeout: 시도 1회당 요청 타임아웃(초)
+    - retries: 최대 시도 횟수 (지수 백오프)
+    - deadline: 대기·재시도·백오프를 모두 포함한 전체 시간 예산(초).
+                기본값은 timeout * retries, 상한은 LLM_MAX_DEADLINE_SEC
+    - json_only=True면 application/json 강제
+    - tag: 계측용 호출 이름 (기본값: gen_call을 부른 함수 이름)
+    실패(서킷 open, 동시성 포화, 마감 초과 포함) 시 None 반환
+    """
+    name = _model_name(model)
+    caller = tag or sys._getframe(1).f_code.co_name
+    trace = {"attempts": 0, "outcome": "ok", "error": ""}
+    started = time.perf_counter()
+    resp = None
+    try:
+        resp = _call_with_limits(model, name, contents, json_only, timeout, retries, backoff_base, deadline, trace)
+        return resp
+    finally:
+        try:
+            record_call(
+                endpoint=_endpoint(), caller=caller, model=name,
+                elapsed_sec=time.perf_counter() - started,
+                attempts=trace["attempts"], outcome=trace["outcome"], error=trace["error"],
+                prompt=prompt_size(contents), response_bytes=response_size(resp), tokens=usage_tokens(resp),
+            )
+        except Exception as e:
+            logging.warning("LLM metrics record failed: %s", e)
+
+
+def _call_with_limits(model, name, contents, json_only, timeout, retries, backoff_base, deadline, trace):
+    slot = _slot(name)
+    _count(slot, "calls")
+
+    budget = deadline if deadline is not None else min(timeout * retries, LLM_MAX_DEADLINE_SEC)
+    end = time.monotonic() + budget
+    genconf = {"response_mime_type": "application/json"} if json_only else None
+    last_err = None
+
+    for i in range(retries):
+        remaining = end - time.monotonic()
+        if remaining < _MIN_ATTEMPT_SEC:
+            _count(slot, "deadline_exceeded")
+            trace["outcome"] = "deadline"
+            last_err = last_err or TimeoutError("deadline exceeded")
+            break
+        if not slot.breaker.allow():
+            _count(slot, "short_circuited")
+            trace["outcome"] = "circuit_open"
+            last_err = last_err or RuntimeError(f"circuit open for {name}")
+            break
+        if not _global_semaphore.acquire(timeout=remaining):
+            slot.breaker.cancel()
+            _count(slot, "saturated")
+            trace["outcome"] = "saturated"
+            last_err = RuntimeError("global LLM concurrency limit reached")
+            break
+        try:
+            if not slot.semaphore.acquire(timeout=max(0.0, end - time.monotonic())):
+                slot.breaker.cancel()
+                _count(slot, "saturated")
+                trace["outcome"] = "saturated"
+                last_err = RuntimeError(f"concurrency limit reached for {name}")
+                break
+            try:
+                _count(slot, "in_flight")
+                _count(slot, "attempts")
+                trace["attempts"] += 1
+                attempt_timeout = max(_MIN_ATTEMPT_SEC, min(timeout, end - time.monotonic()))
+                resp = model.generate_content(
+                    contents,
+                    generation_config=genconf,
+                    request_options={"timeout": attempt_timeout}
+                )
+                slot.breaker.record_success()
+                _count(slot, "successes")
+                trace["outcome"] = "ok"
+                return resp
+            except Exception as e:
+                last_err = e
+                trace["outcome"] = classify_error(e)
+                slot.breaker.record_failure()
+            finally:
+                _count(slot, "in_flight", -1)
+                slot.semaphore.release()
+        finally:
+            _global_semaphore.release()
+
+        # 백오프: 남은 예산 안에서만 대기
+        pause = backoff_base * (2 ** i)
+        if i + 1 < retries and end - time.monotonic() > pause + _MIN_ATTEMPT_SEC:
+            time.sleep(pause)
+
+    _count(slot, "failures")
+    trace["error"] = f"{type(last_err).__name__}: {last_err}"[:200] if last_err else ""
+    logging.error("Gemini call failed (%s): %s", name, last_err)
+    return None
+
+
+def gateway_stats() -> dict:
+    with _slots_lock:
+        models = {name: dict(slot.counters) for name, slot in _slots.items()}
+        breakers = {name: slot.breaker for name, slot in _slots.items()}
+    for name, breaker in breakers.items():
+        models[name]["circuit"] = breaker.snapshot()
+    return {
+        "limits": {
+            "global_concurrency": LLM_MAX_CONCURRENCY,
+            "model_concurrency": LLM_MODEL_MAX_CONCURRENCY,
+            "max_deadline_sec": LLM_MAX_DEADLINE_SEC,
+            "breaker_threshold": LLM_CB_FAILURE_THRESHOLD,
+            "breaker_cooldown_sec": LLM_CB_COOLDOWN_SEC,
+        },
+        "models": models,
+    }
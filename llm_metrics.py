@@ -0,0 +1,221 @@
+# llm_metrics.py
+# LLM 호출 계측 (프로세스 내 집계)
+#  - 호출 1건마다: 소요 시간, 시도 횟수, 결과(ok | timeout | error | deadline | circuit_open | saturated),
+#    프롬프트/응답 크기, usage_metadata 토큰 수
+#  - (Flask 엔드포인트, 호출 함수, 모델) 단위로 지연 시간 히스토그램 집계
+#  - 선택: 샘플링된 호출 trace를 JSON 한 줄로 로깅 (LLM_TRACE_SAMPLE_RATE, LLM_TRACE_PATH)
+import os
+import json
+import time
+import random
+import logging
+import threading
+from collections import deque
+
+LLM_TRACE_SAMPLE_RATE = float(os.getenv("LLM_TRACE_SAMPLE_RATE", "0"))   # 0.0 ~ 1.0
+LLM_TRACE_PATH        = os.getenv("LLM_TRACE_PATH", "")                  # 비우면 logging으로만 출력
+LLM_TRACE_KEEP        = int(os.getenv("LLM_TRACE_KEEP", "200"))           # /ops/llm/traces 로 볼 최근 trace 수
+
+# 지연 시간 히스토그램 버킷 상한(ms). 마지막은 +Inf
+LATENCY_BUCKETS_MS = (50, 100, 250, 500, 1000, 2000, 5000, 10000, 20000, 30000)
+
+OUTCOMES = ("ok", "timeout", "error", "deadline", "circuit_open", "saturated")
+
+_trace_logger = logging.getLogger("llm.trace")
+if LLM_TRACE_PATH:
+    _handler = logging.FileHandler(LLM_TRACE_PATH, encoding="utf-8")
+    _handler.setFormatter(logging.Formatter("%(message)s"))
+    _trace_logger.addHandler(_handler)
+    _trace_logger.setLevel(logging.INFO)
+    _trace_logger.propagate = False
+
+_series = {}
+_recent_traces = deque(maxlen=LLM_TRACE_KEEP)
+_lock = threading.Lock()
+
+
+# ---------- 크기 / 토큰 추출 ----------
+def prompt_size(contents) -> dict:
+    """프롬프트 텍스트 바이트와 인라인(이미지) 데이터 바이트."""
+    text = inline = 0
+    parts = contents if isinstance(contents, (list, tuple)) else [contents]
+    for p in parts:
+        if isinstance(p, str):
+            text += len(p.encode("utf-8"))
+        elif isinstance(p, dict):
+            if "text" in p:
+                text += len(str(p["text"]).encode("utf-8"))
+            data = (p.get("inline_data") or {}).get("data")
+            if data:
+                inline += len(data)
+        elif hasattr(p, "size") and hasattr(p, "mode"):  # PIL 이미지
+            w, h = p.size
+            inline += w * h * len(p.getbands())
+    return {"text_bytes": text, "inline_bytes": inline}
+
+
+def response_size(resp) -> int:
+    if resp is None:
+        return 0
+    try:
+        return len(resp.text.encode("utf-8"))
+    except Exception:
+        # 차단된 응답 등 .text 접근이 실패하는 경우
+        return 0
+
+
+def usage_tokens(resp) -> dict:
+    usage = getattr(resp, "usage_metadata", None)
+    return {
+        "prompt_tokens": int(getattr(usage, "prompt_token_count", 0) or 0),
+        "response_tokens": int(getattr(usage, "candidates_token_count", 0) or 0),
+        "total_tokens": int(getattr(usage, "total_token_count", 0) or 0),
+    }
+
+
+def classify_error(err) -> str:
+    name = type(err).__name__.lower()
+    if isinstance(err, TimeoutError) or "timeout" in name or "deadline" in name:
+        return "timeout"
+    return "error"
+
+
+# ---------- 집계 ----------
+def _new_series() -> dict:
+    return {
+        "calls": 0,
+        "outcomes": {o: 0 for o in OUTCOMES},
+        "attempts": 0,
+        "retries": 0,
+        "latency_ms": {"buckets": [0] * (len(LATENCY_BUCKETS_MS) + 1), "sum": 0.0, "max": 0.0},
+        "prompt_text_bytes": 0,
+        "prompt_inline_bytes": 0,
+        "response_bytes": 0,
+        "prompt_tokens": 0,
+        "response_tokens": 0,
+        "total_tokens": 0,
+    }
+
+
+def _bucket_index(ms: float) -> int:
+    for i, upper in enumerate(LATENCY_BUCKETS_MS):
+        if ms <= upper:
+            return i
+    return len(LATENCY_BUCKETS_MS)
+
+
+def record_call(*, endpoint: str, caller: str, model: str, elapsed_sec: float, attempts: int,
+                outcome: str, error: str = "", prompt: dict = None, response_bytes: int = 0, tokens: dict = None):
+    """gen_call 1건 기록 (llm_gateway에서 호출)."""
+    prompt = prompt or {}
+    tokens = tokens or {}
+    ms = elapsed_sec * 1000.0
+    key = (endpoint, caller, model)
+    with _lock:
+        s = _series.get(key)
+        if s is None:
+            s = _series[key] = _new_series()
+        s["calls"] += 1
+        s["outcomes"][outcome] = s["outcomes"].get(outcome, 0) + 1
+        s["attempts"] += attempts
+        s["retries"] += max(0, attempts - 1)
+        lat = s["latency_ms"]
+        lat["buckets"][_bucket_index(ms)] += 1
+        lat["sum"] += ms
+        lat["max"] = max(lat["max"], ms)
+        s["prompt_text_bytes"] += prompt.get("text_bytes", 0)
+        s["prompt_inline_bytes"] += prompt.get("inline_bytes", 0)
+        s["response_bytes"] += response_bytes
+        for k in ("prompt_tokens", "response_tokens", "total_tokens"):
+            s[k] += tokens.get(k, 0)
+
+    if LLM_TRACE_SAMPLE_RATE > 0 and random.random() < LLM_TRACE_SAMPLE_RATE:
+        trace = {
+            "ts": round(time.time(), 3), "endpoint": endpoint, "caller": caller, "model": model,
+            "ms": round(ms, 1), "attempts": attempts, "outcome": outcome, "error": error,
+            "response_bytes": response_bytes, **prompt, **tokens,
+        }
+        with _lock:
+            _recent_traces.append(trace)
+        _trace_logger.info(json.dumps(trace, ensure_ascii=False))
+
+
+def _quantile_ms(buckets: list, q: float) -> float:
+    """히스토그램 버킷 상한 기준 근사 분위수 (+Inf 버킷이면 마지막 상한 반환)."""
+    total = sum(buckets)
+    if not total:
+        return 0.0
+    target = q * total
+    seen = 0
+    for i, n in enumerate(buckets):
+        seen += n
+        if seen >= target:
+            return float(LATENCY_BUCKETS_MS[min(i, len(LATENCY_BUCKETS_MS) - 1)])
+    return float(LATENCY_BUCKETS_MS[-1])
+
+
+def metrics_snapshot() -> dict:
+    with _lock:
+        series = [(k, json.loads(json.dumps(v))) for k, v in _series.items()]
+    out = []
+    for (endpoint, caller, model), s in sorted(series):
+        lat = s["latency_ms"]
+        lat["avg"] = round(lat["sum"] / s["calls"], 1) if s["calls"] else 0.0
+        lat["p50_le"] = _quantile_ms(lat["buckets"], 0.5)
+        lat["p95_le"] = _quantile_ms(lat["buckets"], 0.95)
+        lat["sum"] = round(lat["sum"], 1)
+        lat["max"] = round(lat["max"], 1)
+        out.append({"endpoint": endpoint, "caller": caller, "model": model, **s})
+    return {"bucket_upper_ms": list(LATENCY_BUCKETS_MS) + ["+Inf"], "series": out}
+
+
+def recent_traces() -> list:
+    with _lock:
+        return list(_recent_traces)
+
+
+# (이름, 타입, 설명) — 패밀리마다 HELP/TYPE은 한 번만, 그 아래에 샘플을 모아서 출력
+PROMETHEUS_FAMILIES = (
+    ("llm_call_duration_ms", "histogram", "LLM call latency in milliseconds"),
+    ("llm_calls_total", "counter", "LLM calls by outcome"),
+    ("llm_attempts_total", "counter", "LLM call attempts including retries"),
+    ("llm_tokens_total", "counter", "LLM tokens by kind"),
+)
+
+
+def _escape_label(value) -> str:
+    """Prometheus 라벨 값 이스케이프: \\, ", 줄바꿈"""
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def prometheus_text() -> str:
+    """Prometheus 텍스트 포맷 (llm_call_duration_ms 히스토그램 + 카운터)."""
+    samples = {name: [] for name, _, _ in PROMETHEUS_FAMILIES}
+    for s in metrics_snapshot()["series"]:
+        labels = 'endpoint="%s",caller="%s",model="%s"' % (
+            _escape_label(s["endpoint"]), _escape_label(s["caller"]), _escape_label(s["model"]))
+        hist = samples["llm_call_duration_ms"]
+        cumulative = 0
+        for upper, n in zip(list(LATENCY_BUCKETS_MS) + ["+Inf"], s["latency_ms"]["buckets"]):
+            cumulative += n
+            hist.append('llm_call_duration_ms_bucket{%s,le="%s"} %d' % (labels, upper, cumulative))
+        hist.append("llm_call_duration_ms_sum{%s} %s" % (labels, s["latency_ms"]["sum"]))
+        hist.append("llm_call_duration_ms_count{%s} %d" % (labels, s["calls"]))
+        for outcome, n in s["outcomes"].items():
+            samples["llm_calls_total"].append('llm_calls_total{%s,outcome="%s"} %d' % (labels, outcome, n))
+        samples["llm_attempts_total"].append("llm_attempts_total{%s} %d" % (labels, s["attempts"]))
+        for kind in ("prompt", "response"):
+            samples["llm_tokens_total"].append('llm_tokens_total{%s,kind="%s"} %d' % (labels, kind, s[kind + "_tokens"]))
+
+    lines = []
+    for name, kind, help_text in PROMETHEUS_FAMILIES:
+        lines.append("# HELP %s %s" % (name, help_text))
+        lines.append("# TYPE %s %s" % (name, kind))
+        lines.extend(samples[name])
+    return "\n".join(lines) + "\n"
+
+
+def reset_metrics():
+    with _lock:
+        _series.clear()
+        _recent_traces.clear()
@@ -1,5 +1,7 @@
 import os
+import re
 import base64
+import hashlib
 import uuid
 import cloudinary
 import cloudinary.uploader
@@ -14,6 +16,14 @@ from PIL import Image
 from io import BytesIO
 import google.generativeai as genai
 from dotenv import load_dotenv
+from llm_gateway import gen_call
+from image_prep import preprocess_image
+from routes.signup.user_cache import get_profile, invalidate_user
+
+try:  # 선택: 걸음 수 로컬 OCR
+    import pytesseract
+except ImportError:
+    pytesseract = None
 
 load_dotenv()
 genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
@@ -22,6 +32,11 @@ cloudinary.config(cloudinary_url=os.getenv("CLOUDINARY_URL"))
 
 challenge_bp = Blueprint('challenge', __name__, url_prefix='/api')
 
+# ---- [걸음 수 인증 설정] ----
+STEP_OCR_ENABLED          = os.getenv("STEP_OCR_ENABLED", "0") == "1" and pytesseract is not None
+STEP_OCR_LANG             = os.getenv("STEP_OCR_LANG", "kor+eng")
+STEP_VERIFY_CACHE_TTL_SEC = int(os.getenv("STEP_VERIFY_CACHE_TTL_SEC", str(60 * 24 * 3600)))
+
 # ---- [테스트 모드 설정] ----
 TEST_MODE = False             # 나중에 False로 바꾸면 원래대로 동작
 TEST_NICKNAME = "chaelim"    # 테스트할 닉네임 (하드코딩)
@@ -88,8 +103,8 @@ def get_challenges():
         nickname = get_nickname(request.args.get("nickname"))  # 유연하게 처리
 
         if filter_type == "my":
-            user = mongo.db.users.find_one({"nickname": nickname})
-            if not user or "joined_challenges" not in user or not user["joined_challenges"]:
+            user = get_profile(nickname=nickname, live=("joined_challenges",))
+            if not user or not user["joined_challenges"]:
                 return jsonify({"message": "참여 중인 챌린지가 없습니다."}), 200
             challenge_ids = [ObjectId(cid) for cid in user["joined_challenges"]]
             challenges = list(mongo.db.challenges.find({"_id": {"$in": challenge_ids}}))
@@ -158,8 +173,8 @@ def join_challenge():
 
         entry_fee = challenge.get("points_reward", 0)
 
-        # 2. 사용자 정보 조회
-        user = mongo.db.users.find_one({"nickname": nickname})
+        # 2. 사용자 정보 조회 (포인트만)
+        user = mongo.db.users.find_one({"nickname": nickname}, {"point": 1})
         if not user:
             return jsonify({"error": "사용자를 찾을 수 없습니다."}), 404
 
@@ -190,6 +205,7 @@ def join_challenge():
                 "$inc": {"point": -entry_fee}
             }
         )
+        invalidate_user(nickname)
 
         # 5. 포인트 기록 저장
         mongo.db.point_history.insert_one({
@@ -222,13 +238,13 @@ def join_challenge():
 def get_user_info():
     try:
         nickname = get_nickname(request.args.get("nickname"))
-        user = mongo.db.users.find_one({"nickname": nickname})
+        user = get_profile(nickname=nickname, live=("point",))
         if not user:
             return jsonify({"error": "User not found"}), 404
 
         return jsonify({
-            "nickname": user.get("nickname", ""),
-            "point": user.get("point", 0)
+            "nickname": user["nickname"],
+            "point": user["point"]
         }), 200
 
     except Exception as e:
@@ -289,7 +305,7 @@ def apply_refund():
         if not all([nickname, bank, account_number, account_holder, refund_amount]):
             return jsonify({"error": "모든 필드를 입력해주세요."}), 400
 
-        user = mongo.db.users.find_one({"nickname": nickname})
+        user = mongo.db.users.find_one({"nickname": nickname}, {"point": 1})
         if not user:
             return jsonify({"error": "사용자를 찾을 수 없습니다."}), 404
 
@@ -313,6 +329,7 @@ def apply_refund():
             {"nickname": nickname},
             {"$inc": {"point": -refund_amount}}
         )
+        invalidate_user(nickname)
 
         # 3. 포인트 기록 추가
         mongo.db.point_history.insert_one({
@@ -331,6 +348,10 @@ def apply_refund():
 
 
 # ------------------ 이미지 인증 ------------------
+#  - 전부 메모리에서 처리 (디스크 저장 없음)
+#  - 이미 인증된 날이면 이미지 분석 생략
+#  - 같은 (nickname, challenge_id)에 같은 이미지(SHA-256)를 다시 보내면 저장된 결과 재사용
+#  - 선택: 로컬 OCR(pytesseract)로 먼저 걸음 수를 읽고, 실패 시에만 LLM 호출
 @challenge_bp.route("/challenges/verify", methods=["POST"])
 def verify_challenge_image():
     data = request.get_json()
@@ -343,23 +364,45 @@ def verify_challenge_image():
         return jsonify({"error": "필수 항목 누락"}), 400
 
     # ✅ 챌린지에서 목표 걸음수 가져오기 (클라에서 안 받음!)
-    ch = mongo.db.challenges.find_one({"_id": ObjectId(challenge_id)})
+    ch = mongo.db.challenges.find_one({"_id": ObjectId(challenge_id)}, {"goal_steps": 1})
     if not ch:
         return jsonify({"error": "챌린지를 찾을 수 없습니다."}), 404
     goal_steps = int(ch.get("goal_steps", 8000))
 
-    # 디코딩 후 임시 저장
-    image_bytes = base64.b64decode(base64_image)
-    image = Image.open(BytesIO(image_bytes))
-
-    upload_folder = "uploads"
-    os.makedirs(upload_folder, exist_ok=True)
-    save_path = os.path.join(upload_folder, f"{nickname}_{challenge_id}_{today_day}.jpg")
-    image.save(save_path)
+    # 이미 인증된 날이면 분석 없이 성공 처리
+    verification = mongo.db.challenge_verification.find_one(
+        {"nickname": nickname, "challenge_id": challenge_id}, {"certified_days": 1}
+    )
+    if verification and today_day in verification.get("certified_days", []):
+        return jsonify({"success": True, "message": "이미 인증된 날입니다."}), 200
 
-    # LLM으로 걷기 수 판단
-    extracted_steps = extract_steps_with_llm(save_path)
-    print(f"[DEBUG] 추출된 걸음 수: {extracted_steps} / 목표 걸음 수: {goal_steps}")
+    try:
+        image_bytes = base64.b64decode(base64_image)
+    except Exception:
+        return jsonify({"error": "이미지 디코딩 실패"}), 400
+    image_hash = hashlib.sha256(image_bytes).hexdigest()
+
+    # 같은 이미지 재제출 → 저장된 걸음 수 재사용
+    cached = mongo.db.challenge_verify_cache.find_one(
+        {"nickname": nickname, "challenge_id": challenge_id, "image_hash": image_hash}
+    )
+    if cached:
+        extracted_steps = cached.get("steps", 0)
+        if extracted_steps >= goal_steps and cached.get("today_day") != today_day:
+            return jsonify({"success": False, "message": "이미 다른 날 인증에 사용된 이미지입니다."}), 200
+        source = "cache"
+    else:
+        extracted_steps, source = extract_steps(image_bytes)
+        if extracted_steps is None:
+            # LLM 장애/응답 파싱 실패: 캐시하지 않음 → 같은 이미지로 다시 시도 가능
+            return jsonify({"success": False, "message": "걸음 수를 읽지 못했습니다. 잠시 후 다시 시도해주세요."}), 200
+        mongo.db.challenge_verify_cache.update_one(
+            {"nickname": nickname, "challenge_id": challenge_id, "image_hash": image_hash},
+            {"$set": {"steps": extracted_steps, "source": source, "today_day": today_day,
+                      "created_at": datetime.utcnow()}},
+            upsert=True
+        )
+    print(f"[DEBUG] 추출된 걸음 수({source}): {extracted_steps} / 목표 걸음 수: {goal_steps}")
 
     if extracted_steps < goal_steps:
         return jsonify({"success": False, "message": "걸음 수 부족"}), 200
@@ -373,20 +416,66 @@ def verify_challenge_image():
     return jsonify({"success": True, "message": "인증 성공"}), 200
 
 
+def extract_steps(image_bytes):
+    """걸음 수 추출: 로컬 OCR 우선(설정 시) → LLM. 반환 (걸음 수 | 실패 시 None, 출처)"""
+    if STEP_OCR_ENABLED:
+        steps = extract_steps_with_ocr(image_bytes)
+        if steps is not None:
+            return steps, "ocr"
+    prepared, mime = preprocess_image(image_bytes)
+    return extract_steps_with_llm(prepared, mime), "llm"
+
 
-def extract_steps_with_llm(image_path):
+# "8,532 걸음", "걸음 수 8532", "8532 steps" 처럼 라벨이 붙은 숫자만 신뢰
+_STEP_PATTERNS = [
+    re.compile(r"(\d{1,3}(?:,\d{3})+|\d+)\s*(?:걸음|steps?)", re.I),
+    re.compile(r"(?:걸음\s*수?|steps?)\s*[:：]?\s*(\d{1,3}(?:,\d{3})+|\d+)", re.I),
+]
+
+def extract_steps_with_ocr(image_bytes):
+    """로컬 OCR로 걸음 수 추출. 라벨이 붙은 숫자를 못 찾으면 None (→ LLM 폴백)"""
+    try:
+        img = Image.open(BytesIO(image_bytes)).convert("L")
+        text = pytesseract.image_to_string(img, lang=STEP_OCR_LANG)
+    except Exception as e:
+        print(f"[WARN] OCR 실패: {e}")
+        return None
+    candidates = [int(m.replace(",", "")) for p in _STEP_PATTERNS for m in p.findall(text)]
+    candidates = [c for c in candidates if 0 < c < 200000]
+    return max(candidates) if candidates else None
+
+
+def extract_steps_with_llm(image_bytes, mime="image/jpeg"):
     prompt = """
     이 이미지가 만보기 앱 캡처로 보인다면 해당 이미지에 기록된 걸음 수를 숫자로 추출해주세요.
     숫자만 출력하세요. 다른 말은 하지 마세요.
     """
-    img = Image.open(image_path)
     try:
-        response = model.generate_content([prompt, img])
-        result = response.text.strip()
-        return int("".join(filter(str.isdigit, result)))
+        response = gen_call(
+            model,
+            [{"text": prompt}, {"inline_data": {"mime_type": mime, "data": base64.b64encode(image_bytes).decode("utf-8")}}],
+            timeout=30, retries=2
+        )
+        if response is None:
+            return None
+        digits = "".join(filter(str.isdigit, response.text.strip()))
+        return int(digits) if digits else None
     except Exception as e:
         print(f"[ERROR] 걸음 수 추출 실패: {e}")
-        return 0
+        return None
+
+
+def ensure_indexes():
+    """
+    이미지 인증 결과 캐시: 재제출 조회용 유니크 인덱스 + TTL
+    참여 중 챌린지/인증 현황 조회(대시보드 등)용 인덱스
+    """
+    mongo.db.challenge_verify_cache.create_index(
+        [("nickname", 1), ("challenge_id", 1), ("image_hash", 1)], unique=True
+    )
+    mongo.db.challenge_verify_cache.create_index("created_at", expireAfterSeconds=STEP_VERIFY_CACHE_TTL_SEC)
+    mongo.db.challenges.create_index([("joined_users", 1), ("status", 1)])
+    mongo.db.challenge_verification.create_index([("nickname", 1), ("challenge_id", 1)])
 
 
 # ------------------ 보상 ------------------
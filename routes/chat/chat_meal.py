@@ -3,11 +3,22 @@ from flask import Blueprint, request, jsonify
 from extensions import mongo
 from datetime import datetime, timedelta
 from dotenv import load_dotenv
-import os, json, re, ast, base64, requests
+import os, json, re, ast, base64, requests, hashlib, copy, threading
 import google.generativeai as genai
-import time
 import logging
+from io import BytesIO
+from collections import OrderedDict
 from bson import ObjectId
+from pymongo import ReplaceOne
+from cache import TTLCache
+from llm_gateway import gen_call
+from image_prep import preprocess_image
+from routes.chat.mind_local import classify_food, emoji_for_name
+
+try:  # 지각 해시(perceptual hash)용, 선택 의존성
+    from PIL import Image
+except ImportError:
+    Image = None
 
 # --- Blueprint 설정 ---
 chat_meal_bp = Blueprint('chat_meal', __name__, url_prefix='/api')
@@ -18,6 +29,39 @@ genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
 TEXT_MODEL   = genai.GenerativeModel("gemini-2.5-flash")
 VISION_MODEL = genai.GenerativeModel("gemini-2.5-flash")
 
+# --- MIND 점수 캐시 설정 ---
+#  - 1단계: 프로세스 메모리(LRU + TTL)
+#  - 2단계: MongoDB mind_score_cache 컬렉션(TTL 인덱스로 자동 만료, 워커 간 공유)
+MIND_CACHE_MAXSIZE       = int(os.getenv("MIND_CACHE_MAXSIZE", "2048"))
+MIND_CACHE_TTL_SEC       = int(os.getenv("MIND_CACHE_TTL_SEC", "3600"))
+MIND_CACHE_MONGO_TTL_SEC = int(os.getenv("MIND_CACHE_MONGO_TTL_SEC", str(7 * 24 * 3600)))
+#  - 음식 단위 점수 저장소(mind_food_scores): 한 번 평가된 음식은 다시 LLM에 보내지 않음
+MIND_FOOD_CACHE_MAXSIZE  = int(os.getenv("MIND_FOOD_CACHE_MAXSIZE", "8192"))
+MIND_FOOD_TTL_SEC        = int(os.getenv("MIND_FOOD_TTL_SEC", str(30 * 24 * 3600)))
+
+# --- 식사 사진 분석 캐시 (이미지 SHA-256, 선택적으로 지각 해시로 재인코딩본까지 매칭) ---
+MEAL_IMAGE_CACHE_MAXSIZE   = int(os.getenv("MEAL_IMAGE_CACHE_MAXSIZE", "1024"))
+MEAL_IMAGE_CACHE_TTL_SEC   = int(os.getenv("MEAL_IMAGE_CACHE_TTL_SEC", str(24 * 3600)))
+MEAL_IMAGE_PHASH           = os.getenv("MEAL_IMAGE_PHASH", "1") == "1" and Image is not None
+MEAL_IMAGE_PHASH_DISTANCE  = int(os.getenv("MEAL_IMAGE_PHASH_DISTANCE", "4"))
+
+# --- MIND 채점 모드 ---
+#  - llm   : 저장소에 없는 음식은 모두 Gemini로 채점
+#  - local : 규칙 기반 로컬 분류기만 사용 (Gemini 호출 없음)
+#  - hybrid: 로컬 분류 신뢰도가 MIND_LOCAL_CONFIDENCE 이상인 음식은 로컬, 나머지만 Gemini
+#  기본값은 llm. local/hybrid는 bench_mind_local.py --live --record 로 실제 LLM 라벨을 기록해
+#  일치도를 확인한 뒤에 켤 것 (현재 픽스처는 손으로 붙인 라벨이라 검증 근거가 안 됨)
+MIND_SCORER_MODE      = os.getenv("MIND_SCORER_MODE", "llm").strip().lower()
+MIND_LOCAL_CONFIDENCE = float(os.getenv("MIND_LOCAL_CONFIDENCE", "0.8"))
+
+# --- /api/chat-meal 파이프라인 ---
+#  - combined : 추출 + 채점을 Gemini 한 번으로 처리 (실패 시 two_stage로 폴백)
+#  - two_stage: 추출 호출 → score_foods_mind
+#  combined는 로컬 분류기를 거치지 않고 모든 음식을 Gemini로 채점하므로 MIND_SCORER_MODE=llm 일 때만 사용
+#  (local/hybrid 에서는 two_stage로 동작해 로컬 분류기와 음식 단위 저장소를 그대로 탐)
+MEAL_PIPELINE_MODE = os.getenv("MEAL_PIPELINE_MODE", "combined").strip().lower()
+USE_COMBINED_PIPELINE = MEAL_PIPELINE_MODE == "combined" and MIND_SCORER_MODE == "llm"
+
 # --- MIND 카테고리 (화이트리스트)
 #  - 모델이 한국어/영어 카테고리를 혼용해도 통과되도록 양쪽 키를 모두 허용
 MIND_CATEGORIES = {
@@ -59,6 +103,28 @@ CATEGORY_EMOJI = {
     "튀김/패스트푸드": "🍟",
 }
 
+# MIND 식단 점수 규칙 (채점 프롬프트 공용)
+MIND_RULES = """
+건강군: 뇌 건강에 매우 좋은 음식군 (높은 점수)
+- 녹색 잎채소: 케일, 시금치, 상추
+- 기타 채소: 브로콜리, 당근, 토마토
+- 견과류: 호두, 아몬드
+- 베리류: 딸기, 블루베리
+- 콩/두류: 렌즈콩, 두부
+- 통곡물: 현미, 오트밀
+- 생선: 연어, 고등어
+- 가금류: 닭고기, 오리고기
+- 올리브유
+- 와인
+
+제한군: 뇌 건강에 해로운 음식군 (낮은 점수)
+- 붉은 고기: 소고기, 돼지고기, 양고기
+- 버터/마가린
+- 치즈
+- 과자/디저트: 케이크, 쿠키, 아이스크림
+- 튀김/패스트푸드: 감자튀김, 햄버거
+"""
+
 POSITIVE_ORDER = ["녹색 잎채소","기타 채소","견과류","베리류","콩/두류","통곡물","생선","가금류","올리브유","와인"]
 NEGATIVE_ORDER = ["붉은 고기","버터/마가린","치즈","과자/디저트","튀김/패스트푸드"]
 
@@ -85,32 +151,8 @@ def _emoji_from_categories(categories:list, fallback_food_name:str=""):
         if cat in canon:
             return CATEGORY_EMOJI.get(cat, "")
 
-    # 3) 휴리스틱(음식 이름 기반)
-    n = (fallback_food_name or "").lower()
-    k = (fallback_food_name or "")
-    heuristics = [
-        (["샐러드","salad"], "🥗"),
-        (["연어","고등어","참치","생선","fish","salmon","mackerel","tuna"], "🐟"),
-        (["닭","치킨","가슴살","poultry","chicken"], "🍗"),
-        (["소고기","돼지고기","양고기","스테이크","beef","pork","lamb","steak"], "🥩"),
-        (["두부","콩","렌즈콩","병아리콩","tofu","bean","lentil","chickpea"], "🫘"),
-        (["현미","귀리","오트","퀴노아","통곡물","oat","quinoa","brown rice","whole"], "🌾"),
-        (["치즈","cheese"], "🧀"),
-        (["버터","마가린","butter","margarine"], "🧈"),
-        (["튀김","감자튀김","너겟","패스트푸드","햄버거","fried","fries","burger","nugget"], "🍟"),
-        (["과자","디저트","케이크","쿠키","초콜릿","아이스크림","dessert","cookie","cake","choco","ice cream"], "🍰"),
-        (["베리","블루베리","딸기","berry","blueberry","strawberry"], "🫐"),
-        (["올리브","olive"], "🫒"),
-        (["와인","wine"], "🍷"),
-        (["채소","시금치","상추","케일","veg","vegetable","leafy"], "🥬"),
-        (["브로콜리","당근","토마토","broccoli","carrot","tomato"], "🥦"),
-        (["견과","아몬드","호두","캐슈","nut","almond","walnut","cashew"], "🥜"),
-    ]
-    for keys, emo in heuristics:
-        for t in keys:
-            if t in n or t in k:
-                return emo
-    return ""
+    # 3) 휴리스틱(음식 이름 기반, 로컬 분류기의 키워드 매처 사용)
+    return emoji_for_name(fallback_food_name)
 
 # ---------- 공통 헬퍼 ----------
 def _extract_text_safe(resp):
@@ -154,30 +196,6 @@ def safe_parse_foods(text: str):
                 pass
     return []
 
-def _gen_call(model, contents, *, json_only=False, timeout=15, retries=3, backoff_base=0.6):
-    """
-    Gemini generate_content 안전 호출:
-    - timeout: 초 단위(요청 옵션)
-    - retries: 지수 백오프 재시도
-    - json_only=True면 application/json 강제
-    실패 시 None 반환
-    """
-    genconf = {"response_mime_type": "application/json"} if json_only else None
-    last_err = None
-    for i in range(retries):
-        try:
-            resp = model.generate_content(
-                contents,
-                generation_config=genconf,
-                request_options={"timeout": timeout}
-            )
-            return resp
-        except Exception as e:
-            last_err = e
-            time.sleep(backoff_base * (2 ** i))
-    logging.exception("Gemini call failed after retries: %s", last_err)
-    return None
-
 # ---------- 끼니명 표준화 ----------
 def _normalize_meal_type(value: str) -> str:
     if not value:
@@ -202,7 +220,7 @@ def extract_food_names(message: str):
 문장: "{message}"
 """
     # 1차: JSON 강제 + 재시도
-    resp = _gen_call(TEXT_MODEL, prompt, json_only=True, timeout=12, retries=3)
+    resp = gen_call(TEXT_MODEL, prompt, json_only=True, timeout=12, retries=3)
     text = _extract_text_safe(resp) if resp else None
     if text:
         try:
@@ -213,7 +231,7 @@ def extract_food_names(message: str):
             pass
 
     # 2차: 일반 텍스트 모드 + 재시도 → 백업 파서
-    resp2 = _gen_call(TEXT_MODEL, prompt, json_only=False, timeout=12, retries=2)
+    resp2 = gen_call(TEXT_MODEL, prompt, json_only=False, timeout=12, retries=2)
     text2 = _extract_text_safe(resp2) if resp2 else None
     if text2:
         foods = safe_parse_foods(text2)
@@ -222,65 +240,405 @@ def extract_food_names(message: str):
 
     return []
 
-def extract_foods_from_image_bytes(image_bytes: bytes, mime: str = "image/jpeg"):
+# ---------- 식사 사진 분석 캐시 ----------
+#  - 1단계: SHA-256 정확 일치 (메모리 → Mongo meal_image_cache)
+#  - 2단계: dHash(64bit) 해밍 거리 MEAL_IMAGE_PHASH_DISTANCE 이하 → 같은 사진의 재인코딩/리사이즈본
+_image_foods_cache = TTLCache(maxsize=MEAL_IMAGE_CACHE_MAXSIZE, ttl=MEAL_IMAGE_CACHE_TTL_SEC)
+_image_phash_index = OrderedDict()  # phash(int) -> digest, 최근 항목 MEAL_IMAGE_CACHE_MAXSIZE개
+_image_cache_lock = threading.Lock()
+_image_cache_counters = {"hits": 0, "phash_hits": 0, "mongo_hits": 0, "misses": 0}
+
+def _count_image_cache(name: str):
+    with _image_cache_lock:
+        _image_cache_counters[name] += 1
+
+def _image_dhash(image_bytes: bytes):
+    """64bit difference hash. Pillow가 없거나 디코딩 실패 시 None."""
+    if not MEAL_IMAGE_PHASH:
+        return None
+    try:
+        img = Image.open(BytesIO(image_bytes))
+        img.draft("L", (64, 64))  # JPEG는 저해상도로 디코딩
+        img = img.convert("L").resize((9, 8))
+        px = list(img.getdata())
+        bits = 0
+        for row in range(8):
+            for col in range(8):
+                bits = (bits << 1) | (px[row * 9 + col] > px[row * 9 + col + 1])
+        return bits
+    except Exception:
+        return None
+
+def image_cache_keys(image_bytes: bytes):
+    """(sha256 hex, dhash 또는 None)"""
+    return hashlib.sha256(image_bytes).hexdigest(), _image_dhash(image_bytes)
+
+def _image_cache_get(digest: str, phash):
+    foods = _image_foods_cache.get(digest)
+    if foods is not None:
+        _count_image_cache("hits")
+        return list(foods)
+    try:
+        doc = mongo.db.meal_image_cache.find_one({"_id": digest}, {"foods": 1})
+    except Exception as e:
+        logging.warning("meal_image_cache read failed: %s", e)
+        doc = None
+    if doc:
+        _count_image_cache("mongo_hits")
+        _image_foods_cache.set(digest, doc["foods"])
+        return list(doc["foods"])
+
+    if phash is not None:
+        with _image_cache_lock:
+            near = next((d for h, d in reversed(_image_phash_index.items())
+                         if bin(h ^ phash).count("1") <= MEAL_IMAGE_PHASH_DISTANCE), None)
+        foods = _image_foods_cache.get(near) if near else None
+        if foods is None:
+            try:
+                doc = mongo.db.meal_image_cache.find_one({"phash": str(phash)}, {"foods": 1})
+            except Exception:
+                doc = None
+            foods = doc["foods"] if doc else None
+        if foods is not None:
+            _count_image_cache("phash_hits")
+            return list(foods)
+
+    _count_image_cache("misses")
+    return None
+
+def _image_cache_put(digest: str, phash, foods: list):
+    if not foods:
+        return
+    _image_foods_cache.set(digest, list(foods))
+    if phash is not None:
+        with _image_cache_lock:
+            _image_phash_index[phash] = digest
+            _image_phash_index.move_to_end(phash)
+            while len(_image_phash_index) > MEAL_IMAGE_CACHE_MAXSIZE:
+                _image_phash_index.popitem(last=False)
+    try:
+        mongo.db.meal_image_cache.replace_one(
+            {"_id": digest},
+            {"_id": digest, "phash": str(phash) if phash is not None else None,
+             "foods": list(foods), "created_at": datetime.utcnow()},
+            upsert=True
+        )
+    except Exception as e:
+        logging.warning("meal_image_cache write failed: %s", e)
+
+def image_cache_stats() -> dict:
+    with _image_cache_lock:
+        counters = dict(_image_cache_counters)
+    return {"memory": _image_foods_cache.stats(), "phash_enabled": MEAL_IMAGE_PHASH, **counters}
+
+def extract_foods_from_image_bytes(image_bytes: bytes, mime: str = "image/jpeg", keys=None, cache_checked: bool = False):
+    """
+    사진 → 음식 이름 목록. 같은(또는 거의 같은) 사진은 캐시에서 바로 반환.
+    keys: 호출 측에서 이미 계산한 image_cache_keys() 결과 (선택)
+    cache_checked: 호출 측에서 이미 캐시를 조회해 없었으면 True (다시 조회하지 않음)
+    """
     if not image_bytes:
         return []
 
+    digest, phash = keys or image_cache_keys(image_bytes)
+    if not cache_checked:
+        cached = _image_cache_get(digest, phash)
+        if cached is not None:
+            return cached
+
     prompt = '이미지에 보이는 음식 이름만 추출해서 ["음식1","음식2"] 형태의 JSON 배열로만 응답.'
+    contents = [{"text": prompt}, {"inline_data": {"mime_type": mime, "data": base64.b64encode(image_bytes).decode("utf-8")}}]
+
     # 1차: JSON 강제
-    resp = _gen_call(
-        VISION_MODEL,
-        [{"text": prompt}, {"inline_data": {"mime_type": mime, "data": base64.b64encode(image_bytes).decode("utf-8")}}],
-        json_only=True, timeout=15, retries=3
-    )
+    resp = gen_call(VISION_MODEL, contents, json_only=True, timeout=15, retries=3)
     text = _extract_text_safe(resp) if resp else None
     if text:
         try:
             foods = json.loads(text)
             if isinstance(foods, list):
+                _image_cache_put(digest, phash, foods)
                 return foods
         except Exception:
             pass
 
     # 2차: 일반 텍스트 → 백업 파서
-    resp2 = _gen_call(
-        VISION_MODEL,
-        [{"text": prompt}, {"inline_data": {"mime_type": mime, "data": base64.b64encode(image_bytes).decode("utf-8")}}],
-        json_only=False, timeout=15, retries=2
-    )
+    resp2 = gen_call(VISION_MODEL, contents, json_only=False, timeout=15, retries=2)
     text2 = _extract_text_safe(resp2) if resp2 else None
     if text2:
         foods = safe_parse_foods(text2)
         if foods:
+            _image_cache_put(digest, phash, foods)
             return foods
 
     return []
 
+# ---------- MIND 점수 캐시 ----------
+_mind_memory_cache = TTLCache(maxsize=MIND_CACHE_MAXSIZE, ttl=MIND_CACHE_TTL_SEC)
+_mind_cache_lock = threading.Lock()
+_mind_cache_counters = {
+    "mongo_hits": 0, "misses": 0, "stores": 0, "errors": 0,
+    "food_hits": 0, "food_misses": 0, "local_scored": 0,
+}
+_food_score_cache = TTLCache(maxsize=MIND_FOOD_CACHE_MAXSIZE, ttl=MIND_FOOD_TTL_SEC)
+
+def _count_mind_cache(name: str, n: int = 1):
+    with _mind_cache_lock:
+        _mind_cache_counters[name] += n
+
+def _normalize_food_name(name) -> str:
+    """캐시 키용 음식명 정규화: 앞뒤 공백 제거, 소문자, 연속 공백 축약."""
+    return re.sub(r"\s+", " ", str(name or "")).strip().lower()
+
+def _mind_cache_key(foods: list, meal_type: str) -> str:
+    """정렬·정규화된 음식 목록 + 표준 끼니명의 정규 해시."""
+    names = sorted(n for n in (_normalize_food_name(f) for f in foods) if n)
+    payload = json.dumps({"foods": names, "meal_type": _normalize_meal_type(meal_type)},
+                         ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+def _mind_cache_get(key: str):
+    cached = _mind_memory_cache.get(key)
+    if cached is not None:
+        return copy.deepcopy(cached)
+    try:
+        doc = mongo.db.mind_score_cache.find_one({"_id": key}, {"result": 1})
+    except Exception as e:
+        _count_mind_cache("errors")
+        logging.warning("mind_score_cache read failed: %s", e)
+        doc = None
+    if doc and isinstance(doc.get("result"), dict):
+        _count_mind_cache("mongo_hits")
+        _mind_memory_cache.set(key, doc["result"])
+        return copy.deepcopy(doc["result"])
+    _count_mind_cache("misses")
+    return None
+
+def _mind_cache_put(key: str, result: dict):
+    _mind_memory_cache.set(key, copy.deepcopy(result))
+    try:
+        mongo.db.mind_score_cache.replace_one(
+            {"_id": key},
+            {"_id": key, "result": result, "created_at": datetime.utcnow()},
+            upsert=True
+        )
+        _count_mind_cache("stores")
+    except Exception as e:
+        _count_mind_cache("errors")
+        logging.warning("mind_score_cache write failed: %s", e)
+
+def mind_cache_stats() -> dict:
+    with _mind_cache_lock:
+        counters = dict(_mind_cache_counters)
+    memory = _mind_memory_cache.stats()
+    lookups = memory["hits"] + counters["mongo_hits"] + counters["misses"]
+    return {
+        "memory": memory,
+        "mongo_hits": counters["mongo_hits"],
+        "misses": counters["misses"],
+        "stores": counters["stores"],
+        "errors": counters["errors"],
+        "hit_rate": round((memory["hits"] + counters["mongo_hits"]) / lookups, 4) if lookups else 0.0,
+        "foods": {
+            "memory": _food_score_cache.stats(),
+            "hits": counters["food_hits"],
+            "misses": counters["food_misses"],
+            "local_scored": counters["local_scored"],
+        },
+        "images": image_cache_stats(),
+        "mode": MIND_SCORER_MODE,
+    }
+
+def ensure_indexes():
+    """mind_score_cache / mind_food_scores / meal_image_cache TTL 인덱스 (자동 만료)."""
+    mongo.db.mind_score_cache.create_index("created_at", expireAfterSeconds=MIND_CACHE_MONGO_TTL_SEC)
+    mongo.db.mind_food_scores.create_index("updated_at", expireAfterSeconds=MIND_FOOD_TTL_SEC)
+    mongo.db.meal_image_cache.create_index("created_at", expireAfterSeconds=MEAL_IMAGE_CACHE_TTL_SEC)
+    mongo.db.meal_image_cache.create_index("phash", sparse=True)
+
+# ---------- 음식 단위 MIND 점수 저장소 ----------
+def _lookup_food_scores(names: list) -> dict:
+    """정규화된 음식명 목록 → {정규화명: {food, categories, score, note}} (메모리 → Mongo 순)."""
+    found, missing = {}, []
+    for n in names:
+        entry = _food_score_cache.get(n)
+        if entry is not None:
+            found[n] = entry
+        elif n not in missing:
+            missing.append(n)
+    if missing:
+        try:
+            for doc in mongo.db.mind_food_scores.find({"_id": {"$in": missing}}):
+                entry = {k: doc.get(k) for k in ("food", "categories", "score", "note")}
+                found[doc["_id"]] = entry
+                _food_score_cache.set(doc["_id"], entry)
+        except Exception as e:
+            _count_mind_cache("errors")
+            logging.warning("mind_food_scores read failed: %s", e)
+    hits = sum(1 for n in names if n in found)
+    _count_mind_cache("food_hits", hits)
+    _count_mind_cache("food_misses", len(names) - hits)
+    return found
+
+def _store_food_scores(entries: dict):
+    """{정규화명: entry}를 메모리/Mongo에 저장. 점수 0(분석 실패로 간주)은 저장하지 않음."""
+    entries = {n: e for n, e in entries.items() if n and e.get("score")}
+    if not entries:
+        return
+    now = datetime.utcnow()
+    for n, e in entries.items():
+        _food_score_cache.set(n, e)
+    try:
+        mongo.db.mind_food_scores.bulk_write(
+            [ReplaceOne({"_id": n}, {"_id": n, **e, "updated_at": now}, upsert=True) for n, e in entries.items()],
+            ordered=False
+        )
+    except Exception as e:
+        _count_mind_cache("errors")
+        logging.warning("mind_food_scores write failed: %s", e)
+
+def _match_items_to_foods(foods: list, items: list) -> dict:
+    """
+    LLM이 돌려준 items를 입력 음식명에 매칭 → {정규화명: entry}.
+    이름 일치 → (개수가 같으면) 순서 → 부분 문자열 순으로 시도.
+    """
+    by_name = {_normalize_food_name(it.get("food")): it for it in items if isinstance(it, dict)}
+    matched = {}
+    for idx, f in enumerate(foods):
+        n = _normalize_food_name(f)
+        it = by_name.get(n)
+        if it is None and len(items) == len(foods) and isinstance(items[idx], dict):
+            it = items[idx]
+        if it is None:
+            it = next((v for k, v in by_name.items() if k and (k in n or n in k)), None)
+        if it is not None:
+            matched[n] = {
+                "food": f,
+                "categories": it.get("categories", []),
+                "score": it.get("score", 0),
+                "note": it.get("note", ""),
+            }
+    return matched
+
+# 제한군 → 대체 추천
+_NEGATIVE_SWAPS = {
+    "붉은 고기": "생선이나 닭가슴살",
+    "버터/마가린": "올리브유",
+    "치즈": "견과류",
+    "과자/디저트": "베리류나 견과류",
+    "튀김/패스트푸드": "찜이나 구이 요리",
+}
+
+def _compose_meal_feedback(items: list, meal_score: float):
+    """저장된 음식 점수만으로 식사 단위 notes / recommendation을 LLM 없이 생성."""
+    canon = []
+    for it in items:
+        for c in it.get("categories", []):
+            label = MIND_CATEGORIES.get(c)
+            if label and label not in canon:
+                canon.append(label)
+    pos = [c for c in POSITIVE_ORDER if c in canon]
+    neg = [c for c in NEGATIVE_ORDER if c in canon]
+
+    if meal_score >= 70:
+        notes = f"{', '.join(pos[:2]) or '건강한 음식'} 위주의 식단으로 뇌 건강에 좋습니다."
+    elif meal_score >= 40:
+        notes = "무난한 식단이에요." + (f" {neg[0]} 비중을 줄이면 더 좋아요." if neg else "")
+    else:
+        notes = f"{', '.join(neg[:2]) or '제한군 음식'} 위주라 점수가 낮습니다."
+
+    if neg:
+        recommendation = f"다음 식사에는 {neg[0]} 대신 {_NEGATIVE_SWAPS[neg[0]]}을(를) 선택해 보세요."
+    else:
+        missing = next((c for c in POSITIVE_ORDER if c not in pos), None)
+        recommendation = (f"다음 식사에는 {missing}을(를) 곁들여 보세요." if missing
+                          else "지금처럼 다양한 건강군 음식을 유지해 보세요!")
+    return notes, recommendation
+
+def _score_locally(foods: list, known: dict) -> list:
+    """
+    채점 모드에 따라 로컬 분류기로 처리할 수 있는 음식을 known에 채우고,
+    LLM에 보내야 할 음식만 반환. (로컬 결과는 음식 저장소에 저장하지 않음)
+    """
+    if MIND_SCORER_MODE not in ("local", "hybrid"):
+        return foods
+    remaining = []
+    for f in foods:
+        local = classify_food(f)
+        if MIND_SCORER_MODE == "local" or local["confidence"] >= MIND_LOCAL_CONFIDENCE:
+            local.pop("confidence")
+            known[_normalize_food_name(f)] = local
+            _count_mind_cache("local_scored")
+        else:
+            remaining.append(f)
+    return remaining
+
+def _score_foods_assembled(foods: list, meal_type: str):
+    """
+    음식 단위 저장소 + 로컬 분류기로 식사 점수를 조립. 둘 다 못 채운 음식만 LLM에 보낸다.
+    반환: (결과 dict, 모든 음식이 유효 점수로 채워졌는지 여부)
+    """
+    names = [_normalize_food_name(f) for f in foods]
+    known = _lookup_food_scores(names)
+
+    unknown, seen = [], set()
+    for f, n in zip(foods, names):
+        if n and n not in known and n not in seen:
+            unknown.append(f)
+            seen.add(n)
+    unknown = _score_locally(unknown, known)
+
+    llm_result = None
+    if unknown:
+        context = [known[n]["food"] for n in dict.fromkeys(names) if n in known]
+        llm_result = _score_foods_mind_llm(unknown, meal_type, context_foods=context)
+        fresh = _match_items_to_foods(unknown, llm_result.get("items", []))
+        _store_food_scores(fresh)
+        known.update(fresh)
+
+    items, total, valid = [], 0.0, 0
+    for f, n in zip(foods, names):
+        entry = known.get(n)
+        if not entry:
+            continue
+        items.append({"food": f, "categories": list(entry.get("categories") or []),
+                      "score": entry.get("score", 0), "note": entry.get("note", "")})
+        if entry.get("score"):
+            total += entry["score"]
+            valid += 1
+
+    meal_score = round(total / max(1, valid), 1)
+    if llm_result and (llm_result.get("notes") or llm_result.get("recommendation")):
+        notes, recommendation = llm_result.get("notes", ""), llm_result.get("recommendation", "")
+    elif items:
+        notes, recommendation = _compose_meal_feedback(items, meal_score)
+    else:
+        notes, recommendation = "", ""
+
+    complete = bool(items) and valid == len(foods)
+    return {"items": items, "meal_score": meal_score, "notes": notes, "recommendation": recommendation}, complete
+
 # ---------- MIND 점수 (첫 번째 코드 프롬프트) ----------
 def score_foods_mind(foods: list, meal_type: str):
+    """
+    MIND 점수 산출 (캐시 우선).
+    1) 같은 음식 조합 + 같은 끼니면 식사 캐시(메모리 → Mongo)에서 바로 반환
+    2) 아니면 음식 단위 저장소로 조립하고, 처음 보는 음식만 Gemini에 보낸다.
+    일부 음식이라도 분석에 실패한 결과는 식사 캐시에 넣지 않음.
+    """
     if not foods:
         return {"items": [], "meal_score": 0.0, "notes": "음식 목록이 비어있습니다.", "recommendation": "식사를 기록해 보세요!"}
 
-    mind_rules = """
-건강군: 뇌 건강에 매우 좋은 음식군 (높은 점수)
-- 녹색 잎채소: 케일, 시금치, 상추
-- 기타 채소: 브로콜리, 당근, 토마토
-- 견과류: 호두, 아몬드
-- 베리류: 딸기, 블루베리
-- 콩/두류: 렌즈콩, 두부
-- 통곡물: 현미, 오트밀
-- 생선: 연어, 고등어
-- 가금류: 닭고기, 오리고기
-- 올리브유
-- 와인
+    key = _mind_cache_key(foods, meal_type)
+    cached = _mind_cache_get(key)
+    if cached is not None:
+        return cached
 
-제한군: 뇌 건강에 해로운 음식군 (낮은 점수)
-- 붉은 고기: 소고기, 돼지고기, 양고기
-- 버터/마가린
-- 치즈
-- 과자/디저트: 케이크, 쿠키, 아이스크림
-- 튀김/패스트푸드: 감자튀김, 햄버거
-"""
+    result, complete = _score_foods_assembled(foods, meal_type)
+    if complete:
+        _mind_cache_put(key, result)
+    return result
+
+def _score_foods_mind_llm(foods: list, meal_type: str, context_foods: list = None):
 
     prompt = f"""
 너는 '저속노화'에 대해 잘 아는 영양 코치다. 다음 음식들을 MIND 식단 기준에 따라 100점 만점 점수를 매겨줘.
@@ -288,7 +646,7 @@ def score_foods_mind(foods: list, meal_type: str):
 아래 규칙을 고려하여, 각 음식에 대한 점수(score), 카테고리, 간단한 설명을 JSON 객체로 반환해.
 
 # MIND 식단 점수 규칙
-{mind_rules}
+{MIND_RULES}
 
 - 각 음식에 대해 MIND 카테고리를 지정하고, 100점 만점 점수(score)를 정수로 산출해.
 - 'note'에는 점수에 대한 간단한 설명을 남겨줘.
@@ -301,9 +659,27 @@ def score_foods_mind(foods: list, meal_type: str):
 음식 리스트: {foods}
 식사 타입: {meal_type}
 """
-    resp = _gen_call(TEXT_MODEL, prompt, json_only=True, timeout=15, retries=3)
+    if context_foods:
+        prompt += f"""함께 먹은 음식(이미 평가됨, items에는 넣지 말고 notes/recommendation 작성에만 참고): {context_foods}
+"""
+    resp = gen_call(TEXT_MODEL, prompt, json_only=True, timeout=15, retries=3)
     text = _extract_text_safe(resp) if resp else None
-    
+    data = _parse_json_object(text)
+
+    logging.info(f"Gemini raw response: {text}")
+    logging.info(f"Parsed data: {data}")
+
+    items = data.get("items", []) if isinstance(data.get("items"), list) else []
+    notes = data.get("notes", "")
+    recommendation = data.get("recommendation", "")
+    final_meal_score = _finalize_mind_items(items)
+
+    logging.info(f"Calculated final meal score: {final_meal_score}")
+
+    return {"items": items, "meal_score": final_meal_score, "notes": notes, "recommendation": recommendation}
+
+def _parse_json_object(text: str) -> dict:
+    """코드블록/잡텍스트가 섞인 응답에서도 JSON 객체를 최대한 복구. 실패 시 {}."""
     data = {}
     if text:
         try:
@@ -316,14 +692,10 @@ def score_foods_mind(foods: list, meal_type: str):
                     data = json.loads(match.group(0))
             except Exception as e:
                 logging.error("Failed to parse JSON from Gemini response: %s | Error: %s", text, e)
-    
-    logging.info(f"Gemini raw response: {text}")
-    logging.info(f"Parsed data: {data}")
-
-    items = data.get("items", []) if isinstance(data, dict) else []
-    notes = data.get("notes", "") if isinstance(data, dict) else ""
-    recommendation = data.get("recommendation", "")
+    return data if isinstance(data, dict) else {}
 
+def _finalize_mind_items(items: list) -> float:
+    """items 점수 보정(0~100 정수) + 카테고리 화이트리스트 적용 후 식사 평균 점수 반환."""
     meal_score_total = 0.0
     valid_item_count = 0
     
@@ -342,11 +714,68 @@ def score_foods_mind(foods: list, meal_type: str):
         it["categories"] = [c for c in it.get("categories", []) if c in MIND_CATEGORIES]
         
     denom = max(1, valid_item_count)
-    final_meal_score = round(meal_score_total / denom, 1)
+    return round(meal_score_total / denom, 1)
 
-    logging.info(f"Calculated final meal score: {final_meal_score}")
+# ---------- 추출 + 채점 단일 호출 ----------
+def extract_and_score(meal_type: str, message: str = "", image_bytes: bytes = None, mime: str = "image/jpeg"):
+    """
+    텍스트 또는 이미지에서 음식 추출과 MIND 채점을 Gemini 한 번의 JSON 호출로 처리.
+    성공 시 (foods, mind) / 실패 시 (None, None) → 호출 측에서 2단계 흐름으로 폴백.
+    결과는 음식 단위 저장소와 식사 캐시에도 채워 넣는다.
+    """
+    if image_bytes:
+        source_desc = "첨부한 이미지에 보이는 음식"
+    elif message and message.strip():
+        source_desc = f'다음 문장에 나오는 음식 (문장: "{message}")'
+    else:
+        return None, None
 
-    return {"items": items, "meal_score": final_meal_score, "notes": notes, "recommendation": recommendation}
+    prompt = f"""
+너는 '저속노화'에 대해 잘 아는 영양 코치다.
+1) {source_desc}의 이름만 뽑아 'foods' 배열에 넣어줘.
+2) 뽑은 음식 각각을 MIND 식단 기준에 따라 100점 만점 점수로 평가해 'items'에 넣어줘.
+
+# MIND 식단 점수 규칙
+{MIND_RULES}
+
+- 'foods'에 없는 음식은 평가하지 마. 음식이 없으면 foods와 items를 빈 배열로 응답해.
+- 각 item에는 food(=foods의 이름 그대로), categories(MIND 카테고리), score(정수), note(간단한 설명)를 넣어줘.
+- 'notes'에는 식사 전체 평가, 'recommendation'에는 다음 식사를 위한 저속노화 관점의 구체적인 팁을 말풍선에 담기기 쉽게 간단히 작성해줘.
+- 반드시 JSON 객체만 응답해.
+  - 예시: {{"foods":["닭가슴살 샐러드"], "items":[ {{"food":"닭가슴살 샐러드", "categories":["가금류", "녹색 잎채소"], "score":90, "note":"뇌 건강에 좋은 채소와 단백질이 풍부합니다."}} ], "notes":"오늘 식단은 뇌 건강에 매우 긍정적입니다.", "recommendation":"다음 식사에는 통곡물을 곁들여 보세요."}}
+
+식사 타입: {meal_type}
+"""
+    if image_bytes:
+        model = VISION_MODEL
+        contents = [{"text": prompt}, {"inline_data": {"mime_type": mime, "data": base64.b64encode(image_bytes).decode("utf-8")}}]
+    else:
+        model, contents = TEXT_MODEL, prompt
+
+    resp = gen_call(model, contents, json_only=True, timeout=20, retries=2)
+    data = _parse_json_object(_extract_text_safe(resp) if resp else None)
+    foods, items = data.get("foods"), data.get("items")
+    if not isinstance(foods, list) or not isinstance(items, list):
+        return None, None
+
+    foods = [str(f).strip() for f in foods if str(f).strip()]
+    if not foods:
+        return [], score_foods_mind([], meal_type)
+
+    items = [it for it in items if isinstance(it, dict)]
+    meal_score = _finalize_mind_items(items)
+    mind = {
+        "items": items,
+        "meal_score": meal_score,
+        "notes": data.get("notes", ""),
+        "recommendation": data.get("recommendation", ""),
+    }
+
+    matched = _match_items_to_foods(foods, items)
+    _store_food_scores(matched)
+    if len(matched) == len({_normalize_food_name(f) for f in foods}) and all(e.get("score") for e in matched.values()):
+        _mind_cache_put(_mind_cache_key(foods, meal_type), mind)
+    return foods, mind
 
 # ---------- [1] 음식 검색: 첫 번째 프롬프트 흐름 재사용 + 이모지 매핑 ----------
 @chat_meal_bp.route('/foods/search', methods=['POST'])
@@ -393,6 +822,11 @@ def search_food_with_gemini():
 
     return jsonify(out), 200
 
+# ---------- MIND 캐시 상태 ----------
+@chat_meal_bp.route('/foods/score-cache/stats', methods=['GET'])
+def get_mind_cache_stats():
+    return jsonify(mind_cache_stats()), 200
+
 # ---------- [2] 수기 추가 ----------
 @chat_meal_bp.route("/meals/add", methods=["POST"])
 def add_meal_record():
@@ -445,8 +879,9 @@ def add_meal_record():
             "timestamp": ts,
         }
 
+        # 저장한 문서를 그대로 응답 (time-series 컬렉션은 _id 인덱스가 없어 다시 읽으면 전체 버킷 스캔)
         result   = mongo.db.diet_records.insert_one(meal_document)
-        inserted = mongo.db.diet_records.find_one({"_id": result.inserted_id})
+        inserted = dict(meal_document, _id=result.inserted_id)
 
         inserted["_id"] = str(inserted["_id"])
         if isinstance(inserted.get("timestamp"), datetime):
@@ -533,13 +968,14 @@ def chat_meal():
         img_mime  = (data.get("image_mime") or "image/jpeg").split(";")[0].strip()
 
         foods = []
+        mind_result = None
         source = "unknown"
+        image_bytes, mime = None, img_mime
 
         # 1) base64 이미지
         if img_b64:
             try:
                 image_bytes = base64.b64decode(img_b64)
-                foods = extract_foods_from_image_bytes(image_bytes, mime=img_mime)
                 source = "image_base64"
             except Exception as e:
                 logging.error("base64 decode error: %s", e)
@@ -549,15 +985,44 @@ def chat_meal():
             r = requests.get(image_url, timeout=10)
             r.raise_for_status()
             mime = (r.headers.get("Content-Type") or "image/jpeg").split(";")[0].strip()
-            foods = extract_foods_from_image_bytes(r.content, mime=mime)
+            image_bytes = r.content
             source = "image"
 
         # 3) 텍스트
         else:
-            foods = extract_food_names(message)
             source = "text"
 
-        mind_result = score_foods_mind(foods, meal_type)
+        # 같은 사진을 다시 보낸 경우: 캐시된 음식 목록으로 바로 채점
+        # (two_stage 모드에서는 extract_foods_from_image_bytes가 캐시를 확인)
+        image_keys = image_cache_keys(image_bytes) if image_bytes else None
+        image_cache_checked = False
+        if image_keys and USE_COMBINED_PIPELINE:
+            cached_foods = _image_cache_get(*image_keys)
+            image_cache_checked = cached_foods is None
+            if cached_foods is not None:
+                foods, mind_result = cached_foods, score_foods_mind(cached_foods, meal_type)
+
+        # 캐시에 없으면 비전 호출 전에 축소·재인코딩 (캐시 키는 원본 기준)
+        if image_bytes and mind_result is None:
+            image_bytes, mime = preprocess_image(image_bytes, mime)
+
+        # 단일 호출(추출 + 채점) 우선
+        if mind_result is None and USE_COMBINED_PIPELINE and (image_bytes or source == "text"):
+            combined_foods, combined_mind = extract_and_score(meal_type, message=message, image_bytes=image_bytes, mime=mime)
+            if combined_mind is not None:
+                foods, mind_result = combined_foods, combined_mind
+                if image_keys:
+                    _image_cache_put(*image_keys, foods)
+
+        # 폴백: 기존 2단계 흐름 (추출 → 채점)
+        if mind_result is None:
+            if image_bytes:
+                # 위에서 캐시를 이미 조회했으면 다시 읽지 않음 (Mongo 조회/미스 카운터 중복 방지)
+                foods = extract_foods_from_image_bytes(image_bytes, mime=mime, keys=image_keys,
+                                                       cache_checked=image_cache_checked)
+            elif source == "text":
+                foods = extract_food_names(message)
+            mind_result = score_foods_mind(foods, meal_type)
 
         mongo.db.diet_records.insert_one({
             "nickname": nickname,
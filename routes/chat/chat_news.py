@@ -5,6 +5,7 @@ import os
 import google.generativeai as genai
 import re
 import html
+from llm_gateway import gen_call
 
 news_bp = Blueprint("news", __name__)
 
@@ -57,7 +58,9 @@ def clean_html_tags(text):
 def summarize_with_gemini(text):
     prompt = f"다음 뉴스 내용을 한 문장으로 요약해줘:\n{text}"
     try:
-        response = model.generate_content(prompt)
+        response = gen_call(model, prompt, timeout=10, retries=2)
+        if response is None:
+            return "요약 실패"
         return response.candidates[0].content.parts[0].text.strip()
     except Exception as e:
         return "요약 실패"
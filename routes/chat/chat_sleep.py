@@ -1,6 +1,7 @@
 from flask import Blueprint, request, jsonify
 from datetime import datetime
 from extensions import mongo
+from routes.stats.rollups import record_event
 
 record_sleep_bp = Blueprint("record_sleep", __name__)
 
@@ -25,6 +26,13 @@ def record_sleep():
         "total_minutes": total_minutes
     })
 
+    # 일/주/월 집계 반영 (원본 먼저 → 집계, 물과 같은 순서. 실패해도 원본 기록은 남았으므로
+    # python scripts/rebuild_wellness_rollups.py --metric sleep 으로 복구 가능)
+    try:
+        record_event("sleep", nickname, total_minutes, now)
+    except Exception as e:
+        print("[ERROR] 수면 집계 갱신 실패:", str(e))
+
     return jsonify({
         "success": True,
         "total_minutes": total_minutes
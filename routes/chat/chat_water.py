@@ -1,9 +1,34 @@
 from flask import Blueprint, request, jsonify
 from datetime import datetime, timedelta
 from extensions import mongo
+from routes.stats.rollups import record_event
 
 record_water_bp = Blueprint("record_water", __name__)
 
+# ---------- 하루 물 섭취량 ----------
+#  - 오늘 합계는 water_daily((nickname, date) 당 문서 1개)에 $inc upsert로 누적 → 갱신 후 합계를 바로 반환
+#    (주/월 집계도 같이 갱신, routes/stats/rollups.py)
+#  - 순서: 원본 기록(water_records, 저장 방식은 event_store.py) 먼저 → 집계 (수면과 같음)
+#    집계 갱신이 실패해도 원본은 남으므로 rebuild 스크립트로 복구 가능
+#    (원본을 먼저 쓰므로 당시 합계 daily_total은 원본에 넣지 않고 응답으로만 반환)
+#  - 기존 기록으로 집계를 다시 만들 때: python scripts/rebuild_wellness_rollups.py --metric water
+#    (scripts/backfill_water_daily.py 도 같은 작업)
+
+def add_daily_cups(nickname: str, cups: int, now: datetime) -> int:
+    """오늘 합계에 cups를 더하고 새 합계 반환 (동시 요청에도 원자적, 주/월 집계도 함께 갱신)"""
+    return record_event("water", nickname, cups, now)
+
+
+def _sum_today(nickname: str, now: datetime) -> int:
+    """집계 갱신 실패 시 응답용: 오늘 원본 기록 합산"""
+    start = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    rows = mongo.db.water_records.aggregate([
+        {"$match": {"nickname": nickname, "timestamp": {"$gte": start, "$lt": start + timedelta(days=1)}}},
+        {"$group": {"_id": None, "cups": {"$sum": "$cups"}}},
+    ])
+    return next(rows, {}).get("cups", 0)
+
+
 @record_water_bp.route("/record-water", methods=["POST"])
 def record_water():
     data = request.get_json()
@@ -13,26 +38,22 @@ def record_water():
     if not nickname or cups <= 0:
         return jsonify({"success": False, "error": "Invalid data"}), 400
 
-    # 현재 시간 및 오늘 00시 기준 시간 구하기
     now = datetime.now()
-    today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
-
-    # 오늘 기록된 누적 수치 불러오기
-    today_records = mongo.db.water_records.find({
-        "nickname": nickname,
-        "timestamp": {"$gte": today_start}
-    })
-
-    daily_total = sum(record["cups"] for record in today_records) + cups
 
     # 현재 기록 추가
     mongo.db.water_records.insert_one({
         "nickname": nickname,
         "timestamp": now,
-        "cups": cups,
-        "daily_total": daily_total
+        "cups": cups
     })
 
+    # 오늘 누적 수치 갱신 (기록 전체를 다시 합산하지 않음)
+    try:
+        daily_total = add_daily_cups(nickname, cups, now)
+    except Exception as e:
+        print("[ERROR] 물 집계 갱신 실패:", str(e))
+        daily_total = _sum_today(nickname, now)
+
     return jsonify({
         "success": True,
         "cups": cups,
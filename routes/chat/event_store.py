@@ -0,0 +1,70 @@
+# routes/chat/event_store.py
+# 건강 기록 이벤트 컬렉션(water_records, sleep_records, diet_records) 저장 방식
+#  - standard  : 일반 컬렉션 (기본값)
+#  - timeseries: MongoDB time-series 컬렉션 (metaField=nickname, timeField=timestamp)
+#                같은 사용자 기록이 시간순 버킷으로 묶여 압축되므로 저장 공간이 줄고 기간 조회가 빨라짐
+#  - 컬렉션 이름은 그대로라서 읽기/쓰기 코드(/api/history, /api/meals/list 등)는 바뀌지 않음
+#  - 기동 시 ensure_event_collections()가 없는 컬렉션을 모드에 맞게 만들고 (nickname, timestamp) 인덱스 준비
+#    → 다른 ensure_indexes보다 먼저 실행해야 함 (create_index는 컬렉션이 없으면 일반 컬렉션을 만들어버림)
+#  - 기존 일반 컬렉션 이전: python scripts/migrate_health_events_timeseries.py
+#  - 주의: time-series 컬렉션에서 _id로 한 건 삭제(/api/meals/delete)는 MongoDB 7.0 이상에서만 지원
+import os
+from extensions import mongo
+
+HEALTH_EVENT_STORAGE  = os.getenv("HEALTH_EVENT_STORAGE", "standard").strip().lower()   # standard | timeseries
+HEALTH_TS_GRANULARITY = os.getenv("HEALTH_TS_GRANULARITY", "hours")                      # seconds | minutes | hours
+HEALTH_TS_EXPIRE_DAYS = int(os.getenv("HEALTH_TS_EXPIRE_DAYS", "0"))                      # 0이면 자동 만료 없음
+
+EVENT_COLLECTIONS = ("water_records", "sleep_records", "diet_records")
+META_FIELD = "nickname"
+TIME_FIELD = "timestamp"
+
+
+def timeseries_options() -> dict:
+    """create_collection에 넘길 time-series 옵션"""
+    opts = {"timeseries": {"timeField": TIME_FIELD, "metaField": META_FIELD, "granularity": HEALTH_TS_GRANULARITY}}
+    if HEALTH_TS_EXPIRE_DAYS > 0:
+        opts["expireAfterSeconds"] = HEALTH_TS_EXPIRE_DAYS * 24 * 3600
+    return opts
+
+def collection_type(name: str, db=None):
+    """'timeseries' | 'collection' | None(없음)"""
+    db = db if db is not None else mongo.db
+    for info in db.list_collections(filter={"name": name}):
+        return info.get("type", "collection")
+    return None
+
+def create_event_collection(name: str, db=None):
+    """현재 저장 방식으로 이벤트 컬렉션 생성"""
+    db = db if db is not None else mongo.db
+    if HEALTH_EVENT_STORAGE == "timeseries":
+        db.create_collection(name, **timeseries_options())
+    else:
+        db.create_collection(name)
+
+def ensure_event_indexes(name: str, db=None):
+    """사용자별 최신순 조회 인덱스 (time-series에서는 meta + time 보조 인덱스)"""
+    db = db if db is not None else mongo.db
+    db[name].create_index([(META_FIELD, 1), (TIME_FIELD, -1)])
+
+def ensure_event_collections():
+    db = mongo.db
+    for name in EVENT_COLLECTIONS:
+        kind = collection_type(name, db)
+        if kind is None:
+            create_event_collection(name, db)
+        elif HEALTH_EVENT_STORAGE == "timeseries" and kind != "timeseries":
+            print(f"[WARN] {name}: 일반 컬렉션입니다. time-series로 옮기려면 scripts/migrate_health_events_timeseries.py 실행")
+        ensure_event_indexes(name, db)
+
+def storage_stats(name: str, db=None) -> dict:
+    """collStats 요약: 문서 수, 논리 크기, 실제 저장 크기, 인덱스 크기 (bytes)"""
+    db = db if db is not None else mongo.db
+    s = db.command("collStats", name)
+    return {
+        "type": collection_type(name, db),
+        "count": s.get("count", 0),
+        "size": s.get("size", 0),
+        "storageSize": s.get("storageSize", 0),
+        "totalIndexSize": s.get("totalIndexSize", 0),
+    }
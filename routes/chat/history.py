@@ -1,5 +1,6 @@
 from flask import Blueprint, request, jsonify
 from extensions import mongo
+from routes.signup.user_cache import nickname_for_email
 from datetime import datetime # datetime 임포트 추가
 
 main_routes = Blueprint('main_routes', __name__, url_prefix='/api')
@@ -10,11 +11,9 @@ def get_history():
     if not email:
         return jsonify({"error": "Email is required"}), 400
 
-    user = mongo.db.users.find_one({"email": email})
-    if not user:
+    nickname = nickname_for_email(email)  # 캐시에 있으면 users 조회 생략
+    if not nickname:
         return jsonify({"error": "User not found in history route"}), 404
-    
-    nickname = user['nickname']
 
     records_cursor = mongo.db.diet_records.find(
         {'nickname': nickname}
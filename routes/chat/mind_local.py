@@ -0,0 +1,113 @@
+# routes/chat/mind_local.py
+# 규칙 기반 로컬 MIND 분류기 (LLM 없이 음식명 → 카테고리/점수/이모지)
+import re
+
+# --- 음식명 키워드 규칙 ---
+#  - (키워드 목록, MIND 카테고리(한국어 표준 라벨), 이모지)
+#  - 순서 = 이모지 우선순위 (기존 _emoji_from_categories 휴리스틱 순서 유지)
+FOOD_RULES = [
+    (["샐러드","salad"], ["녹색 잎채소"], "🥗"),
+    (["연어","고등어","참치","생선","삼치","갈치","fish","salmon","mackerel","tuna"], ["생선"], "🐟"),
+    (["닭","치킨","가슴살","오리","poultry","chicken","duck"], ["가금류"], "🍗"),
+    (["소고기","돼지고기","양고기","스테이크","삼겹살","불고기","갈비","족발","beef","pork","lamb","steak"], ["붉은 고기"], "🥩"),
+    (["두부","콩","렌즈콩","병아리콩","tofu","bean","lentil","chickpea"], ["콩/두류"], "🫘"),
+    (["현미","귀리","오트","퀴노아","통곡물","oat","quinoa","brown rice","whole"], ["통곡물"], "🌾"),
+    (["치즈","cheese"], ["치즈"], "🧀"),
+    (["버터","마가린","butter","margarine"], ["버터/마가린"], "🧈"),
+    (["튀김","감자튀김","너겟","패스트푸드","햄버거","버거","fried","fries","burger","nugget"], ["튀김/패스트푸드"], "🍟"),
+    (["과자","디저트","케이크","쿠키","초콜릿","아이스크림","도넛","dessert","cookie","cake","choco","ice cream","donut"], ["과자/디저트"], "🍰"),
+    (["베리","블루베리","딸기","berry","blueberry","strawberry"], ["베리류"], "🫐"),
+    (["올리브","olive"], ["올리브유"], "🫒"),
+    (["와인","wine"], ["와인"], "🍷"),
+    (["채소","시금치","상추","케일","veg","vegetable","leafy"], ["녹색 잎채소"], "🥬"),
+    (["브로콜리","당근","토마토","broccoli","carrot","tomato"], ["기타 채소"], "🥦"),
+    (["견과","아몬드","호두","캐슈","nut","almond","walnut","cashew"], ["견과류"], "🥜"),
+]
+
+# 규칙과 다른 카테고리가 필요한 키워드 (예: 한국어 '치킨'은 보통 튀긴 닭)
+KEYWORD_CATEGORY_OVERRIDES = {
+    "치킨": ["가금류", "튀김/패스트푸드"],
+}
+
+# 카테고리에는 영향이 없지만 음식명을 '설명'하는 조리법 단어 (신뢰도 계산에만 사용)
+NEUTRAL_MODIFIERS = ["구이","조림","찜","무침","나물","볶음","수프","grilled","steamed","roasted","soup"]
+
+# 카테고리별 가중치 (기본 점수에 합산, 카테고리당 1회)
+BASE_SCORE = 55
+SCORE_RANGE = (5, 95)
+CATEGORY_WEIGHTS = {
+    "녹색 잎채소": 30, "기타 채소": 25, "견과류": 25, "베리류": 25, "콩/두류": 25,
+    "통곡물": 20, "생선": 30, "가금류": 15, "올리브유": 20, "와인": 10,
+    "붉은 고기": -25, "버터/마가린": -20, "치즈": -15, "과자/디저트": -30, "튀김/패스트푸드": -35,
+}
+
+
+def _build_matcher():
+    """모든 키워드를 하나의 정규식으로 컴파일. 긴 키워드 우선(감자튀김 > 튀김, donut > nut)."""
+    table = {}  # keyword -> (rule_index, categories, emoji)
+    for idx, (keys, cats, emoji) in enumerate(FOOD_RULES):
+        for k in keys:
+            table.setdefault(k, (idx, KEYWORD_CATEGORY_OVERRIDES.get(k, cats), emoji))
+    for k in NEUTRAL_MODIFIERS:
+        table.setdefault(k, (len(FOOD_RULES), [], ""))
+    alternation = "|".join(re.escape(k) for k in sorted(table, key=len, reverse=True))
+    return re.compile(alternation), table
+
+_MATCHER, _KEYWORD_TABLE = _build_matcher()
+
+
+def _normalize(name) -> str:
+    return str(name or "").strip().lower()
+
+def _match(name: str):
+    return [(m, _KEYWORD_TABLE[m.group(0)]) for m in _MATCHER.finditer(_normalize(name))]
+
+
+def emoji_for_name(name) -> str:
+    """음식명 휴리스틱 이모지: 매칭된 규칙 중 가장 앞선 규칙의 이모지."""
+    best = None
+    for _, (idx, _, emoji) in _match(name):
+        if emoji and (best is None or idx < best[0]):
+            best = (idx, emoji)
+    return best[1] if best else ""
+
+
+def classify_food(name) -> dict:
+    """
+    음식명 → {"food", "categories", "score", "note", "confidence"}
+    confidence: 음식명(공백·기호 제외) 중 키워드로 설명된 글자 비율 (0~1)
+    """
+    text = _normalize(name)
+    matches = _match(text)
+
+    categories, covered = [], 0
+    for m, (_, cats, _) in matches:
+        covered += len(re.sub(r"\W", "", m.group(0)))
+        for c in cats:
+            if c not in categories:
+                categories.append(c)
+
+    total = len(re.sub(r"\W", "", text))
+    confidence = round(min(1.0, covered / total), 3) if total else 0.0
+
+    lo, hi = SCORE_RANGE
+    score = max(lo, min(hi, BASE_SCORE + sum(CATEGORY_WEIGHTS[c] for c in categories)))
+
+    pos = [c for c in categories if CATEGORY_WEIGHTS[c] > 0]
+    neg = [c for c in categories if CATEGORY_WEIGHTS[c] < 0]
+    if neg and not pos:
+        note = f"{', '.join(neg)} 위주라 점수가 낮습니다."
+    elif neg:
+        note = f"{', '.join(pos)}은(는) 좋지만 {', '.join(neg)}이(가) 포함되어 있습니다."
+    elif pos:
+        note = f"{', '.join(pos)} 위주로 뇌 건강에 좋습니다."
+    else:
+        note = "MIND 기준으로 분류하기 어려운 음식입니다."
+
+    return {
+        "food": str(name or "").strip(),
+        "categories": categories,
+        "score": score,
+        "note": note,
+        "confidence": confidence,
+    }
@@ -0,0 +1,167 @@
+# routes/dashboard/dashboard_routes.py
+# 앱 홈 화면용 대시보드: /me, /api/history, /api/user-info, /api/challenges?filter=my ... 를 요청 1번으로
+#  - GET /api/dashboard?nickname=..  (또는 ?email=..)
+#  - 섹션별 조회(사용자/최근 식사/오늘 물/최근 수면/참여 중 챌린지)를 스레드 풀에서 동시에 실행
+#    → 응답 시간 ≈ 가장 느린 섹션 1개 (모두 인덱스를 타는 소량 조회)
+#  - nickname이 있으면 사용자 조회도 다른 섹션과 동시에, email만 있으면 사용자 조회 후 나머지를 동시에
+#  - 한 섹션이 실패/시간 초과여도 나머지는 응답하고, 실패한 섹션은 null + errors에 이름만 표시
+import os
+import time
+import threading
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, wait
+from flask import Blueprint, jsonify, request
+from extensions import mongo
+from routes.signup.user_cache import get_profile
+from routes.stats.rollups import WATER_GOAL_CUPS, SLEEP_GOAL_MINUTES, daily_collection, day_key
+
+dashboard_bp = Blueprint('dashboard', __name__, url_prefix='/api')
+
+DASHBOARD_WORKERS     = int(os.getenv("DASHBOARD_WORKERS", "8"))
+DASHBOARD_TIMEOUT_SEC = float(os.getenv("DASHBOARD_TIMEOUT_SEC", "3"))
+DASHBOARD_MEALS       = int(os.getenv("DASHBOARD_MEALS", "3"))
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=DASHBOARD_WORKERS, thread_name_prefix="dashboard")
+        return _executor
+
+def _iso(ts):
+    return ts.isoformat() if isinstance(ts, datetime) else ts
+
+
+# ---------- 섹션 조회 ----------
+def _user(query: dict):
+    user = get_profile(**query, live=("point",))  # 포인트는 캐시하지 않고 매번 읽음
+    if not user:
+        return None
+    return {"id": user["id"], "nickname": user["nickname"], "email": user["email"], "point": user["point"]}
+
+def _meals(nickname: str):
+    cur = (mongo.db.diet_records
+           .find({"nickname": nickname},
+                 {"meal_type": 1, "foods": 1, "image_url": 1, "mind.meal_score": 1, "timestamp": 1})
+           .sort("timestamp", -1).limit(DASHBOARD_MEALS))
+    return [{
+        "id": str(d["_id"]),
+        "meal_type": d.get("meal_type", ""),
+        "foods": d.get("foods", []),
+        "image_url": d.get("image_url"),
+        "meal_score": (d.get("mind") or {}).get("meal_score"),
+        "timestamp": _iso(d.get("timestamp")),
+    } for d in cur]
+
+def _water(nickname: str, today: datetime):
+    doc = daily_collection("water").find_one({"nickname": nickname, "date": day_key(today)}, {"cups": 1})
+    return {"date": day_key(today), "cups": (doc or {}).get("cups", 0), "goal": WATER_GOAL_CUPS}
+
+def _sleep(nickname: str):
+    doc = mongo.db.sleep_records.find_one(
+        {"nickname": nickname}, {"hours": 1, "minutes": 1, "total_minutes": 1, "timestamp": 1},
+        sort=[("timestamp", -1)]
+    )
+    if not doc:
+        return None
+    return {"hours": doc.get("hours", 0), "minutes": doc.get("minutes", 0),
+            "total_minutes": doc.get("total_minutes", 0), "goal_minutes": SLEEP_GOAL_MINUTES,
+            "timestamp": _iso(doc.get("timestamp"))}
+
+def _challenges(nickname: str):
+    chs = list(mongo.db.challenges.find(
+        {"joined_users": nickname, "status": "active"},
+        {"title": 1, "start_date": 1, "goal_steps": 1, "image_url": 1}
+    ))
+    if not chs:
+        return []
+    ids = [str(ch["_id"]) for ch in chs]
+    certified = {
+        v["challenge_id"]: v.get("certified_days", [])
+        for v in mongo.db.challenge_verification.find(
+            {"nickname": nickname, "challenge_id": {"$in": ids}}, {"challenge_id": 1, "certified_days": 1}
+        )
+    }
+    return [{
+        "id": cid,
+        "title": ch.get("title"),
+        "start_date": ch.get("start_date"),
+        "goal_steps": ch.get("goal_steps", 8000),
+        "image_url": ch.get("image_url"),
+        "certified_days": len(certified.get(cid, [])),
+    } for cid, ch in zip(ids, chs)]
+
+
+def _run(sections: dict, deadline: float) -> tuple:
+    """{이름: (함수, 인자...)} 동시 실행 → ({이름: 결과}, [실패한 이름])"""
+    futures = {name: _get_executor().submit(fn, *args) for name, (fn, *args) in sections.items()}
+    wait(futures.values(), timeout=max(0.0, deadline - time.monotonic()))
+    out, errors = {}, []
+    for name, fut in futures.items():
+        if not fut.done():
+            fut.cancel()
+            out[name] = None
+            errors.append(name)
+            print(f"[WARN] dashboard {name}: 시간 초과")
+        elif fut.exception() is not None:
+            out[name] = None
+            errors.append(name)
+            print(f"[ERROR] dashboard {name}:", str(fut.exception()))
+        else:
+            out[name] = fut.result()
+    return out, errors
+
+
+@dashboard_bp.route('/dashboard', methods=['GET'])
+def get_dashboard():
+    nickname = (request.args.get("nickname") or "").strip()
+    email = (request.args.get("email") or "").strip().lower()
+    if not nickname and not email:
+        return jsonify({"error": "nickname or email is required"}), 400
+
+    now = datetime.now()
+    deadline = time.monotonic() + DASHBOARD_TIMEOUT_SEC
+
+    # email만 있으면 nickname을 알아야 나머지를 조회할 수 있음
+    if not nickname:
+        try:
+            user = _user({"email": email})
+        except Exception as e:
+            print("[ERROR] dashboard user:", str(e))
+            return jsonify({"error": "Failed to load dashboard"}), 500
+        if not user:
+            return jsonify({"error": "User not found"}), 404
+        nickname = user["nickname"]
+        sections = {}
+    else:
+        user = None
+        sections = {"user": (_user, {"nickname": nickname})}
+
+    sections.update({
+        "meals": (_meals, nickname),
+        "water": (_water, nickname, now),
+        "sleep": (_sleep, nickname),
+        "challenges": (_challenges, nickname),
+    })
+    result, errors = _run(sections, deadline)
+    if user is not None:
+        result["user"] = user
+    elif "user" not in errors and result.get("user") is None:
+        return jsonify({"error": "User not found"}), 404
+
+    payload = {
+        "user": result["user"],
+        "meals": result["meals"],
+        "water": result["water"],
+        "sleep": result["sleep"],
+        "challenges": result["challenges"],
+    }
+    if errors:
+        payload["errors"] = errors
+    resp = jsonify(payload)
+    resp.headers["Cache-Control"] = "private, no-store"
+    return resp, 200
@@ -0,0 +1,27 @@
+# routes/ops/ops_routes.py
+# 운영 상태 조회용 엔드포인트
+from flask import Blueprint, Response, jsonify, request
+from llm_gateway import gateway_stats
+from llm_metrics import metrics_snapshot, recent_traces, prometheus_text
+
+ops_bp = Blueprint('ops', __name__, url_prefix='/ops')
+
+@ops_bp.route('/llm', methods=['GET'])
+def get_llm_stats():
+    """LLM 게이트웨이 상태: 동시 호출 수, 재시도/실패/서킷 상태"""
+    return jsonify(gateway_stats()), 200
+
+@ops_bp.route('/llm/metrics', methods=['GET'])
+def get_llm_metrics():
+    """
+    LLM 호출 계측: (엔드포인트, 호출 함수, 모델)별 지연 시간 히스토그램, 시도/실패 사유, 크기, 토큰 수
+    ?format=prometheus 면 Prometheus 텍스트 포맷
+    """
+    if request.args.get('format') == 'prometheus':
+        return Response(prometheus_text(), mimetype='text/plain; version=0.0.4')
+    return jsonify(metrics_snapshot()), 200
+
+@ops_bp.route('/llm/traces', methods=['GET'])
+def get_llm_traces():
+    """샘플링된 최근 LLM 호출 trace (LLM_TRACE_SAMPLE_RATE > 0 일 때만 쌓임)"""
+    return jsonify(recent_traces()), 200
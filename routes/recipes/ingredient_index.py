@@ -0,0 +1,121 @@
+# routes/recipes/ingredient_index.py
+# 재료 기반 레시피 조회용 역색인 ("가진 재료로 요리하기")
+#  - 레시피 문서에 정규화된 재료 키 배열 저장: ingredient_keys (+ ingredient_count)
+#    → ingredient_keys 멀티키 인덱스 = 재료별 posting list
+#  - 정규화: 분량/단위/괄호/손질 표현 제거, 공백 제거, 동의어 통일 ("다진 마늘 1큰술" → "마늘")
+#  - 기본 양념(소금, 후추 등)은 누구나 있다고 보고 색인/커버리지 계산에서 제외
+#  - 조회: 사용자 재료 키의 posting list 합집합($in)만 읽고, 레시피별 커버리지(가진 재료 / 전체 재료)로 정렬
+import re
+import unicodedata
+from extensions import mongo
+
+INGREDIENT_QUERY_MAX = 30   # 한 번에 받을 사용자 재료 수 상한
+
+PANTRY_STAPLES = {"소금", "후추", "후춧가루", "물", "식용유", "설탕", "간장", "참기름", "깨", "통깨"}
+
+_SYNONYMS = {
+    "달걀": "계란",
+    "계란물": "계란",
+    "파": "대파",
+    "쪽파": "대파",
+    "다진마늘": "마늘",
+    "간마늘": "마늘",
+    "닭가슴": "닭가슴살",
+    "소고기다짐육": "소고기",
+    "다진소고기": "소고기",
+}
+
+_MODIFIERS = {"다진", "썬", "삶은", "데친", "냉동", "생", "손질한", "채썬", "말린", "불린", "익힌", "잘게"}
+
+_PAREN_RE = re.compile(r"[\(\[\{].*?[\)\]\}]")
+# 분량 + 단위 (입력은 소문자로 바꾼 뒤 적용)
+#  - 단위가 있으면 이름에 붙어 있어도 제거 ("양파1개"), 단위 뒤에 글자가 이어지면 단위로 보지 않음
+#  - 단위가 없는 숫자는 독립된 단어일 때만 제거 → 이름 속 숫자는 유지 ("3겹살")
+#  - 단위는 긴 것부터 ("봉지"가 "봉"보다, "kg"이 "g"보다 먼저)
+_QTY_UNITS = sorted(
+    ("kg", "g", "mg", "ml", "l", "cc", "tbsp", "tsp", "t", "큰술", "작은술", "스푼", "숟가락", "컵", "개",
+     "모", "쪽", "줌", "톨", "장", "마리", "인분", "대", "봉지", "봉", "팩", "캔",
+     "공기", "포기", "그릇", "알", "단", "줄기", "송이", "꼬집", "조각", "통", "근"),
+    key=len, reverse=True,
+)
+_QTY_NUM = r"\d+(?:[./]\d+)?(?:\s*[~-]\s*\d+(?:[./]\d+)?)?"
+_QTY_RE = re.compile(
+    r"(?<![a-z\d.])%s\s*(?:%s)(?![a-z가-힣\d])|(?<!\S)%s(?!\S)"
+    % (_QTY_NUM, "|".join(map(re.escape, _QTY_UNITS)), _QTY_NUM)
+)
+_VAGUE = {"약간", "적당량", "조금", "적당히", "취향껏", "한줌", "반개", "반모"}
+
+
+def normalize_ingredient(raw) -> str:
+    """
+    재료 문자열(또는 {"name": ...}) → 정규화 키. 기본 양념/빈 값이면 ''
+      "다진 마늘 1큰술" → "마늘"        "닭가슴살 200g" → "닭가슴살"
+      "대파 1/2대" → "대파"             "올리브오일 2T" → "올리브오일"
+      "감자 1~2개" → "감자"             "달걀 2개(60g)" → "계란"
+      "밥 1공기" → "밥"                 "김치 1/4포기" → "김치"
+      "양파1개" → "양파"                "3겹살" → "3겹살"
+      "소금 약간" → ''
+    """
+    if isinstance(raw, dict):
+        raw = raw.get("name", "")
+    if not isinstance(raw, str):
+        return ""
+    text = unicodedata.normalize("NFC", raw).lower()
+    text = _PAREN_RE.sub(" ", text)
+    text = _QTY_RE.sub(" ", text)
+    words = [w for w in re.split(r"[\s,/·:]+", text) if w]
+    # 목록에 없는 단위가 남은 분량 단어("2덩이")는 이름에 붙이지 않고 버림 (첫 단어는 이름으로 보고 유지)
+    words = [w for i, w in enumerate(words) if not (i and w[0].isdigit())]
+    words = [w for w in words if w not in _VAGUE and w not in _MODIFIERS]
+    key = "".join(words)
+    key = _SYNONYMS.get(key, key)
+    if not key or key in PANTRY_STAPLES:
+        return ""
+    return key
+
+def ingredient_keys(ingredients) -> list:
+    return sorted({k for k in (normalize_ingredient(i) for i in (ingredients or [])) if k})
+
+def ingredient_fields(ingredients) -> dict:
+    """레시피 문서에 함께 저장할 재료 색인 필드"""
+    keys = ingredient_keys(ingredients)
+    return {"ingredient_keys": keys, "ingredient_count": len(keys)}
+
+INGREDIENT_FIELDS = ("ingredient_keys", "ingredient_count")
+
+
+def ingredient_pipeline(user_keys: list, projection: dict, limit: int, min_coverage: float = 0.0) -> list:
+    """
+    posting list 합집합 → 레시피별 일치 재료 수/커버리지 계산 → 커버리지, 일치 수, 조회수 순 정렬.
+    missing: 레시피 재료 중 사용자에게 없는 것
+    """
+    matched = {"$size": {"$setIntersection": ["$ingredient_keys", user_keys]}}
+    return [
+        {"$match": {"ingredient_keys": {"$in": user_keys}}},
+        {"$project": {
+            **projection,
+            "matched": matched,
+            "missing": {"$setDifference": ["$ingredient_keys", user_keys]},
+            "coverage": {"$cond": [
+                {"$gt": ["$ingredient_count", 0]},
+                {"$divide": [matched, "$ingredient_count"]},
+                0,
+            ]},
+        }},
+        {"$match": {"coverage": {"$gte": min_coverage}}},
+        {"$sort": {"coverage": -1, "matched": -1, "views": -1, "_id": -1}},
+        {"$limit": limit},
+    ]
+
+def find_recipes_by_ingredients(ingredients: list, projection: dict, limit: int = 20, min_coverage: float = 0.0):
+    """반환: (정규화된 사용자 재료 키, 레시피 목록)"""
+    user_keys = ingredient_keys(ingredients[:INGREDIENT_QUERY_MAX])
+    if not user_keys:
+        return user_keys, []
+    docs = list(mongo.db.recipes.aggregate(ingredient_pipeline(user_keys, projection, limit, min_coverage)))
+    return user_keys, docs
+
+
+def ensure_indexes():
+    """재료 키 멀티키 인덱스 (재료별 posting list)"""
+    mongo.db.recipes.create_index("ingredient_keys")
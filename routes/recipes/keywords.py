@@ -1,19 +1,57 @@
-from flask import Blueprint, jsonify
+import os
+import json
+import time
+import hashlib
+import threading
+from flask import Blueprint, Response, jsonify, request
 from extensions import mongo  # mongo 객체 불러오기
 
 keywords_bp = Blueprint('keywords', __name__)
 
+# ---------- 키워드 목록 캐시 ----------
+#  - 목록을 프로세스 메모리에 두고 KEYWORDS_CACHE_TTL_SEC마다 다시 읽음
+#  - 앱에는 keywords 컬렉션을 쓰는 경로가 없음 (DB에서 직접 관리) → 바꾼 내용은 TTL이 지난 뒤 반영
+#  - 목록 내용의 해시를 버전(ETag)으로 사용 → If-None-Match가 같으면 304
+KEYWORDS_CACHE_TTL_SEC = int(os.getenv("KEYWORDS_CACHE_TTL_SEC", "300"))
+KEYWORDS_MAX_AGE_SEC   = int(os.getenv("KEYWORDS_MAX_AGE_SEC", "60"))   # 클라이언트 Cache-Control max-age
+
+_keywords = {"list": None, "etag": None, "loaded_at": 0.0}
+_keywords_lock = threading.Lock()
+
+
+def _load_keywords():
+    # keywords 컬렉션에서 keyword 필드만 가져오기 (_id 제외)
+    keywords_cursor = mongo.db.keywords.find({}, {"_id": 0, "keyword": 1})
+    keywords_list = [doc["keyword"] for doc in keywords_cursor]
+    etag = hashlib.sha1(json.dumps(keywords_list, ensure_ascii=False).encode("utf-8")).hexdigest()[:16]
+    return keywords_list, etag
+
+def get_keyword_list():
+    """반환: (키워드 목록, ETag). TTL이 지났을 때만 Mongo 조회"""
+    now = time.monotonic()
+    with _keywords_lock:
+        if _keywords["list"] is not None and now - _keywords["loaded_at"] < KEYWORDS_CACHE_TTL_SEC:
+            return _keywords["list"], _keywords["etag"]
+        keywords_list, etag = _load_keywords()
+        _keywords.update({"list": keywords_list, "etag": etag, "loaded_at": now})
+        return keywords_list, etag
+
+
 @keywords_bp.route('/keywords', methods=['GET'])
 def get_keywords():
     try:
-        # keywords 컬렉션에서 keyword 필드만 가져오기 (_id 제외)
-        keywords_cursor = mongo.db.keywords.find({}, {"_id": 0, "keyword": 1})
-        keywords_list = [doc["keyword"] for doc in keywords_cursor]
+        keywords_list, etag = get_keyword_list()
 
-        return jsonify({
-            "status": "success",
-            "keywords": keywords_list
-        }), 200
+        if etag in request.if_none_match:
+            resp = Response(status=304)
+        else:
+            resp = jsonify({
+                "status": "success",
+                "keywords": keywords_list
+            })
+        resp.set_etag(etag)
+        resp.headers["Cache-Control"] = f"public, max-age={KEYWORDS_MAX_AGE_SEC}"
+        return resp
 
     except Exception as e:
         print("[ERROR]", str(e))
@@ -21,4 +59,3 @@ def get_keywords():
             "status": "error",
             "message": "Failed to fetch keywords"
         }), 500
-
@@ -2,9 +2,16 @@
 from flask import Blueprint, request, jsonify
 from datetime import datetime, timedelta, timezone
 from extensions import mongo
+from bson import ObjectId
+from bson.errors import InvalidId
 import google.generativeai as genai
-import os, json, re, ast, time, logging
-from typing import List, Dict, Any
+import os, json, re, ast, logging
+from typing import List, Dict, Any, Optional
+from llm_gateway import gen_call
+from routes.recipes.search_index import search_fields, register_terms, SEARCH_FIELDS
+from routes.recipes.ingredient_index import ingredient_fields, INGREDIENT_FIELDS
+from routes.recipes.search_cache import invalidate_search_cache
+from routes.recipes.suggest import add_suggest_term
 
 post_bp = Blueprint("post", __name__, url_prefix="/posts")
 
@@ -17,27 +24,6 @@ def _now():
     return datetime.utcnow()
 
 # ---------- LLM 헬퍼 함수 ----------
-def _gen_call(model, contents, *, json_only=False, timeout=15, retries=3, backoff_base=0.6):
-    """
-    Gemini generate_content 안전 호출:
-    실패 시 None 반환
-    """
-    genconf = {"response_mime_type": "application/json"} if json_only else None
-    last_err = None
-    for i in range(retries):
-        try:
-            resp = model.generate_content(
-                contents,
-                generation_config=genconf,
-                request_options={"timeout": timeout}
-            )
-            return resp
-        except Exception as e:
-            last_err = e
-            time.sleep(backoff_base * (2 ** i))
-    logging.exception("Gemini call failed after retries: %s", last_err)
-    return None
-
 def _extract_text_safe(resp):
     """candidates/parts가 비어도 터지지 않도록 안전하게 텍스트 추출."""
     if not resp or not getattr(resp, "candidates", None):
@@ -75,9 +61,18 @@ mind_rules = """
 - 튀김/패스트푸드: 감자튀김, 햄버거
 """
 
+# 점수 산출 실패 시 기본값
+SCORE_FALLBACK = {"score": 0, "notes": "분석 실패", "recommendation": "레시피 분석에 실패했습니다."}
+
 def get_slow_aging_score(ingredients: list, steps: list) -> Dict[str, Any]:
     """
-    LLM을 사용하여 레시피의 저속노화 점수를 생성
+    LLM을 사용하여 레시피의 저속노화 점수를 생성 (실패 시 SCORE_FALLBACK)
+    """
+    return request_slow_aging_score(ingredients, steps) or dict(SCORE_FALLBACK)
+
+def request_slow_aging_score(ingredients: list, steps: list) -> Optional[Dict[str, Any]]:
+    """
+    LLM 저속노화 점수 요청. 호출/파싱 실패 시 None (백그라운드 워커가 재시도 판단에 사용)
     """
     ingredients_str = ", ".join(ingredients) if ingredients else "없음"
     steps_str = "\n".join(steps) if steps else "없음"
@@ -108,16 +103,26 @@ def get_slow_aging_score(ingredients: list, steps: list) -> Dict[str, Any]:
 재료: {ingredients_str}
 조리 순서: {steps_str}
 """
-    resp = _gen_call(TEXT_MODEL, prompt, json_only=True)
+    resp = gen_call(TEXT_MODEL, prompt, json_only=True)
     text = _extract_text_safe(resp)
     
     if text:
         try:
-            return json.loads(text)
+            data = json.loads(text)
+            if isinstance(data, dict):
+                return data
         except json.JSONDecodeError:
             logging.error("Failed to parse LLM response: %s", text)
             pass
-    return {"score": 0, "notes": "분석 실패", "recommendation": "레시피 분석에 실패했습니다."}
+    return None
+
+# ---------- 점수 산출 작업 상태 ----------
+#  - recipes 문서 자체가 작업 큐: score_status가 pending인 문서를 워커가 가져감
+SCORE_PENDING, SCORE_RUNNING, SCORE_DONE, SCORE_FAILED = "pending", "running", "done", "failed"
+
+def ensure_indexes():
+    """점수 작업 큐 조회용 인덱스"""
+    mongo.db.recipes.create_index([("score_status", 1), ("created_at", 1)])
 
 # ---------- 유효성 검사 및 라우트 ----------
 def _validate_recipe(data: dict) -> Dict[str, str]:
@@ -190,11 +195,6 @@ def create_recipe():
         if errors:
             return jsonify({"ok": False, "errors": errors}), 400
 
-        llm_score_result = get_slow_aging_score(
-            ingredients=data.get("ingredients", []),
-            steps=data.get("steps", [])
-        )
-        
         time_int = int(data.get("time", 0))
 
         doc = {
@@ -207,18 +207,84 @@ def create_recipe():
             "serving": data.get("serving"),
             "steps": data.get("steps", []),
             "ingredients": data.get("ingredients", []),
-            "score": llm_score_result.get("score", 0),
-            "notes": llm_score_result.get("notes", ""),
-            "recommendation": llm_score_result.get("recommendation", ""),
+            # 저속노화 점수는 백그라운드 워커가 채움 (score_worker.py)
+            "score": 0,
+            "notes": "",
+            "recommendation": "",
+            "score_status": SCORE_PENDING,
+            "score_attempts": 0,
             "views": data.get("views", 0),
             "created_at": _now(),
         }
+        # 검색 역색인 토큰 (search_index.py)
+        doc.update(search_fields(doc["name"], doc["desc"], doc["keywords"]))
+        # 재료 역색인 키 (ingredient_index.py)
+        doc.update(ingredient_fields(doc["ingredients"]))
 
         res = mongo.db.recipes.insert_one(doc)
+        try:
+            register_terms(doc["search_tokens"])
+        except Exception as e:
+            # df는 검색 순서 최적화용이라 실패해도 등록은 유지 (백필 스크립트로 재계산 가능)
+            logging.warning("register_terms failed: %s", e)
+        invalidate_search_cache()
+        add_suggest_term(doc["name"])
         doc["_id"] = str(res.inserted_id)
+        for f in SEARCH_FIELDS + INGREDIENT_FIELDS:
+            doc.pop(f, None)
         return jsonify({"ok": True, "recipe": doc}), 201
 
     except Exception as e:
-        import traceback, logging
+        import traceback
         logging.error("create_recipe fatal: %s\n%s", e, traceback.format_exc())
-        return jsonify({"ok": False, "error": "internal_error", "message": str(e)}), 500
\ No newline at end of file
+        return jsonify({"ok": False, "error": "internal_error", "message": str(e)}), 500
+
+@post_bp.route("/recipe/<recipe_id>/score", methods=["GET"])
+def get_recipe_score_status(recipe_id):
+    """레시피 저속노화 점수 산출 진행 상태"""
+    try:
+        doc = mongo.db.recipes.find_one(
+            {"_id": ObjectId(recipe_id)},
+            {"score_status": 1, "score_attempts": 1, "score": 1, "notes": 1, "recommendation": 1}
+        )
+    except InvalidId:
+        return jsonify({"ok": False, "error": "invalid_id"}), 400
+    if not doc:
+        return jsonify({"ok": False, "error": "not_found"}), 404
+    return jsonify({
+        "ok": True,
+        "recipe_id": recipe_id,
+        # 필드가 없는 기존 레시피는 생성 시점에 동기 채점된 것
+        "status": doc.get("score_status", SCORE_DONE),
+        "attempts": doc.get("score_attempts", 0),
+        "score": doc.get("score", 0),
+        "notes": doc.get("notes", ""),
+        "recommendation": doc.get("recommendation", ""),
+    }), 200
+
+@post_bp.route("/recipe/score-queue", methods=["GET"])
+def get_score_queue_status():
+    """점수 작업 큐 현황 (상태별 건수)"""
+    counts = {s: 0 for s in (SCORE_PENDING, SCORE_RUNNING, SCORE_FAILED)}
+    for row in mongo.db.recipes.aggregate([
+        {"$match": {"score_status": {"$in": list(counts)}}},
+        {"$group": {"_id": "$score_status", "count": {"$sum": 1}}},
+    ]):
+        counts[row["_id"]] = row["count"]
+    return jsonify({"ok": True, "queue": counts}), 200
+
+def requeue_failed_scores() -> int:
+    """failed 작업의 시도 횟수를 초기화해 대기열로 되돌림 (LLM 장애 복구 후). 반환: 건수"""
+    result = mongo.db.recipes.update_many(
+        {"score_status": SCORE_FAILED},
+        {
+            "$set": {"score_status": SCORE_PENDING, "score_attempts": 0},
+            "$unset": {"score_next_attempt_at": "", "score_lease_until": ""},
+        }
+    )
+    return result.modified_count
+
+@post_bp.route("/recipe/score-queue/requeue", methods=["POST"])
+def requeue_score_queue():
+    """LLM 장애로 실패(failed)한 점수 작업 재등록"""
+    return jsonify({"ok": True, "requeued": requeue_failed_scores()}), 200
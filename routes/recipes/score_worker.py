@@ -0,0 +1,132 @@
+# routes/recipes/score_worker.py
+# 레시피 저속노화 점수 백그라운드 워커
+#  - 큐: recipes 문서의 score_status (pending → running → done | failed)
+#  - running 상태는 임대 시간(score_lease_until)을 가지며, 워커가 죽으면 만료 후 다른 워커가 다시 가져감
+#  - 채점 실패 시 지수 백오프(score_next_attempt_at) 후 재시도 → 서킷 차단 중에 시도 횟수를 몇 초 만에 소진하지 않음
+#  - 장애 후 failed 작업 재등록: POST /recipe/score-queue/requeue
+#  - 앱 프로세스 안의 스레드로 돌리거나, 별도 프로세스로 실행: python -m routes.recipes.score_worker
+import os
+import time
+import logging
+import threading
+from datetime import timedelta
+
+from pymongo import ReturnDocument
+from extensions import mongo
+from routes.recipes.post import (
+    request_slow_aging_score, SCORE_FALLBACK, _now,
+    SCORE_PENDING, SCORE_RUNNING, SCORE_DONE, SCORE_FAILED,
+)
+from routes.recipes.search_cache import invalidate_search_cache
+
+RECIPE_SCORE_WORKERS      = int(os.getenv("RECIPE_SCORE_WORKERS", "2"))
+RECIPE_SCORE_POLL_SEC     = float(os.getenv("RECIPE_SCORE_POLL_SEC", "2"))
+RECIPE_SCORE_LEASE_SEC    = int(os.getenv("RECIPE_SCORE_LEASE_SEC", "120"))
+RECIPE_SCORE_MAX_ATTEMPTS = int(os.getenv("RECIPE_SCORE_MAX_ATTEMPTS", "3"))
+RECIPE_SCORE_BACKOFF_SEC  = float(os.getenv("RECIPE_SCORE_BACKOFF_SEC", "30"))     # 첫 재시도 대기
+RECIPE_SCORE_BACKOFF_MAX  = float(os.getenv("RECIPE_SCORE_BACKOFF_MAX", "1800"))   # 재시도 대기 상한
+
+_workers = []
+_stop = threading.Event()
+
+
+def claim_job():
+    """재시도 시각이 된 대기 작업이나 임대가 만료된 작업 1건을 원자적으로 가져옴. 없으면 None."""
+    now = _now()
+    return mongo.db.recipes.find_one_and_update(
+        {"$or": [
+            # score_next_attempt_at이 없거나 now 이전인 것만
+            {"score_status": SCORE_PENDING, "score_next_attempt_at": {"$not": {"$gt": now}}},
+            {"score_status": SCORE_RUNNING, "score_lease_until": {"$lt": now}},
+        ]},
+        {
+            "$set": {"score_status": SCORE_RUNNING, "score_lease_until": now + timedelta(seconds=RECIPE_SCORE_LEASE_SEC)},
+            "$unset": {"score_next_attempt_at": ""},
+            "$inc": {"score_attempts": 1},
+        },
+        projection={"ingredients": 1, "steps": 1, "score_attempts": 1},
+        sort=[("created_at", 1)],
+        return_document=ReturnDocument.AFTER,
+    )
+
+
+def retry_delay(attempts: int) -> float:
+    """attempts번 실패한 뒤 다음 시도까지 대기(초): BACKOFF * 2^(attempts-1), 상한 BACKOFF_MAX"""
+    return min(RECIPE_SCORE_BACKOFF_MAX, RECIPE_SCORE_BACKOFF_SEC * (2 ** max(0, attempts - 1)))
+
+
+def process_job(job: dict):
+    result = request_slow_aging_score(job.get("ingredients", []), job.get("steps", []))
+    attempts = job.get("score_attempts", 0)
+    if result is None and attempts < RECIPE_SCORE_MAX_ATTEMPTS:
+        # 다시 대기열로 (백오프 후 재시도)
+        mongo.db.recipes.update_one(
+            {"_id": job["_id"], "score_status": SCORE_RUNNING},
+            {
+                "$set": {"score_status": SCORE_PENDING,
+                         "score_next_attempt_at": _now() + timedelta(seconds=retry_delay(attempts))},
+                "$unset": {"score_lease_until": ""},
+            }
+        )
+        return False
+
+    status = SCORE_DONE if result is not None else SCORE_FAILED
+    result = result or SCORE_FALLBACK
+    mongo.db.recipes.update_one(
+        {"_id": job["_id"], "score_status": SCORE_RUNNING},
+        {
+            "$set": {
+                "score": result.get("score", 0),
+                "notes": result.get("notes", ""),
+                "recommendation": result.get("recommendation", ""),
+                "score_status": status,
+                "score_updated_at": _now(),
+            },
+            "$unset": {"score_lease_until": ""},
+        }
+    )
+    # 검색 목록에 점수가 보이므로 캐시 무효화
+    invalidate_search_cache()
+    return status == SCORE_DONE
+
+
+def run_worker(stop_event: threading.Event = _stop):
+    while not stop_event.is_set():
+        try:
+            job = claim_job()
+            if job is None:
+                stop_event.wait(RECIPE_SCORE_POLL_SEC)
+                continue
+            process_job(job)
+        except Exception as e:
+            logging.error("recipe score worker error: %s", e)
+            stop_event.wait(RECIPE_SCORE_POLL_SEC)
+
+
+def start_score_workers(count: int = RECIPE_SCORE_WORKERS):
+    """앱 프로세스 안에서 데몬 스레드 워커 시작 (count=0이면 별도 프로세스에서 실행한다고 보고 생략)."""
+    if _workers or count <= 0:
+        return
+    for i in range(count):
+        t = threading.Thread(target=run_worker, name=f"recipe-score-{i}", daemon=True)
+        t.start()
+        _workers.append(t)
+
+
+if __name__ == "__main__":
+    from flask import Flask
+    from config import Config
+
+    app = Flask(__name__)
+    app.config.from_object(Config)
+    mongo.init_app(app)
+    logging.basicConfig(level=logging.INFO)
+
+    threads = [threading.Thread(target=run_worker, daemon=True) for _ in range(max(1, RECIPE_SCORE_WORKERS))]
+    for t in threads:
+        t.start()
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        _stop.set()
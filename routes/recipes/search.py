@@ -1,58 +1,146 @@
 from flask import Blueprint, jsonify, request
+from bson import ObjectId
+from bson.errors import InvalidId
 from extensions import mongo  # mongo 객체 불러오기
+from routes.recipes.search_index import (
+    search_recipe_docs, recipe_filter, SEARCH_FIELDS, SEARCH_MAX_RESULTS, SEARCH_PAGE_SIZE, SEARCH_UNPAGED_LIMIT,
+)
+from routes.recipes.search_cache import get_cached_page, put_cached_page, search_cache_stats
+from routes.recipes.ingredient_index import find_recipes_by_ingredients, INGREDIENT_FIELDS
 
 search_bp = Blueprint('search', __name__)
 
+# 목록용 요약 필드 (steps/ingredients/desc 등 무거운 필드는 상세 조회에서)
+SUMMARY_PROJECTION = {
+    "_id": 1,
+    "name": 1,
+    "imageUrl": 1,
+    "time": 1,
+    "level": 1,
+    "score": 1,
+    "views": 1
+}
+
+def _csv_arg(name: str) -> list:
+    return sorted({v.strip() for v in request.args.get(name, '').split(',') if v.strip()})
+
+def _parse_filters():
+    """
+    ?keywords=다이어트,저염 (모두 포함) &level=하,중 &max_time=30 &min_score=70
+    반환: (Mongo 필터 dict, 캐시 키용 tuple). 숫자 형식이 틀리면 ValueError
+    """
+    keywords = _csv_arg('keywords')
+    levels = _csv_arg('level')
+    max_time = request.args.get('max_time', type=str)
+    min_score = request.args.get('min_score', type=str)
+    max_time = int(max_time) if max_time else None
+    min_score = float(min_score) if min_score else None
+    key = (tuple(keywords), tuple(levels), max_time, min_score)
+    return recipe_filter(keywords, levels, max_time, min_score), key
+
 @search_bp.route('/recipes/search', methods=['GET'])
 def search_recipes():
     try:
         keyword = request.args.get('keyword', '').strip()
-        sort_by = request.args.get('sort', 'latest')  # 기본값 latest
+        sort_by = request.args.get('sort', 'latest')  # latest(기본값) | relevance | views
+        with_facets = request.args.get('facets') == '1'
+
+        try:
+            filters, filter_key = _parse_filters()
+        except ValueError:
+            return jsonify({
+                "status": "error",
+                "message": "Invalid filter"
+            }), 400
 
-        if not keyword:
+        # 검색어 또는 필터 중 하나는 있어야 함
+        if not keyword and not filters:
             return jsonify({
                 "status": "error",
                 "message": "Keyword is required"
             }), 400
 
-        # 검색 조건
-        query = {
-            "$or": [
-                {"name": {"$regex": keyword, "$options": "i"}},
-                {"desc": {"$regex": keyword, "$options": "i"}},
-            ]
-        }
-
-        # 정렬 조건
-        if sort_by == 'views':
-            sort_option = [("views", -1)]  # 조회순
+        # limit 또는 cursor를 보낸 경우에만 페이지 단위로, 아니면 기존처럼 전체 목록 (SEARCH_UNPAGED_LIMIT까지)
+        cursor = request.args.get('cursor')
+        if 'limit' in request.args:
+            try:
+                limit = min(max(int(request.args['limit']), 1), SEARCH_MAX_RESULTS)
+            except ValueError:
+                limit = SEARCH_PAGE_SIZE
+        else:
+            limit = SEARCH_PAGE_SIZE if cursor else SEARCH_UNPAGED_LIMIT
+
+        # 같은 (검색어, 정렬, 페이지, 필터) 재요청은 캐시에서 (search_cache.py)
+        cache_extra = (filter_key, with_facets)
+        page = get_cached_page(keyword, sort_by, limit, cursor, cache_extra)
+        if page is None:
+            # 역색인 조회 (search_index.py) + 필터 + 키셋 페이지네이션 (+ 패싯)
+            try:
+                recipes_list, next_cursor, facets = search_recipe_docs(
+                    keyword, sort_by, SUMMARY_PROJECTION, limit=limit, cursor=cursor,
+                    filters=filters, facets=with_facets
+                )
+            except ValueError:
+                return jsonify({
+                    "status": "error",
+                    "message": "Invalid cursor"
+                }), 400
+
+            # ObjectId → 문자열 변환
+            for recipe in recipes_list:
+                recipe["_id"] = str(recipe["_id"])
+
+            page = (recipes_list, next_cursor, facets)
+            put_cached_page(keyword, sort_by, limit, cursor, page, cache_extra)
+        recipes_list, next_cursor, facets = page
+
+        # 다음 페이지 커서는 헤더로 (본문은 기존처럼 배열 유지, facets=1 이면 패싯 포함 객체)
+        if with_facets:
+            resp = jsonify({"recipes": recipes_list, "facets": facets})
         else:
-            sort_option = [("_id", -1)]  # 최신순 (기본값)
-
-        # MongoDB 조회 + 정렬
-        recipes_cursor = mongo.db.recipes.find(query, {
-            "_id": 1,
-            "name": 1,
-            "keywords": 1,
-            "desc": 1,
-            "time": 1,
-            "level": 1,
-            "serving": 1,
-            "imageUrl": 1,
-            "book": 1,
-            "steps": 1,
-            "ingredients": 1,
-            "score": 1,
-            "views": 1
-        }).sort(sort_option)
-
-        recipes_list = list(recipes_cursor)
-
-        # ObjectId → 문자열 변환
+            resp = jsonify(recipes_list)
+        if next_cursor:
+            resp.headers["X-Next-Cursor"] = next_cursor
+        return resp, 200
+
+    except Exception as e:
+        print("[ERROR]", str(e))
+        return jsonify({
+            "status": "error",
+            "message": "Failed to fetch recipes"
+        }), 500
+
+
+@search_bp.route('/recipes/by-ingredients', methods=['GET'])
+def search_recipes_by_ingredients():
+    """
+    가진 재료로 만들 수 있는 레시피 (재료 커버리지 순)
+    ?items=두부,김치,계란 &limit=20 &min_coverage=0.5
+    """
+    try:
+        items = [i.strip() for i in request.args.get('items', '').split(',') if i.strip()]
+        if not items:
+            return jsonify({
+                "status": "error",
+                "message": "items is required"
+            }), 400
+
+        try:
+            limit = min(max(int(request.args.get('limit', SEARCH_PAGE_SIZE)), 1), SEARCH_MAX_RESULTS)
+            min_coverage = min(max(float(request.args.get('min_coverage', 0)), 0.0), 1.0)
+        except ValueError:
+            limit, min_coverage = SEARCH_PAGE_SIZE, 0.0
+
+        user_keys, recipes_list = find_recipes_by_ingredients(items, SUMMARY_PROJECTION, limit, min_coverage)
         for recipe in recipes_list:
             recipe["_id"] = str(recipe["_id"])
+            recipe["coverage"] = round(recipe["coverage"], 3)
 
-        return jsonify(recipes_list), 200
+        return jsonify({
+            "status": "success",
+            "ingredients": user_keys,
+            "recipes": recipes_list
+        }), 200
 
     except Exception as e:
         print("[ERROR]", str(e))
@@ -60,3 +148,33 @@ def search_recipes():
             "status": "error",
             "message": "Failed to fetch recipes"
         }), 500
+
+
+@search_bp.route('/recipes/search/cache/stats', methods=['GET'])
+def get_search_cache_stats():
+    """검색 결과 캐시 상태 (적중률, 색인 버전, 무효화 횟수)"""
+    return jsonify(search_cache_stats()), 200
+
+
+@search_bp.route('/recipes/detail/<recipe_id>', methods=['GET'])
+def get_recipe_detail(recipe_id):
+    """레시피 상세 (검색 목록에서 빠진 desc/steps/ingredients 등 포함)"""
+    try:
+        recipe = mongo.db.recipes.find_one(
+            {"_id": ObjectId(recipe_id)},
+            {**{f: 0 for f in SEARCH_FIELDS + INGREDIENT_FIELDS}, "score_lease_until": 0, "score_next_attempt_at": 0}
+        )
+    except InvalidId:
+        return jsonify({
+            "status": "error",
+            "message": "Invalid recipe id"
+        }), 400
+
+    if not recipe:
+        return jsonify({
+            "status": "error",
+            "message": "Recipe not found"
+        }), 404
+
+    recipe["_id"] = str(recipe["_id"])
+    return jsonify(recipe), 200
@@ -0,0 +1,82 @@
+# routes/recipes/search_cache.py
+# 레시피 검색 결과 페이지 캐시
+#  - 키: (색인 버전, 정규화된 검색어, 정렬, 페이지 크기, 커서, 필터/패싯 여부)
+#  - 색인 버전: Mongo cache_versions 문서의 카운터. 레시피 등록/점수 갱신 시 올림
+#    → 버전이 바뀌면 이전 항목은 조회되지 않고 LRU로 밀려남 (여러 프로세스는 주기적으로 버전 확인)
+#  - views 정렬은 조회수 증가로 무효화하지 않고 짧은 TTL(SEARCH_VIEWS_STALE_SEC) 동안 오래된 순서 허용
+import os
+import time
+import logging
+import threading
+from pymongo import ReturnDocument
+from cache import TTLCache
+from extensions import mongo
+from routes.recipes.search_index import normalize_keyword
+
+SEARCH_CACHE_MAXSIZE     = int(os.getenv("SEARCH_CACHE_MAXSIZE", "1000"))
+SEARCH_CACHE_TTL_SEC     = int(os.getenv("SEARCH_CACHE_TTL_SEC", "300"))
+SEARCH_VIEWS_STALE_SEC   = int(os.getenv("SEARCH_VIEWS_STALE_SEC", "60"))
+SEARCH_VERSION_POLL_SEC  = float(os.getenv("SEARCH_VERSION_POLL_SEC", "2"))
+
+_VERSION_ID = "recipes_search"
+
+_page_cache = TTLCache(maxsize=SEARCH_CACHE_MAXSIZE, ttl=SEARCH_CACHE_TTL_SEC)
+_version = {"value": 0, "checked_at": 0.0, "bumps": 0}
+_version_lock = threading.Lock()
+
+
+def _read_version() -> int:
+    doc = mongo.db.cache_versions.find_one({"_id": _VERSION_ID}, {"v": 1})
+    return int(doc.get("v", 0)) if doc else 0
+
+def current_version() -> int:
+    """색인 버전 (SEARCH_VERSION_POLL_SEC마다 Mongo에서 다시 읽음)"""
+    now = time.monotonic()
+    with _version_lock:
+        if now - _version["checked_at"] < SEARCH_VERSION_POLL_SEC:
+            return _version["value"]
+    try:
+        v = _read_version()
+    except Exception as e:
+        logging.warning("search cache version read failed: %s", e)
+        return _version["value"]
+    with _version_lock:
+        if v != _version["value"]:
+            _page_cache.clear()  # 이전 버전 항목은 더 이상 조회되지 않음
+            _version["value"] = v
+        _version["checked_at"] = now
+        return v
+
+def invalidate_search_cache():
+    """레시피 추가/점수 갱신 시 호출: 버전을 올려 모든 프로세스의 캐시 항목 무효화"""
+    try:
+        doc = mongo.db.cache_versions.find_one_and_update(
+            {"_id": _VERSION_ID}, {"$inc": {"v": 1}}, upsert=True, return_document=ReturnDocument.AFTER
+        )
+        v = int(doc.get("v", 0)) if doc else 0
+    except Exception as e:
+        logging.warning("search cache invalidation failed: %s", e)
+        v = _version["value"] + 1
+    with _version_lock:
+        _version["value"] = v
+        _version["checked_at"] = time.monotonic()
+        _version["bumps"] += 1
+    _page_cache.clear()
+
+
+def _key(keyword: str, sort_by: str, limit: int, cursor, extra: tuple):
+    return (current_version(), normalize_keyword(keyword), sort_by, limit, cursor or "", extra)
+
+def get_cached_page(keyword: str, sort_by: str, limit: int, cursor, extra: tuple = ()):
+    """반환: 저장해 둔 페이지 또는 None. extra: 필터 등 결과에 영향을 주는 나머지 조건 (hashable)"""
+    return _page_cache.get(_key(keyword, sort_by, limit, cursor, extra))
+
+def put_cached_page(keyword: str, sort_by: str, limit: int, cursor, page, extra: tuple = ()):
+    ttl = SEARCH_VIEWS_STALE_SEC if sort_by == "views" else None
+    _page_cache.set(_key(keyword, sort_by, limit, cursor, extra), page, ttl=ttl)
+
+def search_cache_stats() -> dict:
+    with _version_lock:
+        version = dict(_version)
+    return {**_page_cache.stats(), "version": version["value"], "invalidations": version["bumps"],
+            "views_stale_sec": SEARCH_VIEWS_STALE_SEC}
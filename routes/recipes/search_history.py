@@ -1,9 +1,48 @@
+import os
 from flask import Blueprint, request, jsonify
+from bson import ObjectId
 from extensions import mongo
 from datetime import datetime
 
 search_history_bp = Blueprint('search_history', __name__)
 
+# ---------- 사용자별 검색 기록 ----------
+#  - user_search_history: 사용자당 문서 1개 {_id: nickname, items: [{_id, keyword, created_at}, ...], updated_at}
+#    (항목 _id는 목록 응답의 기존 _id 필드를 유지하기 위한 값)
+#  - items는 최신순, 최대 SEARCH_HISTORY_MAX개 (같은 검색어는 맨 앞으로 이동)
+#  - 추가는 파이프라인 업데이트 1번(upsert)으로 처리: 같은 필드에 $pull과 $push를 한 번에 쓸 수 없어서
+#    $filter(기존 항목 제거) + $concatArrays(맨 앞 추가) + $slice(개수 제한)로 구성
+#    검색어는 $literal로 감쌈 ("$name" 같은 검색어가 필드 경로/변수로 해석되지 않도록)
+#  - nickname이 없는 예전 클라이언트는 공용 기록(GLOBAL_HISTORY_ID) 사용
+#  - 예전 search_history 컬렉션은 scripts/migrate_search_history.py 로 공용 기록에 합침
+SEARCH_HISTORY_MAX = int(os.getenv("SEARCH_HISTORY_MAX", "20"))
+GLOBAL_HISTORY_ID  = "__global__"
+
+
+def _history_id(nickname) -> str:
+    return (nickname or "").strip() or GLOBAL_HISTORY_ID
+
+def push_search_history(nickname, keyword: str):
+    now = datetime.utcnow()
+    mongo.db.user_search_history.update_one(
+        {"_id": _history_id(nickname)},
+        [{"$set": {
+            "items": {"$slice": [
+                {"$concatArrays": [
+                    [{"_id": ObjectId(), "keyword": {"$literal": keyword}, "created_at": now}],
+                    {"$filter": {
+                        "input": {"$ifNull": ["$items", []]},
+                        "cond": {"$ne": ["$$this.keyword", {"$literal": keyword}]},
+                    }},
+                ]},
+                SEARCH_HISTORY_MAX,
+            ]},
+            "updated_at": now,
+        }}],
+        upsert=True
+    )
+
+
 @search_history_bp.route('/search-history/add', methods=['POST'])
 def add_search_history():
     data = request.json
@@ -11,21 +50,18 @@ def add_search_history():
     if not keyword:
         return jsonify({"status": "error", "message": "Keyword required"}), 400
 
-    # 중복 방지 (같은 단어는 기존 삭제 후 다시 저장)
-    mongo.db.search_history.delete_many({"keyword": keyword})
-
-    mongo.db.search_history.insert_one({
-        "keyword": keyword,
-        "created_at": datetime.utcnow()
-    })
+    # 중복 제거 + 맨 앞 추가 + 개수 제한을 한 번의 upsert로
+    push_search_history(data.get('nickname'), keyword)
     return jsonify({"status": "success"})
 
 
 @search_history_bp.route('/search-history/list', methods=['GET'])
 def get_search_history():
-    records = list(mongo.db.search_history.find().sort("created_at", -1))
+    doc = mongo.db.user_search_history.find_one({"_id": _history_id(request.args.get('nickname'))}, {"items": 1})
+    records = (doc or {}).get("items", [])
     for r in records:
-        r["_id"] = str(r["_id"])
+        if "_id" in r:
+            r["_id"] = str(r["_id"])
         if "created_at" in r:
             r["created_at"] = r["created_at"].strftime("%Y-%m-%d %H:%M:%S")  # ✅ 문자열 변환
     return jsonify(records)
@@ -34,11 +70,14 @@ def get_search_history():
 @search_history_bp.route('/search-history/delete', methods=['DELETE'])
 def delete_search_item():
     keyword = request.args.get('keyword', '')
-    mongo.db.search_history.delete_many({"keyword": keyword})
+    mongo.db.user_search_history.update_one(
+        {"_id": _history_id(request.args.get('nickname'))},
+        {"$pull": {"items": {"keyword": keyword}}}
+    )
     return jsonify({"status": "success"})
 
 
 @search_history_bp.route('/search-history/clear', methods=['DELETE'])
 def clear_search_history():
-    mongo.db.search_history.delete_many({})
+    mongo.db.user_search_history.delete_one({"_id": _history_id(request.args.get('nickname'))})
     return jsonify({"status": "success"})
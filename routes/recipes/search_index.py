@@ -0,0 +1,267 @@
+# routes/recipes/search_index.py
+# 레시피 검색용 역색인 (한국어 음절 n-gram)
+#  - 레시피 문서에 토큰 배열 저장: search_tokens(이름+설명+키워드), name_tokens(이름)
+#    → search_tokens 멀티키 인덱스로 조회 (정규식 전체 스캔 대체)
+#  - 토큰: 단어별 음절 unigram + bigram. 검색어는 2자 이상 단어면 bigram, 1자면 unigram
+#  - recipe_search_terms: 토큰별 문서 수(df). 검색 시 가장 드문 토큰부터 조회해 스캔 범위를 최소화
+#    (df는 순서 최적화용일 뿐 — 등록 실패/재계산 중 누락된 토큰도 df 0으로 보고 검색은 그대로 수행)
+#  - 기존 레시피는 scripts/backfill_recipe_index.py 로 채움
+import os
+import re
+import json
+import base64
+import unicodedata
+from bson import ObjectId
+from pymongo import UpdateOne
+from extensions import mongo
+
+SEARCH_MAX_RESULTS = int(os.getenv("SEARCH_MAX_RESULTS", "100"))   # 페이지 크기 상한
+SEARCH_PAGE_SIZE   = int(os.getenv("SEARCH_PAGE_SIZE", "20"))      # cursor만 있고 limit이 없을 때 페이지 크기
+SEARCH_UNPAGED_LIMIT = int(os.getenv("SEARCH_UNPAGED_LIMIT", "1000"))  # limit/cursor 없는 기존 방식 요청의 안전 상한
+
+# 관련도 가중치
+_W_NAME_PHRASE  = 10   # 이름에 검색어가 그대로 포함
+_W_NAME_TOKENS  = 5    # 검색어 토큰 중 이름에 있는 비율
+_W_DESC_PHRASE  = 2    # 설명에 검색어가 그대로 포함
+
+_WORD_RE = re.compile(r"[0-9a-z가-힣ㄱ-ㅎㅏ-ㅣ]+")
+
+
+# ---------- 토큰화 ----------
+def _words(text: str) -> list:
+    return _WORD_RE.findall(unicodedata.normalize("NFC", text or "").lower())
+
+def tokenize(text: str) -> set:
+    """문서 쪽 토큰: 단어별 음절 unigram + bigram"""
+    tokens = set()
+    for w in _words(text):
+        tokens.update(w)
+        tokens.update(w[i:i + 2] for i in range(len(w) - 1))
+    return tokens
+
+def query_tokens(keyword: str) -> list:
+    """검색어 토큰: 2자 이상 단어는 bigram, 1자 단어는 unigram"""
+    tokens = set()
+    for w in _words(keyword):
+        if len(w) == 1:
+            tokens.add(w)
+        else:
+            tokens.update(w[i:i + 2] for i in range(len(w) - 1))
+    return sorted(tokens)
+
+def normalize_keyword(keyword: str) -> str:
+    return " ".join(_words(keyword))
+
+def search_fields(name: str, desc: str = "", keywords=None) -> dict:
+    """레시피 문서에 함께 저장할 색인 필드"""
+    kw_text = " ".join(k for k in (keywords or []) if isinstance(k, str))
+    return {
+        "search_tokens": sorted(tokenize(name) | tokenize(desc) | tokenize(kw_text)),
+        "name_tokens": sorted(tokenize(name)),
+    }
+
+SEARCH_FIELDS = ("search_tokens", "name_tokens")
+
+
+# ---------- 토큰 통계(df) ----------
+def register_terms(tokens, db=None):
+    """새 레시피 토큰의 df 증가 (create_recipe에서 insert 직후 호출)"""
+    db = db if db is not None else mongo.db
+    if tokens:
+        db.recipe_search_terms.bulk_write(
+            [UpdateOne({"_id": t}, {"$inc": {"df": 1}}, upsert=True) for t in tokens],
+            ordered=False
+        )
+
+def rebuild_terms(db=None):
+    """recipes 전체에서 df 재계산 (백필/복구용)"""
+    db = db if db is not None else mongo.db
+    db.recipes.aggregate([
+        {"$match": {"search_tokens.0": {"$exists": True}}},
+        {"$project": {"search_tokens": 1}},
+        {"$unwind": "$search_tokens"},
+        {"$group": {"_id": "$search_tokens", "df": {"$sum": 1}}},
+        {"$out": "recipe_search_terms"},
+    ], allowDiskUse=True)
+
+def _order_by_rarity(tokens: list, db) -> list:
+    """df 오름차순 정렬. recipe_search_terms에 없는 토큰은 df 0 (맨 앞)"""
+    df = {d["_id"]: d.get("df", 0) for d in db.recipe_search_terms.find({"_id": {"$in": tokens}})}
+    return sorted(tokens, key=lambda t: df.get(t, 0))
+
+
+# ---------- 검색 ----------
+#  - 키셋(커서) 페이지네이션: 정렬 키 + _id 로 동점 처리
+#    latest: (_id) / views: (views, _id) / relevance: (relevance, _id), 모두 내림차순
+#  - 커서는 마지막 문서의 정렬 키를 base64url(JSON)로 감싼 불투명 문자열
+SEARCH_SORTS = ("relevance", "latest", "views")
+
+def encode_cursor(doc: dict, sort_by: str) -> str:
+    key = {"id": str(doc["_id"])}
+    if sort_by == "views":
+        key["v"] = doc.get("views")
+    elif sort_by == "relevance":
+        key["r"] = doc.get("relevance", 0)
+    return base64.urlsafe_b64encode(json.dumps(key, separators=(",", ":")).encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str, sort_by: str):
+    """잘못된 커서면 ValueError"""
+    try:
+        key = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        key["id"] = ObjectId(key["id"])
+    except Exception:
+        raise ValueError("invalid cursor")
+    if sort_by == "views" and "v" not in key or sort_by == "relevance" and "r" not in key:
+        raise ValueError("cursor does not match sort")
+    return key
+
+def _after(sort_by: str, key: dict) -> dict:
+    """커서 다음 문서 조건 (내림차순 기준)"""
+    oid = key["id"]
+    if sort_by == "latest":
+        return {"_id": {"$lt": oid}}
+    if sort_by == "views":
+        v = key["v"]
+        if v is None:  # views 필드가 없는 문서는 숫자보다 뒤에 정렬됨
+            return {"views": None, "_id": {"$lt": oid}}
+        return {"$or": [{"views": {"$lt": v}}, {"views": v, "_id": {"$lt": oid}}, {"views": None}]}
+    r = key["r"]
+    return {"$or": [{"relevance": {"$lt": r}}, {"relevance": r, "_id": {"$lt": oid}}]}
+
+# ---------- 필터 / 패싯 ----------
+#  - keyword(키워드 포함, 여러 개면 모두 포함), level(상/중/하, 여러 개면 하나라도), max_time, min_score
+#  - facets=True면 같은 매칭 집합에 대해 페이지 + 패싯 건수를 $facet 한 번으로 계산
+TIME_BUCKETS  = [0, 16, 31, 61, 121, 1441]    # ~15분, ~30분, ~1시간, ~2시간, 그 이상
+SCORE_BUCKETS = [0, 40, 60, 80, 101]
+FACET_KEYWORDS_TOP = 20
+
+def recipe_filter(keywords=None, levels=None, max_time=None, min_score=None) -> dict:
+    f = {}
+    if keywords:
+        f["keywords"] = {"$all": list(keywords)}
+    if levels:
+        f["level"] = {"$in": list(levels)}
+    if max_time is not None:
+        f["time"] = {"$lte": int(max_time)}
+    if min_score is not None:
+        f["score"] = {"$gte": float(min_score)}
+    return f
+
+def _facet_stages() -> dict:
+    return {
+        "keywords": [
+            {"$unwind": "$keywords"},
+            {"$group": {"_id": "$keywords", "count": {"$sum": 1}}},
+            {"$sort": {"count": -1, "_id": 1}},
+            {"$limit": FACET_KEYWORDS_TOP},
+        ],
+        "level": [
+            {"$group": {"_id": "$level", "count": {"$sum": 1}}},
+            {"$sort": {"_id": 1}},
+        ],
+        "time": [{"$bucket": {"groupBy": "$time", "boundaries": TIME_BUCKETS, "default": "other"}}],
+        "score": [{"$bucket": {"groupBy": "$score", "boundaries": SCORE_BUCKETS, "default": "other"}}],
+        "total": [{"$count": "count"}],
+    }
+
+def _format_facets(raw: dict) -> dict:
+    return {
+        "keywords": [{"value": r["_id"], "count": r["count"]} for r in raw.get("keywords", [])],
+        "level": [{"value": r["_id"], "count": r["count"]} for r in raw.get("level", []) if r["_id"]],
+        "time": [{"min": r["_id"], "count": r["count"]} for r in raw.get("time", [])],
+        "score": [{"min": r["_id"], "count": r["count"]} for r in raw.get("score", [])],
+        "total": (raw.get("total") or [{"count": 0}])[0]["count"],
+    }
+
+
+def search_pipeline(tokens: list, keyword: str, sort_by: str, projection: dict, limit: int, after: dict = None,
+                    filters: dict = None, facets: bool = False) -> list:
+    """
+    $all 매칭(첫 토큰 = 가장 드문 토큰으로 인덱스 스캔) + 필터 → 정렬 → 페이지 → 투영.
+    latest/views는 정렬·limit 뒤에 페이지 문서만 관련도 계산, relevance는 매칭 문서 전체에 대해 계산.
+    검색어 없이 필터만 있으면 관련도 0, relevance 정렬은 latest로 처리.
+    facets=True면 [매칭, {$facet: {recipes: 페이지, keywords/level/time/score/total: 건수}}]
+    """
+    phrase = normalize_keyword(keyword)
+    if tokens:
+        relevance = {"$add": [
+            {"$cond": [{"$gte": [{"$indexOfCP": [{"$toLower": "$name"}, phrase]}, 0]}, _W_NAME_PHRASE, 0]},
+            {"$multiply": [
+                _W_NAME_TOKENS / max(1, len(tokens)),
+                {"$size": {"$setIntersection": [{"$ifNull": ["$name_tokens", []]}, tokens]}},
+            ]},
+            {"$cond": [{"$gte": [{"$indexOfCP": [{"$toLower": {"$ifNull": ["$desc", ""]}}, phrase]}, 0]}, _W_DESC_PHRASE, 0]},
+        ]}
+        base = {"search_tokens": {"$all": tokens}, **(filters or {})}
+    else:
+        relevance = {"$literal": 0}
+        base = dict(filters or {})
+
+    page = []
+    match = base
+    if sort_by == "relevance":
+        page += [{"$addFields": {"relevance": relevance}}]
+        if after:
+            page.append({"$match": _after(sort_by, after)})
+        page += [{"$sort": {"relevance": -1, "_id": -1}}, {"$limit": limit}]
+    else:
+        if after:
+            cond = _after(sort_by, after)
+            if facets:
+                page.append({"$match": cond})  # 패싯 건수는 커서와 무관하게 전체 매칭 기준
+            else:
+                match = {"$and": [base, cond]}
+        sort = {"views": -1, "_id": -1} if sort_by == "views" else {"_id": -1}
+        page += [{"$sort": sort}, {"$limit": limit}, {"$addFields": {"relevance": relevance}}]
+    page.append({"$project": {**projection, "relevance": 1}})
+
+    if facets:
+        return [{"$match": base}, {"$facet": {"recipes": page, **_facet_stages()}}]
+    return [{"$match": match}] + page
+
+def search_recipe_docs(keyword: str, sort_by: str = "relevance", projection: dict = None,
+                       limit: int = SEARCH_MAX_RESULTS, cursor: str = None, filters: dict = None,
+                       facets: bool = False, db=None):
+    """
+    반환: (문서 목록, 다음 페이지 커서 | None, 패싯 | None). 잘못된 커서면 ValueError
+    검색어와 필터가 모두 없으면 빈 결과.
+    """
+    db = db if db is not None else mongo.db
+    sort_by = sort_by if sort_by in SEARCH_SORTS else "relevance"
+    tokens = query_tokens(keyword)
+    if not tokens and sort_by == "relevance":
+        sort_by = "latest"
+    after = decode_cursor(cursor, sort_by) if cursor else None
+    if not tokens and not filters:
+        return [], None, None
+    if tokens:
+        tokens = _order_by_rarity(tokens, db)
+    projection = projection or {"name": 1}
+    if sort_by == "views":
+        projection = {**projection, "views": 1}
+    # 한 건 더 읽어 다음 페이지 존재 여부 판단
+    pipeline = search_pipeline(tokens, keyword, sort_by, projection, limit + 1, after, filters, facets)
+    facet_counts = None
+    if facets:
+        raw = next(db.recipes.aggregate(pipeline), {})
+        docs = raw.get("recipes", [])
+        facet_counts = _format_facets(raw)
+    else:
+        docs = list(db.recipes.aggregate(pipeline))
+    if len(docs) <= limit:
+        return docs, None, facet_counts
+    docs = docs[:limit]
+    return docs, encode_cursor(docs[-1], sort_by), facet_counts
+
+
+def ensure_indexes():
+    """
+    검색 토큰 멀티키 인덱스 + 필터 조회용 인덱스
+    (검색어 없이 필터만 쓰는 조회도 COLLSCAN이 되지 않도록: scripts/check_recipe_query_plans.py 로 확인)
+    """
+    mongo.db.recipes.create_index("search_tokens")
+    mongo.db.recipes.create_index([("keywords", 1), ("_id", -1)])
+    mongo.db.recipes.create_index([("level", 1), ("time", 1), ("score", -1)])
+    mongo.db.recipes.create_index([("time", 1), ("score", -1)])
+    mongo.db.recipes.create_index([("score", -1), ("_id", -1)])
+    mongo.db.recipes.create_index([("views", -1), ("_id", -1)])
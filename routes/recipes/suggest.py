@@ -0,0 +1,229 @@
+# routes/recipes/suggest.py
+# 검색어 자동완성 (메모리 접두사 색인)
+#  - 후보: keywords 컬렉션, 레시피 이름, 인기 검색 기록
+#  - 정렬된 배열 + bisect 로 접두사 검색. 단어 시작 위치마다 키를 넣어 "찌개" 로 "돼지 찌개" 도 찾음
+#    (단어 중간 부분 문자열은 대상 아님)
+#  - 초성 검색: "ㄱㅊ" → "김치", "김ㅊ" → "김치" (완성된 음절은 그대로, 자음은 초성으로 비교)
+#  - 요청 경로에서는 Mongo 접근 없음. 시작 시 백그라운드로 전체 구축 → SUGGEST_REBUILD_SEC마다 재구축,
+#    레시피 등록 시에는 add_suggest_term()으로 바로 추가
+import os
+import math
+import time
+import bisect
+import logging
+import threading
+import unicodedata
+from flask import Blueprint, jsonify, request
+from cache import TTLCache
+from extensions import mongo
+from routes.recipes.keywords import get_keyword_list
+
+suggest_bp = Blueprint('suggest', __name__)
+
+SUGGEST_LIMIT          = int(os.getenv("SUGGEST_LIMIT", "10"))
+SUGGEST_SCAN_LIMIT     = int(os.getenv("SUGGEST_SCAN_LIMIT", "1000"))   # 요청당 훑어볼 최대 후보 수
+SUGGEST_REBUILD_SEC    = int(os.getenv("SUGGEST_REBUILD_SEC", "600"))
+SUGGEST_MAX_RECIPES    = int(os.getenv("SUGGEST_MAX_RECIPES", "50000"))
+SUGGEST_HISTORY_TOP    = int(os.getenv("SUGGEST_HISTORY_TOP", "500"))
+
+# 출처별 가중치
+_W_KEYWORD = 50.0
+_W_HISTORY = 5.0     # 검색 횟수당
+_W_RECIPE  = 1.0     # + log10(1 + 조회수)
+
+_CHOSEONG = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+_JAMO_CONSONANTS = set(_CHOSEONG) | set("ㄳㄵㄶㄺㄻㄼㄽㄾㄿㅀㅄ")
+
+
+# ---------- 정규화 / 초성 ----------
+def _normalize(text: str) -> str:
+    return " ".join(unicodedata.normalize("NFC", text or "").lower().split())
+
+def _choseong_char(ch: str) -> str:
+    code = ord(ch) - 0xAC00
+    if 0 <= code < 11172:
+        return _CHOSEONG[code // 588]
+    return ch
+
+def to_choseong(text: str) -> str:
+    return "".join(_choseong_char(c) for c in text)
+
+def _has_jamo(text: str) -> bool:
+    return any(c in _JAMO_CONSONANTS for c in text)
+
+def _word_starts(key: str) -> list:
+    """단어 시작 위치 (0 포함)"""
+    return [0] + [i + 1 for i, c in enumerate(key) if c == " " and i + 1 < len(key)]
+
+
+# ---------- 색인 ----------
+class SuggestIndex:
+    """
+    _keys: (정규화 키 접미부, term) 정렬 배열
+    _cho:  (초성 키 접미부, 정규화 키 접미부, term) 정렬 배열
+    _weights: term → 가중치
+    """
+
+    def __init__(self):
+        self._keys = []
+        self._cho = []
+        self._weights = {}
+        self._lock = threading.Lock()
+        self.built_at = None
+        self.build_ms = 0.0
+        # 짧은 접두사("ㄱ", "김")는 후보가 많아 결과를 캐시 (색인이 바뀌면 비움)
+        self._short_cache = TTLCache(maxsize=4096, ttl=SUGGEST_REBUILD_SEC)
+
+    @staticmethod
+    def _entries(term: str):
+        key = _normalize(term)
+        for i in _word_starts(key):
+            part = key[i:]
+            yield (part, term), (to_choseong(part), part, term)
+
+    def replace(self, weights: dict, build_ms: float = 0.0):
+        """전체 재구축 결과로 교체 (배열을 새로 만든 뒤 참조만 바꿈)"""
+        keys, cho = [], []
+        for term in weights:
+            for k, c in self._entries(term):
+                keys.append(k)
+                cho.append(c)
+        keys.sort()
+        cho.sort()
+        with self._lock:
+            self._keys, self._cho, self._weights = keys, cho, dict(weights)
+            self.built_at = time.time()
+            self.build_ms = build_ms
+        self._short_cache.clear()
+
+    def add(self, term: str, weight: float):
+        term = (term or "").strip()
+        if not term:
+            return
+        # 복사본에 넣고 참조만 바꿈 (suggest는 잠금 밖에서 이전 배열을 그대로 훑으므로 제자리 수정 금지)
+        with self._lock:
+            keys, cho, weights = self._keys, self._cho, dict(self._weights)
+            if term not in weights:
+                keys, cho = list(keys), list(cho)
+                for k, c in self._entries(term):
+                    bisect.insort(keys, k)
+                    bisect.insort(cho, c)
+            weights[term] = weights.get(term, 0.0) + weight
+            self._keys, self._cho, self._weights = keys, cho, weights
+        self._short_cache.clear()
+
+    def suggest(self, q: str, limit: int = SUGGEST_LIMIT) -> list:
+        q = _normalize(q)
+        if not q:
+            return []
+        if len(q) <= 2:
+            cached = self._short_cache.get((q, limit))
+            if cached is not None:
+                return cached
+        with self._lock:
+            keys, cho, weights = self._keys, self._cho, self._weights
+        found = {}
+        if _has_jamo(q):
+            # 초성 키로 후보를 찾고, 완성 음절 위치는 실제 글자와 비교
+            cq = to_choseong(q)
+            i = bisect.bisect_left(cho, (cq,))
+            scanned = 0
+            while i < len(cho) and cho[i][0].startswith(cq) and scanned < SUGGEST_SCAN_LIMIT:
+                _, part, term = cho[i]
+                if all(qc == pc or (qc in _JAMO_CONSONANTS and _choseong_char(pc) == qc) for qc, pc in zip(q, part)):
+                    found[term] = weights.get(term, 0.0)
+                i += 1
+                scanned += 1
+        else:
+            i = bisect.bisect_left(keys, (q,))
+            scanned = 0
+            while i < len(keys) and keys[i][0].startswith(q) and scanned < SUGGEST_SCAN_LIMIT:
+                term = keys[i][1]
+                found[term] = weights.get(term, 0.0)
+                i += 1
+                scanned += 1
+        # 가중치 내림차순, 같으면 짧은 것 먼저
+        result = [t for t, _ in sorted(found.items(), key=lambda kv: (-kv[1], len(kv[0]), kv[0]))[:limit]]
+        if len(q) <= 2:
+            self._short_cache.set((q, limit), result)
+        return result
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"terms": len(self._weights), "keys": len(self._keys), "built_at": self.built_at,
+                    "build_ms": round(self.build_ms, 1)}
+
+
+suggest_index = SuggestIndex()
+
+
+def collect_terms() -> dict:
+    """Mongo에서 자동완성 후보와 가중치 수집 (백그라운드 재구축용)"""
+    weights = {}
+
+    def bump(term, w):
+        term = (term or "").strip() if isinstance(term, str) else ""
+        if term:
+            weights[term] = weights.get(term, 0.0) + w
+
+    for keyword in get_keyword_list()[0]:
+        bump(keyword, _W_KEYWORD)
+    for doc in mongo.db.recipes.find({}, {"_id": 0, "name": 1, "views": 1}).sort("views", -1).limit(SUGGEST_MAX_RECIPES):
+        bump(doc.get("name"), _W_RECIPE + math.log10(1 + max(0, doc.get("views") or 0)))
+    # 사용자별 최근 검색 기록(search_history.py)에 많이 등장하는 검색어
+    for row in mongo.db.user_search_history.aggregate([
+        {"$unwind": "$items"},
+        {"$group": {"_id": "$items.keyword", "count": {"$sum": 1}}},
+        {"$sort": {"count": -1}},
+        {"$limit": SUGGEST_HISTORY_TOP},
+    ]):
+        bump(row["_id"], _W_HISTORY * row["count"])
+    return weights
+
+def rebuild_suggest_index():
+    started = time.perf_counter()
+    weights = collect_terms()
+    suggest_index.replace(weights, (time.perf_counter() - started) * 1000.0)
+
+def add_suggest_term(term: str, weight: float = _W_RECIPE):
+    """레시피 등록 직후 호출 (재구축을 기다리지 않고 바로 반영)"""
+    suggest_index.add(term, weight)
+
+
+_stop = threading.Event()
+_job = []
+
+def _run(stop_event: threading.Event = _stop):
+    while not stop_event.is_set():
+        try:
+            rebuild_suggest_index()
+        except Exception as e:
+            logging.error("suggest index rebuild failed: %s", e)
+        stop_event.wait(SUGGEST_REBUILD_SEC)
+
+def start_suggest_index():
+    """자동완성 색인 구축/주기적 재구축 데몬 스레드 시작"""
+    if _job:
+        return
+    t = threading.Thread(target=_run, name="suggest-index", daemon=True)
+    t.start()
+    _job.append(t)
+
+
+# ---------- 라우트 ----------
+@suggest_bp.route('/recipes/suggest', methods=['GET'])
+def suggest_recipes():
+    q = request.args.get('q', '')
+    try:
+        limit = min(max(int(request.args.get('limit', SUGGEST_LIMIT)), 1), 50)
+    except ValueError:
+        limit = SUGGEST_LIMIT
+    return jsonify({
+        "status": "success",
+        "suggestions": suggest_index.suggest(q, limit),
+    }), 200
+
+@suggest_bp.route('/recipes/suggest/stats', methods=['GET'])
+def get_suggest_stats():
+    """자동완성 색인 상태 (후보 수, 마지막 구축 시각/소요 시간)"""
+    return jsonify(suggest_index.stats()), 200
@@ -0,0 +1,140 @@
+# routes/recipes/trending.py
+# 시간 버킷 조회수 + 인기(트렌딩) 레시피
+#  - 조회수 flush(views.py) 때 레시피별 시간/일 버킷 문서에 $inc
+#      recipe_views_hourly {recipe_id, hour, count}  (TRENDING_HOURLY_RETENTION_H 후 TTL 삭제)
+#      recipe_views_daily  {recipe_id, day,  count}  (TRENDING_DAILY_RETENTION_D 후 TTL 삭제)
+#  - 백그라운드 작업이 최근 TRENDING_WINDOW_HOURS 시간 버킷을 반감기 감쇠로 합산해
+#    trending_recipes 문서 1개({_id: "current"})로 저장 → 요청 시에는 이 문서만 읽음
+import os
+import logging
+import threading
+from datetime import datetime, timedelta
+from flask import Blueprint, jsonify, request
+from pymongo import UpdateOne
+from extensions import mongo
+from routes.recipes.search import SUMMARY_PROJECTION
+
+trending_bp = Blueprint('trending', __name__)
+
+TRENDING_HALF_LIFE_HOURS    = float(os.getenv("TRENDING_HALF_LIFE_HOURS", "24"))
+TRENDING_WINDOW_HOURS       = int(os.getenv("TRENDING_WINDOW_HOURS", "72"))
+TRENDING_SIZE               = int(os.getenv("TRENDING_SIZE", "20"))
+TRENDING_REFRESH_SEC        = int(os.getenv("TRENDING_REFRESH_SEC", "300"))
+TRENDING_HOURLY_RETENTION_H = int(os.getenv("TRENDING_HOURLY_RETENTION_H", "96"))
+TRENDING_DAILY_RETENTION_D  = int(os.getenv("TRENDING_DAILY_RETENTION_D", "400"))
+
+_TRENDING_ID = "current"
+_stop = threading.Event()
+_job = []
+
+
+# ---------- 시간 버킷 ----------
+def record_view_buckets(counts: dict, now: datetime = None):
+    """{recipe_id(ObjectId): 증가분} → 시간/일 버킷에 반영 (views.py flush에서 호출)"""
+    if not counts:
+        return
+    now = now or datetime.utcnow()
+    hour = now.replace(minute=0, second=0, microsecond=0)
+    day = hour.replace(hour=0)
+    mongo.db.recipe_views_hourly.bulk_write(
+        [UpdateOne({"recipe_id": rid, "hour": hour}, {"$inc": {"count": n}}, upsert=True) for rid, n in counts.items()],
+        ordered=False
+    )
+    mongo.db.recipe_views_daily.bulk_write(
+        [UpdateOne({"recipe_id": rid, "day": day}, {"$inc": {"count": n}}, upsert=True) for rid, n in counts.items()],
+        ordered=False
+    )
+
+
+# ---------- 트렌딩 계산 ----------
+def compute_trending(now: datetime = None, size: int = TRENDING_SIZE) -> list:
+    """최근 버킷 조회수를 반감기 감쇠로 합산한 상위 size개 레시피"""
+    now = now or datetime.utcnow()
+    since = now - timedelta(hours=TRENDING_WINDOW_HOURS)
+    half_life_ms = TRENDING_HALF_LIFE_HOURS * 3600 * 1000
+    rows = list(mongo.db.recipe_views_hourly.aggregate([
+        {"$match": {"hour": {"$gte": since}}},
+        {"$group": {
+            "_id": "$recipe_id",
+            "trend_score": {"$sum": {"$multiply": [
+                "$count",
+                {"$pow": [0.5, {"$divide": [{"$subtract": [now, "$hour"]}, half_life_ms]}]},
+            ]}},
+            "recent_views": {"$sum": "$count"},
+        }},
+        {"$sort": {"trend_score": -1}},
+        {"$limit": size},
+    ]))
+    if not rows:
+        return []
+
+    recipes = {r["_id"]: r for r in mongo.db.recipes.find({"_id": {"$in": [row["_id"] for row in rows]}}, SUMMARY_PROJECTION)}
+    items = []
+    for row in rows:
+        recipe = recipes.get(row["_id"])
+        if not recipe:  # 삭제된 레시피
+            continue
+        recipe["_id"] = str(recipe["_id"])
+        recipe["trend_score"] = round(row["trend_score"], 3)
+        recipe["recent_views"] = row["recent_views"]
+        items.append(recipe)
+    return items
+
+def refresh_trending(force: bool = False) -> bool:
+    """trending_recipes 문서 갱신. 다른 프로세스가 최근에 갱신했으면 건너뜀"""
+    now = datetime.utcnow()
+    if not force:
+        doc = mongo.db.trending_recipes.find_one({"_id": _TRENDING_ID}, {"computed_at": 1})
+        if doc and now - doc["computed_at"] < timedelta(seconds=TRENDING_REFRESH_SEC):
+            return False
+    items = compute_trending(now)
+    mongo.db.trending_recipes.replace_one(
+        {"_id": _TRENDING_ID},
+        {"computed_at": now, "window_hours": TRENDING_WINDOW_HOURS,
+         "half_life_hours": TRENDING_HALF_LIFE_HOURS, "items": items},
+        upsert=True
+    )
+    return True
+
+def _run(stop_event: threading.Event = _stop):
+    while not stop_event.is_set():
+        try:
+            refresh_trending()
+        except Exception as e:
+            logging.error("trending refresh failed: %s", e)
+        stop_event.wait(TRENDING_REFRESH_SEC)
+
+def start_trending_job():
+    """트렌딩 갱신 데몬 스레드 시작 (TRENDING_REFRESH_SEC <= 0 이면 생략)"""
+    if _job or TRENDING_REFRESH_SEC <= 0:
+        return
+    t = threading.Thread(target=_run, name="trending-refresh", daemon=True)
+    t.start()
+    _job.append(t)
+
+
+def ensure_indexes():
+    """버킷 upsert용 유니크 인덱스 + 보관 기간 TTL"""
+    mongo.db.recipe_views_hourly.create_index([("recipe_id", 1), ("hour", 1)], unique=True)
+    mongo.db.recipe_views_hourly.create_index("hour", expireAfterSeconds=TRENDING_HOURLY_RETENTION_H * 3600)
+    mongo.db.recipe_views_daily.create_index([("recipe_id", 1), ("day", 1)], unique=True)
+    mongo.db.recipe_views_daily.create_index("day", expireAfterSeconds=TRENDING_DAILY_RETENTION_D * 86400)
+
+
+# ---------- 라우트 ----------
+@trending_bp.route('/recipes/trending', methods=['GET'])
+def get_trending_recipes():
+    """미리 계산된 인기 레시피 (trending_recipes 문서 1개 조회)"""
+    try:
+        limit = min(max(int(request.args.get('limit', TRENDING_SIZE)), 1), TRENDING_SIZE)
+    except ValueError:
+        limit = TRENDING_SIZE
+
+    doc = mongo.db.trending_recipes.find_one({"_id": _TRENDING_ID}, {"items": {"$slice": limit}, "computed_at": 1})
+    if not doc:
+        return jsonify({"status": "success", "computed_at": None, "recipes": []}), 200
+    return jsonify({
+        "status": "success",
+        "computed_at": doc["computed_at"].strftime("%Y-%m-%d %H:%M:%S"),
+        "recipes": doc.get("items", []),
+    }), 200
@@ -1,32 +1,187 @@
+import os
+import time
+import atexit
+import logging
+import threading
 from flask import Blueprint, jsonify
 from bson import ObjectId
+from bson.errors import InvalidId
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+from cache import TTLCache
 from extensions import mongo  # mongo 객체 불러오기
+from routes.recipes.trending import record_view_buckets
 
 view_bp = Blueprint('view', __name__)
 
+# ---------- 조회수 write-behind 버퍼 ----------
+#  - 요청마다 Mongo에 쓰지 않고 레시피별로 증가분을 모아 두었다가
+#    VIEW_FLUSH_INTERVAL_SEC마다 unordered bulk_write 1번으로 반영
+#  - 최대 유실 구간 = VIEW_FLUSH_INTERVAL_SEC (프로세스 비정상 종료 시), 정상 종료 시 atexit에서 flush
+#  - 쌓인 레시피 수가 VIEW_BUFFER_MAX_IDS를 넘으면 주기를 기다리지 않고 바로 flush
+#  - 같은 배치를 시간/일 버킷에도 반영 (trending.py)
+#  - 없는 레시피는 버퍼에 넣지 않고 404 (존재 확인 결과는 VIEW_KNOWN_ID_TTL_SEC 동안 캐시)
+VIEW_FLUSH_INTERVAL_SEC = float(os.getenv("VIEW_FLUSH_INTERVAL_SEC", "2"))
+VIEW_BUFFER_MAX_IDS     = int(os.getenv("VIEW_BUFFER_MAX_IDS", "5000"))
+VIEW_KNOWN_ID_MAXSIZE   = int(os.getenv("VIEW_KNOWN_ID_MAXSIZE", "20000"))
+VIEW_KNOWN_ID_TTL_SEC   = int(os.getenv("VIEW_KNOWN_ID_TTL_SEC", "3600"))
+
+_known_ids = TTLCache(maxsize=VIEW_KNOWN_ID_MAXSIZE, ttl=VIEW_KNOWN_ID_TTL_SEC)
+
+
+def recipe_exists(recipe_id: ObjectId) -> bool:
+    """레시피 존재 여부 (있는 id만 캐시 → 새로 등록된 레시피는 바로 조회됨)"""
+    if _known_ids.get(recipe_id):
+        return True
+    if mongo.db.recipes.find_one({"_id": recipe_id}, {"_id": 1}) is None:
+        return False
+    _known_ids.set(recipe_id, True)
+    return True
+
+
+class ViewCounterBuffer:
+    def __init__(self, interval=VIEW_FLUSH_INTERVAL_SEC, max_ids=VIEW_BUFFER_MAX_IDS):
+        self.interval = interval
+        self.max_ids = max_ids
+        self._counts = {}
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+        self._stats = {
+            "flushes": 0, "flushed_views": 0, "errors": 0, "last_error": "",
+            "last_flush_ms": 0.0, "max_flush_ms": 0.0, "total_flush_ms": 0.0,
+        }
+
+    def add(self, recipe_id: ObjectId, n: int = 1):
+        self.start()
+        with self._lock:
+            self._counts[recipe_id] = self._counts.get(recipe_id, 0) + n
+            backlog = len(self._counts)
+        if backlog >= self.max_ids:
+            self._wake.set()
+
+    def flush(self) -> int:
+        """
+        쌓인 증가분을 한 번에 반영. 실패한 증가분은 다음 flush에서 다시 시도하도록 되돌려 둠
+        (BulkWriteError면 writeErrors에 있는 작업만, 그 외 오류면 반영 여부를 알 수 없어 전부)
+        """
+        with self._flush_lock:
+            with self._lock:
+                batch, self._counts = self._counts, {}
+            if not batch:
+                return 0
+            started = time.perf_counter()
+            items = list(batch.items())
+            try:
+                mongo.db.recipes.bulk_write(
+                    [UpdateOne({"_id": rid}, {"$inc": {"views": n}}) for rid, n in items],
+                    ordered=False
+                )
+            except BulkWriteError as e:
+                failed = {err["index"] for err in e.details.get("writeErrors", [])}
+                self._requeue([items[i] for i in sorted(failed)], e)
+                batch = {rid: n for i, (rid, n) in enumerate(items) if i not in failed}
+                if not batch:
+                    return 0
+            except Exception as e:
+                self._requeue(items, e)
+                return 0
+            try:
+                record_view_buckets(batch)
+            except Exception as e:
+                # 누적 조회수는 이미 반영됐으므로 되돌리지 않음 (트렌딩 신호만 일부 누락)
+                logging.warning("view bucket write failed: %s", e)
+            ms = (time.perf_counter() - started) * 1000.0
+            views = sum(batch.values())
+            with self._lock:
+                self._stats["flushes"] += 1
+                self._stats["flushed_views"] += views
+                self._stats["last_flush_ms"] = round(ms, 2)
+                self._stats["max_flush_ms"] = round(max(self._stats["max_flush_ms"], ms), 2)
+                self._stats["total_flush_ms"] += ms
+            return views
+
+    def _requeue(self, items: list, err: Exception):
+        with self._lock:
+            for rid, n in items:
+                self._counts[rid] = self._counts.get(rid, 0) + n
+            self._stats["errors"] += 1
+            self._stats["last_error"] = str(err)[:200]
+        logging.error("view counter flush failed (%d ids requeued): %s", len(items), err)
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._wake.wait(self.interval)
+            self._wake.clear()
+            self.flush()
+
+    def start(self):
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._run, name="view-counter-flush", daemon=True)
+            self._thread.start()
+        atexit.register(self.shutdown)
+
+    def shutdown(self):
+        self._stop.set()
+        self._wake.set()
+        self.flush()
+
+    def stats(self) -> dict:
+        with self._lock:
+            s = dict(self._stats)
+            s["backlog_ids"] = len(self._counts)
+            s["backlog_views"] = sum(self._counts.values())
+        total_ms = s.pop("total_flush_ms")
+        s["avg_flush_ms"] = round(total_ms / s["flushes"], 2) if s["flushes"] else 0.0
+        s["interval_sec"] = self.interval
+        return s
+
+
+view_counter = ViewCounterBuffer()
+
+def start_view_counter():
+    view_counter.start()
+
+
 @view_bp.route('/recipes/view/<recipe_id>', methods=['POST'])
 def increase_recipe_view(recipe_id):
     try:
-        # MongoDB에서 해당 레시피 찾고 views 1 증가
-        result = mongo.db.recipes.update_one(
-            {"_id": ObjectId(recipe_id)},
-            {"$inc": {"views": 1}}
-        )
-
-        if result.matched_count == 0:
+        rid = ObjectId(recipe_id)
+        if not recipe_exists(rid):
             return jsonify({
                 "status": "error",
                 "message": "Recipe not found"
             }), 404
 
+        # 조회수 증가분은 버퍼에 쌓고 바로 응답 (Mongo 반영은 주기적 flush)
+        view_counter.add(rid)
+
         return jsonify({
             "status": "success",
             "message": "View count increased"
         }), 200
 
+    except InvalidId:
+        return jsonify({
+            "status": "error",
+            "message": "Invalid recipe id"
+        }), 400
+
     except Exception as e:
         print("[ERROR]", str(e))
         return jsonify({
             "status": "error",
             "message": str(e)
         }), 500
+
+
+@view_bp.route('/recipes/views/buffer', methods=['GET'])
+def get_view_buffer_stats():
+    """조회수 버퍼 상태: 대기 중인 레시피/조회수, flush 지연 시간"""
+    return jsonify(view_counter.stats()), 200
@@ -0,0 +1,106 @@
+# routes/signup/user_cache.py
+# 사용자 조회 캐시 (프로세스 메모리, LRU + TTL)
+#  - 라우트 대부분이 users 문서 전체(비밀번호 해시 포함)를 읽고 필드 한두 개만 사용
+#    → 필요한 필드만 projection으로 읽고 결과를 캐시
+#  - identity: email → nickname (거의 바뀌지 않음, USER_IDENTITY_TTL_SEC)
+#  - profile : nickname → {id, nickname, email} (USER_PROFILE_TTL_SEC)
+#  - point / joined_challenges 처럼 자주 바뀌는 필드는 캐시하지 않고 live 인자로 요청할 때마다 읽음
+#    (캐시는 프로세스마다 따로라 다른 워커에서 바뀐 값을 알 수 없음) → 요청당 users 조회는 최대 1번
+#  - 프로필 필드를 바꾼 뒤에는 invalidate_user(nickname) 호출 (현재 프로세스 캐시만 비움)
+#  - 없는 사용자는 캐시하지 않음 (가입 직후 조회가 바로 보이도록), 비밀번호 해시도 캐시하지 않음
+import os
+from cache import TTLCache
+from extensions import mongo
+
+USER_CACHE_MAXSIZE    = int(os.getenv("USER_CACHE_MAXSIZE", "4096"))
+USER_IDENTITY_TTL_SEC = int(os.getenv("USER_IDENTITY_TTL_SEC", "3600"))
+USER_PROFILE_TTL_SEC  = int(os.getenv("USER_PROFILE_TTL_SEC", "600"))
+
+PROFILE_PROJECTION = {"nickname": 1, "email": 1}
+LIVE_DEFAULTS      = {"point": 0, "joined_challenges": []}   # 캐시하지 않는 필드와 기본값
+LOGIN_PROJECTION   = {"nickname": 1, "email": 1, "password": 1}
+
+_identity = TTLCache(maxsize=USER_CACHE_MAXSIZE, ttl=USER_IDENTITY_TTL_SEC)
+_profiles = TTLCache(maxsize=USER_CACHE_MAXSIZE, ttl=USER_PROFILE_TTL_SEC)
+
+
+def _to_profile(doc: dict) -> dict:
+    return {
+        "id": str(doc["_id"]),
+        "nickname": doc.get("nickname", ""),
+        "email": doc.get("email", ""),
+    }
+
+def _live_values(doc: dict, live) -> dict:
+    out = {}
+    for f in live:
+        v = doc.get(f)
+        out[f] = list(v or []) if isinstance(LIVE_DEFAULTS[f], list) else (LIVE_DEFAULTS[f] if v is None else v)
+    return out
+
+def remember_identity(email: str, nickname: str):
+    if email and nickname:
+        _identity.set(email, nickname)
+
+
+def get_profile(nickname: str = None, email: str = None, live: tuple = ()):
+    """
+    nickname 또는 email로 사용자 요약 조회 (없으면 None).
+    live: 캐시하지 않고 새로 읽을 필드 (LIVE_DEFAULTS 중, 예: ("point",))
+    캐시에 있고 live가 없으면 Mongo 조회 없음, 그 외에는 필요한 필드만 1번 조회
+    """
+    if not nickname and email:
+        nickname = _identity.get(email)
+    live_proj = {f: 1 for f in live}
+    if nickname:
+        cached = _profiles.get(nickname)
+        if cached is not None:
+            if not live:
+                return dict(cached)
+            doc = mongo.db.users.find_one({"nickname": nickname}, live_proj)
+            return dict(cached, **_live_values(doc, live)) if doc else None
+        query = {"nickname": nickname}
+    elif email:
+        query = {"email": email}
+    else:
+        return None
+
+    doc = mongo.db.users.find_one(query, {**PROFILE_PROJECTION, **live_proj})
+    if not doc:
+        return None
+    profile = _to_profile(doc)
+    _profiles.set(profile["nickname"], profile)
+    remember_identity(profile["email"], profile["nickname"])
+    return dict(profile, **_live_values(doc, live))
+
+def nickname_for_email(email: str):
+    """email → nickname (없으면 None). identity 캐시에 있으면 Mongo 조회 없음"""
+    nickname = _identity.get(email)
+    if nickname is not None:
+        return nickname
+    profile = get_profile(email=email)
+    return profile["nickname"] if profile else None
+
+def get_login_user(email: str):
+    """로그인 검증용: 비밀번호 해시 포함, 캐시하지 않고 매번 조회"""
+    doc = mongo.db.users.find_one({"email": email}, LOGIN_PROJECTION)
+    if doc:
+        remember_identity(doc.get("email", ""), doc.get("nickname", ""))
+    return doc
+
+def user_exists(query: dict) -> bool:
+    """가입 중복 확인용: 캐시 없이 _id만 조회"""
+    return mongo.db.users.find_one(query, {"_id": 1}) is not None
+
+def invalidate_user(nickname: str):
+    """프로필 필드를 바꾼 뒤 호출 (포인트/참여 챌린지는 캐시하지 않지만 같이 호출해 둬도 무방)"""
+    _profiles.pop(nickname)
+
+def user_cache_stats() -> dict:
+    return {"identity": _identity.stats(), "profile": _profiles.stats()}
+
+
+def ensure_indexes():
+    """email / nickname 조회 인덱스 (기존 데이터에 중복이 있을 수 있어 unique는 걸지 않음)"""
+    mongo.db.users.create_index("email")
+    mongo.db.users.create_index("nickname")
@@ -2,6 +2,7 @@
 from flask import Blueprint, request, jsonify
 from extensions import mongo  # MongoDB 객체
 import bcrypt  # 비밀번호 해싱
+from routes.signup.user_cache import get_profile, get_login_user, user_exists, user_cache_stats
 
 user_bp = Blueprint('user', __name__)
 
@@ -57,8 +58,7 @@ def check_email():
     if not email:
         return jsonify({"error": "Email is required"}), 400
 
-    user = mongo.db.users.find_one({"email": email})
-    return jsonify({"exists": bool(user)}), 200
+    return jsonify({"exists": user_exists({"email": email})}), 200
 
 @user_bp.route('/check-nickname', methods=['POST'])
 def check_nickname():
@@ -68,8 +68,7 @@ def check_nickname():
     if not nickname:
         return jsonify({"error": "Nickname is required"}), 400
 
-    user = mongo.db.users.find_one({"nickname": nickname})
-    return jsonify({"exists": bool(user)}), 200
+    return jsonify({"exists": user_exists({"nickname": nickname})}), 200
 
 
 @user_bp.route('/login', methods=['POST'])
@@ -81,7 +80,7 @@ def login_user():
     if not email or not password:
         return jsonify({"error": "Email and password required"}), 400
 
-    user = mongo.db.users.find_one({"email": email})
+    user = get_login_user(email)  # 비밀번호 해시 + nickname/email만
     if not user:
         return jsonify({"error": "Invalid email or password"}), 401
 
@@ -118,19 +117,20 @@ def get_me():
     print(f"[DEBUG] '/me' 요청 받음. 이메일: {email}")
     print(f"[DEBUG] 현재 사용 중인 DB 이름: {mongo.db.name}")
 
-    user = mongo.db.users.find_one({"email": email})
+    user = get_profile(email=email)  # 캐시 → 없으면 필요한 필드만 조회 (비밀번호 해시 제외)
     print(f"[DEBUG] DB에서 찾은 사용자: {user}")
 
     if not user:
         return jsonify({"error": "User not found"}), 404
 
-    # 비밀번호 제거 및 _id 문자열화
-    user.pop("password", None)
-    user_id = str(user.get("_id")) if user.get("_id") else None
-
     return jsonify({
-        "id": user_id,
-        "nickname": user.get("nickname", ""),
-        "email": user.get("email", "")
+        "id": user["id"],
+        "nickname": user["nickname"],
+        "email": user["email"]
     }), 200
 
+
+@user_bp.route('/users/cache/stats', methods=['GET'])
+def get_user_cache_stats():
+    return jsonify(user_cache_stats()), 200
+
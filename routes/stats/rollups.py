@@ -0,0 +1,182 @@
+# routes/stats/rollups.py
+# 물/수면 기록의 일·주·월 집계(rollup)
+#  - 기록할 때마다 원본(water_records/sleep_records)을 먼저 쓰고, 이어서 집계 문서를 $inc upsert로 갱신
+#    (집계 갱신이 실패하면 원본만 남음 → rebuild_rollups()가 복구 경로)
+#      {metric}_daily   {nickname, date: "YYYY-MM-DD", <값 필드>: 합계, count, updated_at}
+#      {metric}_rollups {nickname, period: "week"|"month", key: "2025-W07"|"2025-02", start,
+#                        total, count, days(기록 있는 날 수), goal_days(목표 달성한 날 수), updated_at}
+#  - 목표 달성은 하루 합계가 목표를 처음 넘는 순간에만 goal_days +1 → 주/월 문서는 다시 합산하지 않음
+#  - 목표(WATER_GOAL_CUPS, SLEEP_GOAL_MINUTES)를 바꾸거나 원본을 고쳤다면 rebuild_rollups()로 재계산
+#    (python scripts/rebuild_wellness_rollups.py)
+import os
+from datetime import datetime, timedelta
+from pymongo import ReturnDocument, UpdateOne
+from pymongo.errors import DuplicateKeyError
+from extensions import mongo
+
+WATER_GOAL_CUPS    = int(os.getenv("WATER_GOAL_CUPS", "8"))
+SLEEP_GOAL_MINUTES = int(os.getenv("SLEEP_GOAL_MINUTES", "420"))
+
+# metric → 원본 컬렉션 / 값 필드 / 하루 목표
+METRICS = {
+    "water": {"raw": "water_records", "field": "cups", "goal": WATER_GOAL_CUPS},
+    "sleep": {"raw": "sleep_records", "field": "total_minutes", "goal": SLEEP_GOAL_MINUTES},
+}
+PERIODS = ("week", "month")
+
+
+def daily_collection(metric: str):
+    return mongo.db[f"{metric}_daily"]
+
+def rollup_collection(metric: str):
+    return mongo.db[f"{metric}_rollups"]
+
+
+# ---------- 버킷 키 ----------
+def day_key(d) -> str:
+    return d.strftime("%Y-%m-%d")
+
+def week_start(d) -> datetime:
+    """d가 속한 ISO 주의 월요일 00:00"""
+    return datetime(d.year, d.month, d.day) - timedelta(days=d.weekday())
+
+def month_start(d) -> datetime:
+    return datetime(d.year, d.month, 1)
+
+def bucket_key(period: str, d) -> str:
+    if period == "week":
+        return d.strftime("%G-W%V")
+    return d.strftime("%Y-%m")
+
+def bucket_start(period: str, d) -> datetime:
+    return week_start(d) if period == "week" else month_start(d)
+
+
+# ---------- 기록 시 갱신 ----------
+def _inc_daily(metric: str, nickname: str, value: int, now: datetime) -> dict:
+    field = METRICS[metric]["field"]
+    query = {"nickname": nickname, "date": day_key(now)}
+    update = {"$inc": {field: value, "count": 1}, "$set": {"updated_at": now}}
+    coll = daily_collection(metric)
+    try:
+        return coll.find_one_and_update(
+            query, update, upsert=True, projection={field: 1, "count": 1}, return_document=ReturnDocument.AFTER
+        )
+    except DuplicateKeyError:
+        # 같은 날 첫 기록이 동시에 들어와 upsert가 겹친 경우: 이미 생긴 문서에 다시 $inc
+        return coll.find_one_and_update(
+            query, update, projection={field: 1, "count": 1}, return_document=ReturnDocument.AFTER
+        )
+
+def record_event(metric: str, nickname: str, value: int, now: datetime = None) -> int:
+    """기록 1건을 일/주/월 집계에 반영하고 오늘 합계를 반환"""
+    cfg = METRICS[metric]
+    now = now or datetime.now()
+    day = _inc_daily(metric, nickname, value, now)
+    after = day[cfg["field"]]
+    before = after - value
+
+    inc = {"total": value, "count": 1}
+    if day["count"] == 1:
+        inc["days"] = 1
+    if before < cfg["goal"] <= after:
+        inc["goal_days"] = 1
+    rollup_collection(metric).bulk_write([
+        UpdateOne(
+            {"nickname": nickname, "period": p, "key": bucket_key(p, now)},
+            {"$inc": inc, "$set": {"updated_at": now}, "$setOnInsert": {"start": bucket_start(p, now)}},
+            upsert=True
+        )
+        for p in PERIODS
+    ], ordered=False)
+    return after
+
+
+# ---------- 원본으로 재계산 ----------
+def _rollup_ops(metric: str, nickname: str, days: list) -> list:
+    """한 사용자의 일별 합계 [(date, 합계, count)] → 주/월 집계 교체 연산"""
+    goal = METRICS[metric]["goal"]
+    buckets = {}
+    for date_str, total, count in days:
+        d = datetime.strptime(date_str, "%Y-%m-%d")
+        for p in PERIODS:
+            b = buckets.setdefault((p, bucket_key(p, d)), {
+                "start": bucket_start(p, d), "total": 0, "count": 0, "days": 0, "goal_days": 0,
+            })
+            b["total"] += total
+            b["count"] += count
+            b["days"] += 1
+            b["goal_days"] += int(total >= goal)
+    now = datetime.now()
+    return [
+        UpdateOne({"nickname": nickname, "period": p, "key": key}, {"$set": dict(b, updated_at=now)}, upsert=True)
+        for (p, key), b in buckets.items()
+    ]
+
+def rebuild_rollups(metric: str, nickname: str = None, batch: int = 1000) -> dict:
+    """
+    원본 기록에서 일별 합계를 다시 만들고, 그 일별 합계로 주/월 집계를 다시 계산.
+    기존 집계 문서는 덮어쓰고, 원본이 사라진 날/주/월 문서는 지움. 반환: 처리 건수
+    """
+    cfg = METRICS[metric]
+    field = cfg["field"]
+    daily, rollups = daily_collection(metric), rollup_collection(metric)
+    match = {"nickname": nickname} if nickname else {}
+    now = datetime.now()
+
+    # 1) 원본 → 일별 합계 (timestamp는 로컬 시각 그대로 저장돼 있으므로 날짜 문자열로 바로 자름)
+    rows = mongo.db[cfg["raw"]].aggregate([
+        {"$match": match},
+        {"$group": {
+            "_id": {"nickname": "$nickname", "date": {"$dateToString": {"format": "%Y-%m-%d", "date": "$timestamp"}}},
+            "total": {"$sum": f"${field}"},
+            "count": {"$sum": 1},
+        }},
+    ], allowDiskUse=True)
+    ops, n_days = [], 0
+    for row in rows:
+        ops.append(UpdateOne(
+            {"nickname": row["_id"]["nickname"], "date": row["_id"]["date"]},
+            {"$set": {field: row["total"], "count": row["count"], "updated_at": now}},
+            upsert=True
+        ))
+        if len(ops) >= batch:
+            daily.bulk_write(ops, ordered=False)
+            n_days += len(ops)
+            ops = []
+    if ops:
+        daily.bulk_write(ops, ordered=False)
+        n_days += len(ops)
+    daily.delete_many(dict(match, updated_at={"$lt": now}))
+
+    # 2) 일별 합계 → 주/월 집계 (사용자 단위로 모아서 교체)
+    ops, n_rollups = [], 0
+    current, days = None, []
+
+    def flush_user():
+        nonlocal ops, n_rollups
+        if current is not None:
+            ops.extend(_rollup_ops(metric, current, days))
+        if len(ops) >= batch:
+            rollups.bulk_write(ops, ordered=False)
+            n_rollups += len(ops)
+            ops = []
+
+    for doc in daily.find(match, {"nickname": 1, "date": 1, field: 1, "count": 1}).sort([("nickname", 1), ("date", 1)]):
+        if doc["nickname"] != current:
+            flush_user()
+            current, days = doc["nickname"], []
+        days.append((doc["date"], doc.get(field, 0), doc.get("count", 0)))
+    flush_user()
+    if ops:
+        rollups.bulk_write(ops, ordered=False)
+        n_rollups += len(ops)
+    rollups.delete_many(dict(match, updated_at={"$lt": now}))
+    return {"days": n_days, "rollups": n_rollups}
+
+
+def ensure_indexes():
+    """집계 upsert 키 유니크 인덱스 (차트 조회도 같은 인덱스로 범위 스캔)"""
+    for metric in METRICS:
+        daily_collection(metric).create_index([("nickname", 1), ("date", 1)], unique=True)
+        rollup_collection(metric).create_index([("nickname", 1), ("period", 1), ("key", 1)], unique=True)
@@ -0,0 +1,130 @@
+# routes/stats/stats_routes.py
+# 물/수면 통계 조회 (차트용)
+#  - 원본 기록은 읽지 않고 rollups.py가 관리하는 집계 문서만 범위 조회
+#    → 기록 기간과 상관없이 (count + window - 1)개 이하 문서만 읽음
+#  - GET /stats/water?nickname=..&range=day|week|month&count=N&window=W
+#    GET /stats/sleep (같은 파라미터)
+#  - 각 버킷: total, count, days, avg(기록 있는 날 하루 평균), goal_days, goal_rate, rolling_avg
+#    rolling_avg는 해당 버킷까지 최근 window개 버킷의 하루 평균 (기록 없는 날 제외)
+from datetime import datetime, timedelta
+from flask import Blueprint, jsonify, request
+from routes.stats.rollups import (
+    METRICS, daily_collection, rollup_collection, day_key, bucket_key, bucket_start,
+)
+
+stats_bp = Blueprint('stats', __name__, url_prefix='/stats')
+
+# range → (기본 count, 최대 count, 기본 window)
+RANGES = {
+    "day":   (14, 92, 7),
+    "week":  (12, 53, 4),
+    "month": (12, 24, 3),
+}
+
+
+def _int_arg(name: str, default: int, lo: int, hi: int) -> int:
+    try:
+        v = int(request.args.get(name, default))
+    except (TypeError, ValueError):
+        v = default
+    return max(lo, min(hi, v))
+
+def _prev_bucket(period: str, start: datetime) -> datetime:
+    """이전 주/월의 시작일"""
+    if period == "week":
+        return start - timedelta(days=7)
+    return (start - timedelta(days=1)).replace(day=1)
+
+def _bucket_keys(period: str, today: datetime, n: int) -> list:
+    """오늘이 속한 버킷부터 거슬러 n개 [(key, start)] (오래된 순)"""
+    if period == "day":
+        days = [today - timedelta(days=i) for i in range(n)]
+        return [(day_key(d), d) for d in reversed(days)]
+    out, start = [], bucket_start(period, today)
+    for _ in range(n):
+        out.append((bucket_key(period, start), start))
+        start = _prev_bucket(period, start)
+    return list(reversed(out))
+
+def _load_buckets(metric: str, nickname: str, period: str, keys: list) -> dict:
+    first = keys[0][0]
+    if period == "day":
+        field = METRICS[metric]["field"]
+        docs = daily_collection(metric).find(
+            {"nickname": nickname, "date": {"$gte": first}}, {"_id": 0, "date": 1, field: 1, "count": 1}
+        )
+        goal = METRICS[metric]["goal"]
+        return {
+            d["date"]: {"total": d.get(field, 0), "count": d.get("count", 0), "days": 1,
+                        "goal_days": int(d.get(field, 0) >= goal)}
+            for d in docs
+        }
+    docs = rollup_collection(metric).find(
+        {"nickname": nickname, "period": period, "key": {"$gte": first}},
+        {"_id": 0, "key": 1, "total": 1, "count": 1, "days": 1, "goal_days": 1}
+    )
+    return {d["key"]: d for d in docs}
+
+def build_series(metric: str, nickname: str, period: str, count: int, window: int, today: datetime = None) -> list:
+    today = today or datetime.now()
+    today = datetime(today.year, today.month, today.day)
+    keys = _bucket_keys(period, today, count + window - 1)
+    found = _load_buckets(metric, nickname, period, keys)
+
+    rows = []
+    for key, start in keys:
+        b = found.get(key, {})
+        total, days, goal_days = b.get("total", 0), b.get("days", 0), b.get("goal_days", 0)
+        rows.append({
+            "key": key,
+            "start": start.strftime("%Y-%m-%d"),
+            "total": total,
+            "count": b.get("count", 0),
+            "days": days,
+            "avg": round(total / days, 2) if days else None,
+            "goal_days": goal_days,
+            "goal_rate": round(goal_days / days, 3) if days else None,
+        })
+    # 최근 window개 버킷 합계 / 기록 있는 날 수
+    for i, row in enumerate(rows):
+        win = rows[max(0, i - window + 1): i + 1]
+        win_days = sum(r["days"] for r in win)
+        row["rolling_avg"] = round(sum(r["total"] for r in win) / win_days, 2) if win_days else None
+    return rows[window - 1:]
+
+
+def _stats_response(metric: str):
+    nickname = (request.args.get("nickname") or "").strip()
+    period = request.args.get("range", "day")
+    if not nickname:
+        return jsonify({"success": False, "error": "nickname required"}), 400
+    if period not in RANGES:
+        return jsonify({"success": False, "error": f"range must be one of {', '.join(RANGES)}"}), 400
+
+    default_count, max_count, default_window = RANGES[period]
+    count = _int_arg("count", default_count, 1, max_count)
+    window = _int_arg("window", default_window, 1, default_window * 4)
+    try:
+        series = build_series(metric, nickname, period, count, window)
+    except Exception as e:
+        print("[ERROR]", str(e))
+        return jsonify({"success": False, "error": "Failed to load stats"}), 500
+
+    return jsonify({
+        "success": True,
+        "metric": metric,
+        "unit": METRICS[metric]["field"],
+        "range": period,
+        "goal": METRICS[metric]["goal"],
+        "window": window,
+        "buckets": series,
+    })
+
+
+@stats_bp.route('/water', methods=['GET'])
+def water_stats():
+    return _stats_response("water")
+
+@stats_bp.route('/sleep', methods=['GET'])
+def sleep_stats():
+    return _stats_response("sleep")
@@ -0,0 +1,57 @@
+# scripts/backfill_recipe_index.py
+"""
+기존 레시피에 검색 역색인 필드(search_tokens, name_tokens)와
+재료 역색인 필드(ingredient_keys, ingredient_count)를 채우고 토큰 df를 재계산.
+
+  python scripts/backfill_recipe_index.py          # 색인 필드가 없는 레시피만
+  python scripts/backfill_recipe_index.py --all    # 토큰화/재료 정규화 규칙을 바꾼 뒤 전체 재색인
+"""
+import argparse
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from flask import Flask  # noqa: E402
+from pymongo import UpdateOne  # noqa: E402
+from config import Config  # noqa: E402
+from extensions import mongo  # noqa: E402
+from routes.recipes.search_index import search_fields, rebuild_terms, ensure_indexes  # noqa: E402
+from routes.recipes.ingredient_index import ingredient_fields, ensure_indexes as ensure_ingredient_indexes  # noqa: E402
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--all", action="store_true", help="이미 색인된 레시피도 다시 토큰화")
+    ap.add_argument("--batch", type=int, default=500)
+    args = ap.parse_args()
+
+    app = Flask(__name__)
+    app.config.from_object(Config)
+    mongo.init_app(app)
+    db = mongo.db
+
+    ensure_indexes()
+    ensure_ingredient_indexes()
+    query = {} if args.all else {"$or": [{"search_tokens": {"$exists": False}}, {"ingredient_keys": {"$exists": False}}]}
+    ops, done = [], 0
+    for doc in db.recipes.find(query, {"name": 1, "desc": 1, "keywords": 1, "ingredients": 1}):
+        fields = search_fields(doc.get("name", ""), doc.get("desc", ""), doc.get("keywords"))
+        fields.update(ingredient_fields(doc.get("ingredients")))
+        ops.append(UpdateOne({"_id": doc["_id"]}, {"$set": fields}))
+        if len(ops) >= args.batch:
+            db.recipes.bulk_write(ops, ordered=False)
+            done += len(ops)
+            ops = []
+            print(f"  {done}건 색인")
+    if ops:
+        db.recipes.bulk_write(ops, ordered=False)
+        done += len(ops)
+
+    rebuild_terms()
+    print(f"완료: {done}건 색인, 토큰 {db.recipe_search_terms.estimated_document_count()}개")
+
+
+if __name__ == "__main__":
+    main()
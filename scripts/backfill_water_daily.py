@@ -0,0 +1,40 @@
+# scripts/backfill_water_daily.py
+"""
+water_records(물 섭취 기록)로 water_daily(사용자별 하루 합계)를 다시 계산.
+
+  python scripts/backfill_water_daily.py
+  python scripts/backfill_water_daily.py --nickname 홍길동
+
+물 주/월 집계(water_rollups)도 함께 다시 계산함 (rebuild_wellness_rollups.py --metric water 와 같음).
+합계가 어긋났을 때 복구용. 여러 번 실행해도 결과가 같음.
+"""
+import argparse
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from flask import Flask  # noqa: E402
+from config import Config  # noqa: E402
+from extensions import mongo  # noqa: E402
+from routes.stats.rollups import rebuild_rollups, ensure_indexes  # noqa: E402
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--nickname", help="이 사용자만 재계산")
+    ap.add_argument("--batch", type=int, default=1000)
+    args = ap.parse_args()
+
+    app = Flask(__name__)
+    app.config.from_object(Config)
+    mongo.init_app(app)
+
+    ensure_indexes()
+    result = rebuild_rollups("water", nickname=args.nickname, batch=args.batch)
+    print(f"완료: water_daily {result['days']}건, 주/월 {result['rollups']}건 갱신")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+# scripts/check_recipe_query_plans.py
+"""
+레시피 검색/필터 조회의 실행 계획 점검: winningPlan에 COLLSCAN이 있으면 실패(exit 1).
+
+  python scripts/check_recipe_query_plans.py
+  python scripts/check_recipe_query_plans.py --mongo-uri mongodb://localhost:27017/recipe_plan_check
+
+URI의 DB에 recipes가 비어 있으면 합성 레시피를 넣고 점검 후 삭제함.
+운영 DB URI를 넘기면 데이터는 건드리지 않고 인덱스 생성 + explain만 수행.
+
+수동 점검용 (저장소에 테스트 러너가 없어 자동으로 돌지 않음, 실제 MongoDB 필요).
+검색/필터/재료 조회 파이프라인이나 search_index.ensure_indexes / ingredient_index.ensure_indexes 를
+바꿨을 때 직접 실행해서 exit 0인지 확인할 것. URI 기본값은 PLAN_CHECK_MONGO_URI 환경 변수.
+"""
+import argparse
+import os
+import random
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from flask import Flask  # noqa: E402
+from extensions import mongo  # noqa: E402
+from routes.recipes.search import SUMMARY_PROJECTION  # noqa: E402
+from routes.recipes.search_index import (  # noqa: E402
+    search_fields, search_pipeline, recipe_filter, query_tokens, ensure_indexes as ensure_search_indexes,
+)
+from routes.recipes.ingredient_index import (  # noqa: E402
+    ingredient_fields, ingredient_pipeline, ensure_indexes as ensure_ingredient_indexes,
+)
+
+
+def _seed(db, n=3000):
+    rng = random.Random(7)
+    foods = ["김치", "두부", "연어", "계란", "현미", "브로콜리", "고등어", "버섯", "감자", "닭가슴살"]
+    kws = ["다이어트", "저염", "간단", "도시락", "아침", "비건"]
+    docs = []
+    for _ in range(n):
+        name = f"{rng.choice(foods)} {rng.choice(['찌개', '볶음', '샐러드', '구이'])}"
+        ingredients = rng.sample(foods, 3)
+        doc = {"name": name, "desc": name, "keywords": rng.sample(kws, 2), "level": rng.choice("상중하"),
+               "time": rng.randint(5, 180), "score": rng.randint(1, 100), "views": rng.randint(0, 999),
+               "ingredients": ingredients}
+        doc.update(search_fields(name, name, doc["keywords"]))
+        doc.update(ingredient_fields(ingredients))
+        docs.append(doc)
+    db.recipes.insert_many(docs)
+
+
+def _cases():
+    tokens = query_tokens("김치찌개")
+    lvl = recipe_filter(levels=["하"], max_time=30)
+    return {
+        "keyword": search_pipeline(tokens, "김치찌개", "relevance", SUMMARY_PROJECTION, 21),
+        "keyword+filters": search_pipeline(tokens, "김치찌개", "latest", SUMMARY_PROJECTION, 21,
+                                           filters=recipe_filter(["다이어트"], ["하", "중"], 60, 50)),
+        "keyword+facets": search_pipeline(tokens, "김치찌개", "relevance", SUMMARY_PROJECTION, 21, facets=True),
+        "filter:keywords": search_pipeline([], "", "latest", SUMMARY_PROJECTION, 21, filters=recipe_filter(["저염"])),
+        "filter:level+time": search_pipeline([], "", "latest", SUMMARY_PROJECTION, 21, filters=lvl),
+        "filter:level+time views": search_pipeline([], "", "views", SUMMARY_PROJECTION, 21, filters=lvl),
+        "filter:max_time": search_pipeline([], "", "latest", SUMMARY_PROJECTION, 21, filters=recipe_filter(max_time=20)),
+        "filter:min_score": search_pipeline([], "", "latest", SUMMARY_PROJECTION, 21, filters=recipe_filter(min_score=80)),
+        "filter facets": search_pipeline([], "", "latest", SUMMARY_PROJECTION, 21, filters=lvl, facets=True),
+        "ingredients": ingredient_pipeline(["김치", "두부"], SUMMARY_PROJECTION, 20),
+    }
+
+
+def _winning_stages(node, inside=False):
+    """explain 결과에서 winningPlan 아래의 stage 이름 수집"""
+    if isinstance(node, dict):
+        for k, v in node.items():
+            if k == "rejectedPlans":
+                continue
+            now_inside = inside or k == "winningPlan"
+            if now_inside and k == "stage" and isinstance(v, str):
+                yield v
+            yield from _winning_stages(v, now_inside)
+    elif isinstance(node, list):
+        for v in node:
+            yield from _winning_stages(v, inside)
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--mongo-uri", default=os.getenv("PLAN_CHECK_MONGO_URI", "mongodb://localhost:27017/recipe_plan_check"))
+    args = ap.parse_args()
+
+    app = Flask(__name__)
+    app.config["MONGO_URI"] = args.mongo_uri
+    mongo.init_app(app)
+    db = mongo.db
+
+    seeded = db.recipes.estimated_document_count() == 0
+    if seeded:
+        _seed(db)
+    try:
+        ensure_search_indexes()
+        ensure_ingredient_indexes()
+        failed = 0
+        for name, pipeline in _cases().items():
+            plan = db.command("explain", {"aggregate": "recipes", "pipeline": pipeline, "cursor": {}},
+                              verbosity="queryPlanner")
+            stages = sorted(set(_winning_stages(plan)))
+            bad = "COLLSCAN" in stages
+            failed += bad
+            print("%-26s %s  %s" % (name, "FAIL" if bad else "ok  ", ",".join(stages)))
+    finally:
+        if seeded:
+            db.recipes.drop()
+    if failed:
+        print(f"{failed}개 조회가 COLLSCAN")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
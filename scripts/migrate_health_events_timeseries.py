@@ -0,0 +1,169 @@
+# scripts/migrate_health_events_timeseries.py
+"""
+건강 기록 이벤트 컬렉션(water_records, sleep_records, diet_records)을 time-series 컬렉션으로 이전.
+
+  HEALTH_EVENT_STORAGE=timeseries python scripts/migrate_health_events_timeseries.py
+  python scripts/migrate_health_events_timeseries.py --collections diet_records --batch 2000
+  python scripts/migrate_health_events_timeseries.py --drop-legacy     # 이전 확인 후 기존 컬렉션 삭제
+
+순서 (컬렉션마다):
+  1) 기존 일반 컬렉션을 <이름>_legacy 로 이름 변경
+  2) 같은 이름으로 time-series 컬렉션 생성 (metaField=nickname, timeField=timestamp) → 새 기록은 바로 여기로 저장
+  3) _legacy 문서를 (timestamp, _id) 오름차순으로 batch 단위 복사
+     - 시간순으로 넣어야 사용자별 버킷이 순서대로 채워져 압축이 잘 됨
+     - _id 유지, 마지막으로 복사한 (timestamp, _id)를 migrations 컬렉션에 저장 → 중단 후 재실행하면 이어서 진행
+  4) 문서 수 확인 후 저장 크기 비교 출력. --drop-legacy 면 _legacy 삭제
+
+복사가 끝날 때까지는 최근 기록이 가장 늦게 옮겨져 /api/history 등에 잠시 안 보일 수 있으므로 사용량이 적은 시간에 실행.
+timestamp가 날짜가 아닌 문서는 time-series에 넣을 수 없어 _legacy 에 남기고 개수만 출력.
+앱은 HEALTH_EVENT_STORAGE=timeseries 로 띄워야 새로 만드는 컬렉션도 time-series가 됨.
+"""
+import argparse
+import os
+import sys
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from flask import Flask  # noqa: E402
+from pymongo.errors import BulkWriteError  # noqa: E402
+from config import Config  # noqa: E402
+from extensions import mongo  # noqa: E402
+from routes.chat.event_store import (  # noqa: E402
+    EVENT_COLLECTIONS, TIME_FIELD, collection_type, timeseries_options, ensure_event_indexes, storage_stats,
+)
+
+
+def _checkpoint_id(name: str) -> str:
+    return f"timeseries:{name}"
+
+def _fmt_bytes(n) -> str:
+    return f"{n / 1024 / 1024:.1f}MB"
+
+def _print_stats(db, label: str, name: str):
+    try:
+        s = storage_stats(name, db)
+        print(f"  {label:<8} {name:<22} type={s['type']:<10} docs={s['count']:<9} "
+              f"size={_fmt_bytes(s['size'])} storage={_fmt_bytes(s['storageSize'])} index={_fmt_bytes(s['totalIndexSize'])}")
+    except Exception as e:
+        print(f"  {label:<8} {name}: collStats 실패 ({e})")
+
+
+def _after(state: dict) -> dict:
+    """진행 위치 (last_ts, last_id) 이후 문서 조건 (정렬 순서 timestamp, _id 기준)"""
+    if state.get("last_id") is None:
+        return {}
+    return {"$or": [
+        {TIME_FIELD: {"$gt": state["last_ts"]}},
+        {TIME_FIELD: state["last_ts"], "_id": {"$gt": state["last_id"]}},
+    ]}
+
+def _drop_partial_batch(db, name: str, legacy: str, boundary: dict):
+    """
+    insert_many는 끝났는데 진행 위치 저장 전에 중단된 경우, 다시 복사될 문서가 중복되지 않도록
+    진행 위치 이후 문서 중 _legacy에도 있는 것을 지움 (이전 중 새로 들어온 기록은 _legacy에 없으므로 남음)
+    """
+    ids = [d["_id"] for d in db[name].find(boundary, {"_id": 1})]
+    partial = [d["_id"] for d in db[legacy].find({"_id": {"$in": ids}}, {"_id": 1})] if ids else []
+    if partial:
+        db[name].delete_many({"_id": {"$in": partial}})
+        print(f"[{name}] 중단된 배치 {len(partial)}건 정리")
+
+
+def migrate(db, name: str, batch: int, drop_legacy: bool) -> bool:
+    legacy = f"{name}_legacy"
+    kind = collection_type(name, db)
+    legacy_kind = collection_type(legacy, db)
+
+    # 1) 이름 변경 + 2) time-series 생성
+    if kind == "timeseries" and legacy_kind is None:
+        print(f"[{name}] 이미 time-series, 옮길 기존 컬렉션 없음")
+        return True
+    if kind == "collection":
+        if legacy_kind is not None:
+            print(f"[{name}] {legacy} 가 이미 있어 중단 (앞서 실행한 이전 작업을 확인하세요)")
+            return False
+        _print_stats(db, "before", name)
+        db[name].rename(legacy)
+        kind = None
+    if kind is None:
+        db.create_collection(name, **timeseries_options())
+        print(f"[{name}] time-series 컬렉션 생성")
+    ensure_event_indexes(name, db)
+    if collection_type(legacy, db) is None:
+        return True
+
+    # 3) 오래된 문서부터 복사 ((timestamp, _id) 오름차순, 마지막으로 복사한 위치 저장)
+    db[legacy].create_index([(TIME_FIELD, 1), ("_id", 1)])
+    state = db.migrations.find_one({"_id": _checkpoint_id(name)}) or {}
+    after = _after(state)
+    query = {"$and": [{TIME_FIELD: {"$type": "date"}}, after]} if after else {TIME_FIELD: {"$type": "date"}}
+    if after:
+        print(f"[{name}] {state['last_ts']} / {state['last_id']} 이후부터 이어서 복사 (지금까지 {state.get('copied', 0)}건)")
+    copied = state.get("copied", 0)
+    _drop_partial_batch(db, name, legacy, after)
+
+    docs = []
+    def flush():
+        nonlocal docs, copied
+        if not docs:
+            return
+        try:
+            db[name].insert_many(docs, ordered=False)
+        except BulkWriteError as e:
+            print(f"[{name}] 일부 문서 복사 실패: {e.details.get('writeErrors', [])[:3]}")
+            raise
+        copied += len(docs)
+        db.migrations.update_one(
+            {"_id": _checkpoint_id(name)},
+            {"$set": {"last_ts": docs[-1][TIME_FIELD], "last_id": docs[-1]["_id"], "copied": copied,
+                      "updated_at": datetime.utcnow()}},
+            upsert=True
+        )
+        print(f"[{name}] {copied}건 복사")
+        docs = []
+
+    for doc in db[legacy].find(query).sort([(TIME_FIELD, 1), ("_id", 1)]).batch_size(batch):
+        docs.append(doc)
+        if len(docs) >= batch:
+            flush()
+    flush()
+
+    # 4) 확인
+    skipped = db[legacy].count_documents({TIME_FIELD: {"$not": {"$type": "date"}}})
+    expected = db[legacy].count_documents({}) - skipped
+    if copied != expected:
+        print(f"[{name}] 복사 건수 불일치: {copied} / {expected} — {legacy} 유지")
+        return False
+    if skipped:
+        print(f"[{name}] timestamp가 날짜가 아닌 문서 {skipped}건은 {legacy} 에 남김")
+    _print_stats(db, "after", name)
+
+    if drop_legacy and not skipped:
+        db[legacy].drop()
+        db.migrations.delete_one({"_id": _checkpoint_id(name)})
+        print(f"[{name}] {legacy} 삭제")
+    return True
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--collections", nargs="+", choices=EVENT_COLLECTIONS, default=list(EVENT_COLLECTIONS))
+    ap.add_argument("--batch", type=int, default=1000)
+    ap.add_argument("--drop-legacy", action="store_true", help="복사 확인 후 <이름>_legacy 삭제")
+    args = ap.parse_args()
+
+    app = Flask(__name__)
+    app.config.from_object(Config)
+    mongo.init_app(app)
+
+    ok = True
+    for name in args.collections:
+        ok = migrate(mongo.db, name, args.batch, args.drop_legacy) and ok
+    if not ok:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+# scripts/migrate_search_history.py
+"""
+예전 공용 검색 기록(search_history, 검색어마다 문서 1개)을 user_search_history 의 공용 기록으로 합침.
+
+  python scripts/migrate_search_history.py
+  python scripts/migrate_search_history.py --drop-legacy     # 합친 뒤 search_history 삭제
+
+nickname 없이 저장된 기록이라 GLOBAL_HISTORY_ID 문서로 옮김 (_id, keyword, created_at 유지).
+이미 있는 항목과 같은 검색어는 더 최근 것만 남기고, 최신순 SEARCH_HISTORY_MAX개로 자름.
+여러 번 실행해도 결과가 같음. 실행 중 들어온 공용 검색 기록은 덮어쓸 수 있어 사용량이 적은 시간에 실행.
+"""
+import argparse
+import os
+import sys
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from flask import Flask  # noqa: E402
+from config import Config  # noqa: E402
+from extensions import mongo  # noqa: E402
+from routes.recipes.search_history import SEARCH_HISTORY_MAX, GLOBAL_HISTORY_ID  # noqa: E402
+
+
+def merge_items(current: list, legacy: list) -> list:
+    """검색어별 가장 최근 항목만 남겨 최신순 SEARCH_HISTORY_MAX개"""
+    latest = {}
+    for item in current + legacy:
+        keyword = (item.get("keyword") or "").strip()
+        if not keyword:
+            continue
+        prev = latest.get(keyword)
+        if prev is None or item.get("created_at", datetime.min) > prev.get("created_at", datetime.min):
+            latest[keyword] = item
+    items = sorted(latest.values(), key=lambda it: it.get("created_at", datetime.min), reverse=True)
+    return items[:SEARCH_HISTORY_MAX]
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--drop-legacy", action="store_true", help="합친 뒤 search_history 삭제")
+    args = ap.parse_args()
+
+    app = Flask(__name__)
+    app.config.from_object(Config)
+    mongo.init_app(app)
+    db = mongo.db
+
+    legacy = [
+        {"_id": d["_id"], "keyword": d.get("keyword", ""), "created_at": d.get("created_at") or datetime.min}
+        for d in db.search_history.find({}, {"keyword": 1, "created_at": 1})
+                                  .sort("created_at", -1).limit(SEARCH_HISTORY_MAX)
+    ]
+    if not legacy:
+        print("search_history: 옮길 기록 없음")
+        return
+
+    current = (db.user_search_history.find_one({"_id": GLOBAL_HISTORY_ID}, {"items": 1}) or {}).get("items", [])
+    items = merge_items(current, legacy)
+    db.user_search_history.update_one(
+        {"_id": GLOBAL_HISTORY_ID},
+        {"$set": {"items": items, "updated_at": datetime.utcnow()}},
+        upsert=True
+    )
+    print(f"search_history: {len(legacy)}건 읽음 → 공용 기록 {len(items)}건")
+
+    if args.drop_legacy:
+        db.search_history.drop()
+        print("search_history 삭제")
+
+
+if __name__ == "__main__":
+    main()
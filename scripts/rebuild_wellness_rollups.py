@@ -0,0 +1,44 @@
+# scripts/rebuild_wellness_rollups.py
+"""
+원본 기록(water_records, sleep_records)으로 일/주/월 집계를 다시 계산.
+
+  python scripts/rebuild_wellness_rollups.py                       # 물 + 수면 전체
+  python scripts/rebuild_wellness_rollups.py --metric sleep
+  python scripts/rebuild_wellness_rollups.py --nickname 홍길동     # 한 사용자만
+
+집계 도입 전 기록을 채우거나, 목표(WATER_GOAL_CUPS, SLEEP_GOAL_MINUTES)를 바꿨거나,
+원본을 직접 고친 뒤 실행. 여러 번 실행해도 결과가 같음.
+"""
+import argparse
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from flask import Flask  # noqa: E402
+from config import Config  # noqa: E402
+from extensions import mongo  # noqa: E402
+from routes.stats.rollups import METRICS, rebuild_rollups, ensure_indexes  # noqa: E402
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--metric", choices=[*METRICS, "all"], default="all")
+    ap.add_argument("--nickname", help="이 사용자만 재계산")
+    ap.add_argument("--batch", type=int, default=1000)
+    args = ap.parse_args()
+
+    app = Flask(__name__)
+    app.config.from_object(Config)
+    mongo.init_app(app)
+
+    ensure_indexes()
+    metrics = list(METRICS) if args.metric == "all" else [args.metric]
+    for metric in metrics:
+        result = rebuild_rollups(metric, nickname=args.nickname, batch=args.batch)
+        print(f"[{metric}] 일별 {result['days']}건, 주/월 {result['rollups']}건 갱신")
+
+
+if __name__ == "__main__":
+    main()